@@ -0,0 +1,59 @@
+"""
+Deslocamento das datas previstas pelo pulmão (meses de folga).
+
+Etapas de pulmão (nome contém "PULMÃO") têm só o término previsto deslocado; as
+demais, início e término previstos. Datas reais nunca mudam. O deslocamento
+usa pd.DateOffset(months=...) sobre colunas inteiras, com a mesma regra de fim
+de mês de relativedelta (31/01 + 1 mês = 28 ou 29/02).
+
+AjustePulmao guarda a máscara de pulmão e as colunas originais de um df; quando
+só meses_pulmao muda, aplicar() reaproveita esse preparo e as colunas já
+deslocadas para valores recentes, sem varrer o frame de novo. O deslocamento é
+sempre feito a partir das datas originais: encadear deslocamentos (1 mês + 1
+mês) não equivale a deslocar 2 meses no fim do mês.
+"""
+from functools import lru_cache
+
+import pandas as pd
+
+COLUNAS_PREVISTAS = ("Inicio_Prevista", "Termino_Prevista")
+
+
+class AjustePulmao:
+    """Preparo do deslocamento para um df; o frame não deve ser alterado depois"""
+
+    def __init__(self, df):
+        self.df = df
+        etapas = df["Etapa"].astype(object)
+        self.pulmao = etapas.str.upper().str.contains("PULMÃO", regex=False, na=False).to_numpy()
+        self._originais = {
+            coluna: df[coluna] if pd.api.types.is_datetime64_any_dtype(df[coluna]) else pd.to_datetime(df[coluna])
+            for coluna in COLUNAS_PREVISTAS
+        }
+        self._colunas_deslocadas = lru_cache(maxsize=8)(self._colunas_deslocadas)
+
+    def _colunas_deslocadas(self, meses_pulmao):
+        deslocamento = pd.DateOffset(months=meses_pulmao)
+        inicio = self._originais["Inicio_Prevista"]
+        return {
+            "Inicio_Prevista": inicio.where(self.pulmao, inicio + deslocamento),
+            "Termino_Prevista": self._originais["Termino_Prevista"] + deslocamento,
+        }
+
+    def aplicar(self, meses_pulmao=0):
+        """Cópia do df com as datas previstas deslocadas (equivale a ajustar_datas_com_pulmao)"""
+        df_copy = self.df.copy()
+        if meses_pulmao > 0:
+            for coluna, valores in self._colunas_deslocadas(meses_pulmao).items():
+                df_copy[coluna] = valores.copy()  # o cache não pode ser alterado por quem recebe a cópia
+        return df_copy
+
+
+def ajustar_datas_com_pulmao(df, meses_pulmao=0, ajuste=None):
+    """
+    Desloca as datas previstas em `meses_pulmao` meses. Passe um AjustePulmao do
+    mesmo df em `ajuste` para reaproveitar o preparo entre chamadas.
+    """
+    if meses_pulmao <= 0:
+        return df.copy()
+    return (ajuste if ajuste is not None else AjustePulmao(df)).aplicar(meses_pulmao)
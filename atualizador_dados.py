@@ -0,0 +1,231 @@
+"""
+Atualização dos dados do Macrofluxo em segundo plano (stale-while-revalidate).
+
+Uma thread por processo executa a carga completa (Smartsheet + planilha do
+Macrofluxo) em intervalos fixos e mantém o último resultado bom em memória e em
+disco. As sessões recebem sempre esse snapshot na hora, com a data/hora em que
+ele foi gerado; só a primeira execução, sem snapshot em disco, espera a carga.
+Se uma atualização falhar, o snapshot anterior continua sendo servido; sem
+snapshot algum, a carga é repetida com espera curta até a primeira dar certo.
+
+Antes de cada carga, uma verificação barata (`assinatura_fontes`, por exemplo o
+modifiedAt do relatório) evita baixar e reprocessar fontes que não mudaram.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+
+import pandas as pd
+
+INTERVALO_ATUALIZACAO = 30 * 60  # segundos
+# Sem snapshot algum, novas tentativas em 5s, 10s, 20s... até 5 min (nunca o intervalo cheio)
+ESPERA_INICIAL_SEM_DADOS = 5
+ESPERA_MAXIMA_SEM_DADOS = 5 * 60
+ARQUIVO_SNAPSHOT = os.path.join('.cache_dados', 'snapshot_macrofluxo.pkl')
+
+
+def _executar_cronometrado(nome, funcao, tempos=None):
+    inicio = time.perf_counter()
+    try:
+        return funcao()
+    finally:
+        decorrido = time.perf_counter() - inicio
+        if tempos is not None:
+            tempos[nome] = decorrido
+        print(f"INFO: [tempo] fonte {nome}: {decorrido:.2f}s")
+
+
+def carregar_fontes_em_paralelo(fontes, tempos=None):
+    """
+    Executa as fontes independentes ao mesmo tempo, num pool pequeno de threads.
+
+    `fontes` é {nome: (funcao, timeout_em_segundos)}. Retorna {nome: resultado};
+    uma fonte que falha ou estoura o timeout fica com None, sem afetar as demais.
+    O tempo total passa a ser o da fonte mais lenta, e não a soma. Se `tempos`
+    for um dict, recebe o tempo de cada fonte que terminou.
+    """
+    if not fontes:
+        return {}
+    executor = ThreadPoolExecutor(max_workers=len(fontes), thread_name_prefix="fonte-dados")
+    inicio = time.perf_counter()
+    futuros = {
+        nome: (executor.submit(_executar_cronometrado, nome, funcao, tempos), inicio + timeout)
+        for nome, (funcao, timeout) in fontes.items()
+    }
+    resultados = {}
+    try:
+        for nome, (futuro, prazo) in futuros.items():
+            try:
+                resultados[nome] = futuro.result(timeout=max(0.0, prazo - time.perf_counter()))
+            except FuturesTimeoutError:
+                print(f"ERRO: Fonte {nome} excedeu o tempo limite; seguindo sem ela.")
+                resultados[nome] = None
+            except Exception as e:
+                print(f"ERRO: Falha ao carregar {nome}: {e}")
+                resultados[nome] = None
+    finally:
+        # Não espera fontes que estouraram o timeout: a thread termina sozinha em segundo plano
+        executor.shutdown(wait=False)
+    print(f"INFO: [tempo] fontes em paralelo: {time.perf_counter() - inicio:.2f}s")
+    return resultados
+
+
+@dataclass
+class SnapshotDados:
+    df: pd.DataFrame
+    etapas_nao_mapeadas: set = field(default_factory=set)
+    atualizado_em: datetime = field(default_factory=datetime.now)
+    versao: int = 0
+    assinatura: str = None
+    diagnostico: object = None  # pipeline_dados.DiagnosticoCarga da carga que gerou o snapshot
+
+
+class AtualizadorDados:
+    """
+    `carregar()` deve retornar (df, diagnostico), ou None quando nenhuma fonte
+    trouxe dados (o snapshot anterior é mantido). O diagnóstico precisa ter o
+    atributo `etapas_nao_mapeadas` (ver pipeline_dados.DiagnosticoCarga).
+    `assinatura_fontes()` (opcional) identifica o estado das fontes; None quando
+    não dá para saber, o que força a carga completa.
+    `preparar(df)` (opcional) é aplicado uma vez a cada snapshot publicado
+    (inclusive o lido do disco), e não a cada sessão que o recebe.
+    """
+
+    def __init__(self, carregar, caminho=ARQUIVO_SNAPSHOT, intervalo=INTERVALO_ATUALIZACAO,
+                 assinatura_fontes=None, preparar=None):
+        self._carregar = carregar
+        self._assinatura_fontes = assinatura_fontes
+        self._preparar = preparar
+        self._caminho = caminho
+        self._intervalo = intervalo
+        self._lock = threading.Lock()
+        self._acordar = threading.Event()
+        self._primeira_tentativa = threading.Event()
+        self._thread = None
+        self._snapshot = None
+        self._versao = 0
+        self.ultimo_erro = None
+
+    # --- Snapshot em disco -------------------------------------------------
+
+    def _ler_disco(self):
+        if not os.path.exists(self._caminho):
+            return None
+        try:
+            dados = pd.read_pickle(self._caminho)
+            return SnapshotDados(dados['df'], set(dados['etapas_nao_mapeadas']), dados['atualizado_em'],
+                                 assinatura=dados.get('assinatura'), diagnostico=dados.get('diagnostico'))
+        except Exception as e:
+            print(f"AVISO: Snapshot em disco ignorado ({self._caminho}): {e}")
+            return None
+
+    def _gravar_disco(self, snapshot):
+        try:
+            os.makedirs(os.path.dirname(self._caminho) or '.', exist_ok=True)
+            temporario = self._caminho + '.tmp'
+            pd.to_pickle({
+                'df': snapshot.df,
+                'etapas_nao_mapeadas': sorted(snapshot.etapas_nao_mapeadas),
+                'atualizado_em': snapshot.atualizado_em,
+                'assinatura': snapshot.assinatura,
+                'diagnostico': snapshot.diagnostico,
+            }, temporario)
+            os.replace(temporario, self._caminho)  # troca atômica: nunca deixa um arquivo pela metade
+        except Exception as e:
+            print(f"AVISO: Não foi possível gravar o snapshot em disco: {e}")
+
+    def _publicar(self, snapshot):
+        if self._preparar is not None:
+            snapshot.df = self._preparar(snapshot.df)
+        with self._lock:
+            self._versao += 1
+            snapshot.versao = self._versao
+            self._snapshot = snapshot
+
+    # --- Ciclo de atualização ----------------------------------------------
+
+    def iniciar(self):
+        if self._thread is not None:
+            return self
+        snapshot_disco = self._ler_disco()
+        if snapshot_disco is not None:
+            self._publicar(snapshot_disco)
+            print(f"INFO: Snapshot de dados carregado do disco ({snapshot_disco.atualizado_em:%d/%m/%Y %H:%M})")
+        self._thread = threading.Thread(target=self._executar, name="atualizador-dados", daemon=True)
+        self._thread.start()
+        return self
+
+    def _executar(self):
+        espera_sem_dados = ESPERA_INICIAL_SEM_DADOS
+        while True:
+            snapshot = self._snapshot
+            idade = (datetime.now() - snapshot.atualizado_em).total_seconds() if snapshot else None
+            if idade is None or idade >= self._intervalo or self._acordar.is_set():
+                self._acordar.clear()
+                self.atualizar()
+                if self._snapshot is None:
+                    # Nada para servir ainda: tenta de novo logo, com backoff
+                    espera = min(espera_sem_dados, self._intervalo)
+                    espera_sem_dados = min(espera_sem_dados * 2, ESPERA_MAXIMA_SEM_DADOS)
+                    print(f"AVISO: Sem dados carregados; nova tentativa em {espera:.0f}s")
+                else:
+                    espera = self._intervalo
+            else:
+                espera = self._intervalo - idade
+                self._primeira_tentativa.set()
+            self._acordar.wait(timeout=espera)
+
+    def atualizar(self):
+        """Executa uma carga completa e publica o resultado, se houver."""
+        inicio = time.perf_counter()
+        try:
+            assinatura = self._assinatura_fontes() if self._assinatura_fontes else None
+            atual = self._snapshot
+            if assinatura is not None and atual is not None and atual.assinatura == assinatura:
+                # Fontes inalteradas: os dados continuam válidos, só a data de referência avança.
+                # Novo objeto (as sessões podem estar lendo o atual) com a mesma versão, para
+                # não invalidar os caches por versão sem necessidade; já vem preparado
+                novo = replace(atual, atualizado_em=datetime.now())
+                with self._lock:
+                    if self._snapshot is atual:
+                        self._snapshot = novo
+                self._gravar_disco(novo)
+                self.ultimo_erro = None
+                print(f"INFO: Fontes sem alterações; carga completa ignorada ({time.perf_counter() - inicio:.1f}s)")
+                return True
+
+            resultado = self._carregar()
+            if resultado is None:
+                self.ultimo_erro = "nenhuma fonte de dados retornou registros"
+                print("AVISO: Atualização dos dados sem resultado; mantendo o snapshot anterior.")
+                return False
+            df, diagnostico = resultado
+            snapshot = SnapshotDados(df, set(diagnostico.etapas_nao_mapeadas), datetime.now(),
+                                     assinatura=assinatura, diagnostico=diagnostico)
+            self._publicar(snapshot)
+            self._gravar_disco(snapshot)
+            self.ultimo_erro = None
+            print(f"INFO: Dados atualizados em {time.perf_counter() - inicio:.1f}s ({len(df)} linhas)")
+            return True
+        except Exception as e:
+            self.ultimo_erro = str(e)
+            print(f"ERRO: Falha na atualização dos dados: {e}")
+            return False
+        finally:
+            self._primeira_tentativa.set()
+
+    def solicitar_atualizacao(self):
+        """Antecipa a próxima atualização (a thread acorda imediatamente)."""
+        self._acordar.set()
+
+    def snapshot(self):
+        """
+        Último snapshot bom. Sem snapshot algum (primeira subida sem arquivo em
+        disco), espera a primeira tentativa de carga terminar.
+        """
+        if self._snapshot is None:
+            self._primeira_tentativa.wait()
+        return self._snapshot
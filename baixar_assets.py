@@ -0,0 +1,72 @@
+"""
+Baixa para static/vendor/ as bibliotecas e fontes usadas pelo Gantt (virtual-select
+e Inter), para o app não depender de CDN em tempo de uso (rede da obra sem
+internet). Rode uma vez ao atualizar as versões abaixo e versione os arquivos:
+    python baixar_assets.py
+Os fallbacks para o CDN em index.html/inter.css são só a última reserva; na
+implantação, confira que os arquivos estão no checkout (sai com erro se faltar algum):
+    python baixar_assets.py --verificar
+
+As versões ficam no caminho/na query (?v=...) das URLs em frontend_gantt/index.html
+e static/vendor/inter/inter.css; ao trocar uma versão aqui, troque lá também.
+"""
+import os
+import sys
+import urllib.request
+
+PASTA_STATIC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+VERSAO_VIRTUAL_SELECT = "1.0.39"
+VERSAO_INTER = "5.0.18"
+
+_CDN_VIRTUAL_SELECT = f"https://cdn.jsdelivr.net/npm/virtual-select-plugin@{VERSAO_VIRTUAL_SELECT}/dist"
+_CDN_INTER = f"https://cdn.jsdelivr.net/npm/@fontsource/inter@{VERSAO_INTER}/files"
+
+# Caminho relativo a static/ -> URL de origem
+ASSETS = {
+    f"vendor/virtual-select-{VERSAO_VIRTUAL_SELECT}/virtual-select.min.js": f"{_CDN_VIRTUAL_SELECT}/virtual-select.min.js",
+    f"vendor/virtual-select-{VERSAO_VIRTUAL_SELECT}/virtual-select.min.css": f"{_CDN_VIRTUAL_SELECT}/virtual-select.min.css",
+    **{
+        f"vendor/inter/inter-latin-{peso}-normal.woff2": f"{_CDN_INTER}/inter-latin-{peso}-normal.woff2"
+        for peso in (400, 500, 600)
+    },
+}
+
+
+def assets_faltando():
+    """Caminhos de ASSETS que ainda não existem em static/"""
+    return [caminho for caminho in ASSETS if not os.path.exists(os.path.join(PASTA_STATIC, caminho))]
+
+
+def baixar_assets(forcar=False):
+    """Baixa os assets ausentes (ou todos, com forcar=True). Retorna o número de falhas."""
+    falhas = 0
+    for caminho in (ASSETS if forcar else assets_faltando()):
+        destino = os.path.join(PASTA_STATIC, caminho)
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        try:
+            with urllib.request.urlopen(ASSETS[caminho], timeout=30) as resposta:
+                conteudo = resposta.read()
+            with open(destino, "wb") as arquivo:
+                arquivo.write(conteudo)
+            print(f"INFO: {caminho} ({len(conteudo) / 1024:.1f} KB)")
+        except Exception as e:
+            falhas += 1
+            print(f"ERRO: Falha ao baixar {ASSETS[caminho]}: {e}")
+    return falhas
+
+
+def verificar_assets():
+    """Lista os assets ausentes; retorna quantos faltam"""
+    faltando = assets_faltando()
+    for caminho in faltando:
+        print(f"ERRO: {caminho} ausente em static/ (o Gantt dependeria do CDN)")
+    if not faltando:
+        print(f"INFO: {len(ASSETS)} assets presentes em static/")
+    return len(faltando)
+
+
+if __name__ == "__main__":
+    if "--verificar" in sys.argv:
+        sys.exit(1 if verificar_assets() else 0)
+    sys.exit(1 if baixar_assets(forcar="--forcar" in sys.argv) else 0)
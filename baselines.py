@@ -0,0 +1,273 @@
+"""
+Utilitários das linhas de base (baselines) do Gantt.
+
+O índice de etapas é montado uma única vez por baseline, quando ela é carregada,
+e compartilhado pelos três modos do Gantt (Por Projeto, Por Etapa e Por Setor):
+cada task encontra sua etapa na baseline com uma consulta O(1) ao dicionário,
+em vez de varrer a lista de tasks da baseline com várias estratégias de nome.
+
+O BaselineStore mantém em memória apenas o catálogo da tabela gantt_baselines
+(sem a coluna baseline_data); o JSON de cada baseline é buscado e parseado sob
+demanda, numa única consulta para todos os empreendimentos de uma renderização,
+e salvar/excluir invalida só a entrada afetada.
+"""
+import json
+import threading
+import time
+
+from config_etapas import mapeamento_etapas_usuario, nome_completo_para_sigla
+
+
+def chave_etapa(etapa):
+    """
+    Chave canônica de uma etapa: a sigla normalizada (sem espaços nas pontas, em
+    maiúsculas). Aceita tanto a sigla ('ENG.LIMP') quanto o nome completo
+    ('ENG. LIMP.'), de modo que as duas formas caiam na mesma chave.
+    """
+    if etapa is None:
+        return None
+    etapa_norm = str(etapa).strip().upper()
+    sigla = mapeamento_etapas_usuario.get(etapa_norm, nome_completo_para_sigla.get(etapa_norm, etapa_norm))
+    return sigla.strip().upper()
+
+
+def extrair_tasks_baseline(baseline_data):
+    """Lista de tasks de uma baseline (formato novo com 'tasks' ou lista antiga)."""
+    if isinstance(baseline_data, dict) and 'tasks' in baseline_data:
+        return baseline_data['tasks'] or []
+    if isinstance(baseline_data, list):
+        return baseline_data
+    return []
+
+
+def indexar_tasks_baseline(baseline_data):
+    """
+    Monta o índice {chave_etapa: {"start": ..., "end": ...}} de uma baseline.
+    Se a mesma etapa aparecer mais de uma vez, vale a primeira ocorrência
+    (mesmo comportamento das buscas com next()).
+    """
+    indice = {}
+    for bt in extrair_tasks_baseline(baseline_data):
+        if not isinstance(bt, dict):
+            continue
+        periodo = {
+            "start": bt.get('inicio_previsto', bt.get('Inicio_Prevista')),
+            "end": bt.get('termino_previsto', bt.get('Termino_Prevista'))
+        }
+        for campo in ('etapa', 'Etapa'):
+            chave = chave_etapa(bt.get(campo))
+            if chave:
+                indice.setdefault(chave, periodo)
+    return indice
+
+
+def periodo_na_baseline(indice, etapa):
+    """
+    Datas da etapa na baseline indexada. Etapas ausentes retornam start/end nulos,
+    para o JavaScript diferenciar "sem dados" de "não processado".
+    """
+    periodo = indice.get(chave_etapa(etapa))
+    if periodo is None:
+        return {"start": None, "end": None}
+    return dict(periodo)
+
+
+class BaselineStore:
+    """
+    Cache incremental das baselines do banco.
+
+    - catalogo(): {empreendimento: {versão: {"date", "tipo_visualizacao",
+      "created_at"}}}, recarregado a cada `ttl` segundos. Só colunas próprias:
+      nada do JSON de baseline_data (created_by vem com os dados da versão).
+    - dados(emp, versão): {"data", "indice"} da baseline, carregado na primeira
+      consulta e mantido até a entrada ser invalidada ou mudar no banco; versões
+      inexistentes também ficam em cache (None).
+    - dados_empreendimentos(emps): as entradas de todas as versões dos
+      empreendimentos, com as que faltam buscadas numa única consulta.
+
+    `conectar` é a função que abre a conexão MySQL (None quando o banco está
+    indisponível; nesse caso catalogo() retorna None e o app usa o modo mock, e
+    a conexão só é tentada de novo depois de `espera_falha` segundos).
+
+    Buscas feitas fora do lock só entram no cache se nenhum invalidar() ou
+    recarga do catálogo aconteceu nesse meio tempo (contador de geração).
+
+    O catálogo devolvido é compartilhado entre as sessões e nunca é alterado no
+    lugar (recarga e invalidar() publicam um dict novo); quem o recebe não deve
+    alterá-lo.
+    """
+
+    QUERY_CATALOGO = """
+        SELECT empreendimento, version_name, created_date, tipo_visualizacao, created_at
+        FROM gantt_baselines
+    """
+    QUERY_DADOS = """
+        SELECT baseline_data FROM gantt_baselines
+        WHERE empreendimento = %s AND version_name = %s
+    """
+    QUERY_DADOS_EMPREENDIMENTOS = """
+        SELECT empreendimento, version_name, baseline_data FROM gantt_baselines
+        WHERE empreendimento IN ({})
+    """
+
+    def __init__(self, conectar, ttl=3600, espera_falha=30):
+        self._conectar = conectar
+        self._ttl = ttl
+        self._espera_falha = espera_falha
+        self._lock = threading.Lock()
+        self._catalogo = None
+        self._carregado_em = 0.0
+        self._falhou_em = None
+        self._dados = {}
+        self._geracao = 0
+
+    def _consultar(self, query, params=()):
+        conn = self._conectar()
+        if not conn:
+            return None
+        cursor = None
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        except Exception as e:
+            print(f"ERRO: Falha ao consultar gantt_baselines: {e}")
+            return None
+        finally:
+            if cursor is not None:
+                cursor.close()
+            conn.close()
+
+    @staticmethod
+    def _entrada_catalogo(row):
+        return {
+            "date": row['created_date'],
+            "tipo_visualizacao": row['tipo_visualizacao'],
+            "created_at": row['created_at'],
+        }
+
+    def _montar_catalogo(self, rows):
+        # Mais recentes primeiro, como no SELECT original (ORDER BY created_at DESC)
+        rows = sorted(rows, key=lambda r: str(r['created_at'] or ''), reverse=True)
+        catalogo = {}
+        for row in rows:
+            catalogo.setdefault(row['empreendimento'], {})[row['version_name']] = self._entrada_catalogo(row)
+        return catalogo
+
+    @staticmethod
+    def _entrada_dados(empreendimento, version_name, baseline_data):
+        """{"data", "indice"} de uma linha de gantt_baselines; None se o JSON for inválido"""
+        try:
+            if isinstance(baseline_data, (str, bytes, bytearray)):
+                baseline_data = json.loads(baseline_data)
+        except Exception as e:
+            print(f"ERRO: Baseline {empreendimento}/{version_name} com JSON inválido: {e}")
+            return None
+        return {"data": baseline_data, "indice": indexar_tasks_baseline(baseline_data)}
+
+    def catalogo(self):
+        with self._lock:
+            expirado = time.monotonic() - self._carregado_em > self._ttl
+            if self._catalogo is None or expirado:
+                if self._falhou_em is not None and time.monotonic() - self._falhou_em < self._espera_falha:
+                    return None
+                rows = self._consultar(self.QUERY_CATALOGO)
+                if rows is None:
+                    self._falhou_em = time.monotonic()
+                    return None
+                self._falhou_em = None
+                novo = self._montar_catalogo(rows)
+                # Baselines regravadas por outra instância mudam de created_at: descarta os dados antigos
+                for chave in list(self._dados):
+                    emp, versao = chave
+                    antigo = (self._catalogo or {}).get(emp, {}).get(versao)
+                    atual = novo.get(emp, {}).get(versao)
+                    if atual is None or antigo is None or antigo["created_at"] != atual["created_at"]:
+                        del self._dados[chave]
+                self._geracao += 1
+                self._catalogo = novo
+                self._carregado_em = time.monotonic()
+                print(f"INFO: Catálogo de baselines carregado ({len(rows)} registros)")
+            return self._catalogo
+
+    def dados(self, empreendimento, version_name):
+        chave = (empreendimento, version_name)
+        with self._lock:
+            if chave in self._dados:
+                return self._dados[chave]
+            geracao = self._geracao
+        rows = self._consultar(self.QUERY_DADOS, (empreendimento, version_name))
+        if rows is None:
+            return None  # falha de banco: não guarda, tenta de novo na próxima
+        entrada = self._entrada_dados(empreendimento, version_name, rows[0]['baseline_data']) if rows else None
+        with self._lock:
+            if self._geracao == geracao:
+                self._dados[chave] = entrada
+        return entrada
+
+    def dados_empreendimentos(self, empreendimentos):
+        """
+        {empreendimento: {versão: {"data", "indice"}}} de todas as versões do
+        catálogo dos empreendimentos (na ordem do catálogo, sem as versões sem
+        dados). As entradas fora do cache vêm numa única consulta.
+        """
+        catalogo = self.catalogo() or {}
+        versoes = {emp: list(catalogo.get(emp, {})) for emp in dict.fromkeys(empreendimentos)}
+        with self._lock:
+            entradas = {(emp, v): self._dados[(emp, v)] for emp, vs in versoes.items() for v in vs if (emp, v) in self._dados}
+            geracao = self._geracao
+        faltando = [emp for emp, vs in versoes.items() if any((emp, v) not in entradas for v in vs)]
+        if faltando:
+            query = self.QUERY_DADOS_EMPREENDIMENTOS.format(", ".join(["%s"] * len(faltando)))
+            rows = self._consultar(query, tuple(faltando))
+            if rows is not None:
+                novas = {}
+                for row in rows:
+                    chave = (row['empreendimento'], row['version_name'])
+                    if chave not in entradas:
+                        novas[chave] = self._entrada_dados(*chave, row['baseline_data'])
+                # Versões do catálogo que não vieram na consulta ficam em cache como inexistentes
+                for emp in faltando:
+                    for v in versoes[emp]:
+                        if (emp, v) not in entradas:
+                            novas.setdefault((emp, v), None)
+                entradas.update(novas)
+                with self._lock:
+                    if self._geracao == geracao:
+                        for chave, entrada in novas.items():
+                            self._dados.setdefault(chave, entrada)
+        resultado = {}
+        for emp, vs in versoes.items():
+            por_versao = {v: entradas[(emp, v)] for v in vs if entradas.get((emp, v))}
+            if por_versao:
+                resultado[emp] = por_versao
+        return resultado
+
+    def invalidar(self, empreendimento, version_name=None):
+        """
+        Descarta os dados de uma versão (ou de todas as versões do empreendimento)
+        e recarrega apenas as linhas de catálogo desse empreendimento.
+        """
+        with self._lock:
+            for chave in list(self._dados):
+                if chave[0] == empreendimento and (version_name is None or chave[1] == version_name):
+                    del self._dados[chave]
+            self._geracao += 1
+            if self._catalogo is None:
+                return
+        rows = self._consultar(self.QUERY_CATALOGO + " WHERE empreendimento = %s", (empreendimento,))
+        with self._lock:
+            if rows is None:
+                # Sem banco não há como atualizar só um trecho: força a recarga completa
+                self._catalogo = None
+                return
+            if self._catalogo is None:
+                return
+            # Catálogo novo em vez de alterar o atual: as sessões podem estar iterando sobre ele
+            novo = dict(self._catalogo)
+            versoes = self._montar_catalogo(rows).get(empreendimento)
+            if versoes:
+                novo[empreendimento] = versoes
+            else:
+                novo.pop(empreendimento, None)
+            self._catalogo = novo
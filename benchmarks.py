@@ -0,0 +1,830 @@
+"""
+Benchmarks das rotinas de processamento do Macrofluxo.
+
+Uso:
+    python benchmarks.py gantt [--empreendimentos 500]
+    python benchmarks.py csv [--empreendimentos 300]
+    python benchmarks.py macrofluxo [--planilha "GRÁFICO MACROFLUXO.xlsx"]
+    python benchmarks.py tipos [--empreendimentos 500]
+    python benchmarks.py filtros [--empreendimentos 500]
+    python benchmarks.py tabelao [--empreendimentos 60]
+    python benchmarks.py grade [--empreendimentos 300]
+    python benchmarks.py dias_uteis [--empreendimentos 500]
+    python benchmarks.py pulmao [--empreendimentos 100]
+    python benchmarks.py formato [--empreendimentos 200]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from calculate_business_days import calculate_business_days
+from dias_uteis import calendario_padrao, dias_uteis
+from config_etapas import (
+    SUBETAPAS, ETAPA_PAI_POR_SUBETAPA, GRUPO_POR_ETAPA, SETOR_POR_ETAPA,
+    sigla_para_nome_completo, nome_completo_para_sigla, ORDEM_ETAPAS_GLOBAL, ORDEM_ETAPAS_NOME_COMPLETO,
+)
+
+
+def _cronometrar(funcao, repeticoes=3):
+    """Executa a função algumas vezes e retorna (melhor tempo em segundos, último resultado)."""
+    melhor = float("inf")
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def gerar_dados_sinteticos(n_empreendimentos=500, semente=42):
+    """
+    DataFrame no formato do df_data (uma linha por Empreendimento/Etapa, siglas em 'Etapa').
+    """
+    rng = np.random.default_rng(semente)
+    base = pd.Timestamp("2023-01-02")
+    linhas = []
+    for e in range(n_empreendimentos):
+        emp = f"EMPREENDIMENTO {e:04d}"
+        ugb = f"UGB{e % 12}"
+        inicio_emp = base + pd.Timedelta(days=int(rng.integers(0, 700)))
+        for k, etapa in enumerate(ORDEM_ETAPAS_GLOBAL):
+            inicio_prev = inicio_emp + pd.Timedelta(days=15 * k + int(rng.integers(0, 10)))
+            termino_prev = inicio_prev + pd.Timedelta(days=int(rng.integers(10, 120)))
+            tem_real = rng.random() < 0.6
+            inicio_real = inicio_prev + pd.Timedelta(days=int(rng.integers(-10, 30))) if tem_real else pd.NaT
+            termino_real = (inicio_real + pd.Timedelta(days=int(rng.integers(5, 150)))
+                            if tem_real and rng.random() < 0.7 else pd.NaT)
+            progresso = 100.0 if pd.notna(termino_real) else float(rng.choice([0, 25, 50, 75]))
+            linhas.append({
+                "UGB": ugb,
+                "Empreendimento": emp,
+                "Etapa": etapa,
+                "Inicio_Prevista": inicio_prev if rng.random() > 0.05 else pd.NaT,
+                "Termino_Prevista": termino_prev if rng.random() > 0.05 else pd.NaT,
+                "Inicio_Real": inicio_real,
+                "Termino_Real": termino_real,
+                "% concluído": progresso,
+            })
+    df = pd.DataFrame(linhas)
+    df["GRUPO"] = df["Etapa"].map(GRUPO_POR_ETAPA).fillna("Não especificado")
+    df["SETOR"] = df["Etapa"].map(SETOR_POR_ETAPA).fillna("Não especificado")
+    return df
+
+
+def _agregar_como_gantt_por_projeto(df):
+    """Mesma agregação feita em gerar_gantt_por_projeto antes de converter_dados_para_gantt."""
+    df_agg = df.groupby(["Empreendimento", "Etapa"]).agg(
+        Inicio_Prevista=("Inicio_Prevista", "min"),
+        Termino_Prevista=("Termino_Prevista", "max"),
+        Inicio_Real=("Inicio_Real", "min"),
+        Termino_Real=("Termino_Real", "max"),
+        **{"% concluído": ("% concluído", "max")},
+        UGB=("UGB", "first"),
+        SETOR=("SETOR", "first"),
+    ).reset_index()
+    for col in ["Inicio_Prevista", "Termino_Prevista", "Inicio_Real", "Termino_Real"]:
+        df_agg[col] = df_agg[col].apply(lambda x: None if pd.isna(x) else x)
+    df_agg["Etapa"] = df_agg["Etapa"].map(sigla_para_nome_completo).fillna(df_agg["Etapa"])
+    return df_agg
+
+
+def _converter_porcentagem(valor):
+    if pd.isna(valor) or valor == "":
+        return 0.0
+    val_float = float(valor)
+    return val_float * 100 if val_float <= 1 else val_float
+
+
+def converter_dados_para_gantt_iterrows(df, baseline_ativa=False, agora=None):
+    """
+    Implementação original (linha a linha) de converter_dados_para_gantt, sem a etapa
+    de baselines, usada como referência de tempo e de equivalência.
+    """
+    agora = agora or datetime.now()
+    gantt_data = []
+    for empreendimento in df["Empreendimento"].unique():
+        df_emp = df[df["Empreendimento"] == empreendimento].copy()
+
+        etapas_pai_para_calcular = {}
+        for etapa_pai, subetapas in SUBETAPAS.items():
+            subetapas_emp = df_emp[df_emp["Etapa"].isin([nome_completo_para_sigla.get(sub, sub) for sub in subetapas])]
+            if not subetapas_emp.empty:
+                etapas_pai_para_calcular[etapa_pai] = {
+                    "inicio_real": subetapas_emp["Inicio_Real"].min(),
+                    "termino_real": subetapas_emp["Termino_Real"].max(),
+                }
+
+        tasks = []
+        df_emp['Etapa'] = pd.Categorical(df_emp['Etapa'], categories=ORDEM_ETAPAS_NOME_COMPLETO, ordered=True)
+        df_emp_sorted = df_emp.sort_values(by='Etapa').reset_index()
+
+        for i, (idx, row) in enumerate(df_emp_sorted.iterrows()):
+            start_date = row.get("Inicio_Prevista")
+            end_date = row.get("Termino_Prevista")
+            start_real = row.get("Inicio_Real")
+            end_real_original = row.get("Termino_Real")
+            progress = row.get("% concluído", 0)
+
+            etapa_sigla = row.get("Etapa", "UNKNOWN")
+            etapa_nome_completo = sigla_para_nome_completo.get(etapa_sigla, etapa_sigla)
+
+            if etapa_nome_completo in etapas_pai_para_calcular:
+                dados_pai = etapas_pai_para_calcular[etapa_nome_completo]
+                if pd.notna(dados_pai["inicio_real"]):
+                    start_real = dados_pai["inicio_real"]
+                if pd.notna(dados_pai["termino_real"]):
+                    end_real_original = dados_pai["termino_real"]
+                subetapas_emp = df_emp[df_emp["Etapa"].isin([nome_completo_para_sigla.get(sub, sub) for sub in SUBETAPAS[etapa_nome_completo]])]
+                if not subetapas_emp.empty and "% concluído" in subetapas_emp.columns:
+                    progress = subetapas_emp["% concluído"].apply(_converter_porcentagem).mean()
+
+            etapa_eh_subetapa = etapa_nome_completo in ETAPA_PAI_POR_SUBETAPA
+            if etapa_eh_subetapa and not baseline_ativa:
+                start_date = None
+                end_date = None
+            if etapa_eh_subetapa:
+                if pd.isna(start_real) and pd.isna(end_real_original):
+                    if pd.isna(start_date) and pd.isna(end_date):
+                        continue
+            if not etapa_eh_subetapa:
+                if pd.notna(start_date) or pd.notna(end_date):
+                    if pd.isna(start_date) or start_date is None:
+                        start_date = agora
+                    if pd.isna(end_date) or end_date is None:
+                        end_date = start_date + timedelta(days=30)
+
+            end_real_visual = end_real_original
+            if pd.notna(start_real) and progress < 100 and pd.isna(end_real_original):
+                end_real_visual = agora
+
+            grupo = "Não especificado"
+            if etapa_nome_completo in GRUPO_POR_ETAPA:
+                grupo = GRUPO_POR_ETAPA[etapa_nome_completo]
+            elif etapa_sigla in GRUPO_POR_ETAPA:
+                grupo = GRUPO_POR_ETAPA[etapa_sigla]
+
+            dur_prev_meses = None
+            if pd.notna(start_date) and pd.notna(end_date):
+                dur_prev_meses = (end_date - start_date).days / 30.4375
+            dur_real_meses = None
+            if pd.notna(start_real) and pd.notna(end_real_original):
+                dur_real_meses = (end_real_original - start_real).days / 30.4375
+
+            vt = calculate_business_days(end_date, end_real_original)
+            duracao_prevista_uteis = calculate_business_days(start_date, end_date)
+            duracao_real_uteis = calculate_business_days(start_real, end_real_original)
+            vd = None
+            if pd.notna(duracao_real_uteis) and pd.notna(duracao_prevista_uteis):
+                vd = duracao_real_uteis - duracao_prevista_uteis
+
+            status_color_class = 'status-default'
+            hoje = pd.Timestamp(agora).normalize()
+            if progress == 100:
+                if pd.notna(end_real_original) and pd.notna(end_date):
+                    status_color_class = 'status-green' if end_real_original <= end_date else 'status-red'
+            elif progress < 100 and pd.notna(start_real) and pd.notna(end_real_original) and (end_real_original < hoje):
+                status_color_class = 'status-yellow'
+
+            ugb_value = "N/D"
+            if "UGB" in df_emp.columns:
+                ugb_series = df_emp["UGB"].dropna()
+                if not ugb_series.empty:
+                    ugb_value = str(ugb_series.iloc[0])
+
+            tasks.append({
+                "id": f"t{i}", "name": etapa_nome_completo, "numero_etapa": i + 1,
+                "start_previsto": start_date.strftime("%Y-%m-%d") if pd.notna(start_date) and start_date is not None else None,
+                "end_previsto": end_date.strftime("%Y-%m-%d") if pd.notna(end_date) and end_date is not None else None,
+                "start_real": pd.to_datetime(start_real).strftime("%Y-%m-%d") if pd.notna(start_real) else None,
+                "end_real": pd.to_datetime(end_real_visual).strftime("%Y-%m-%d") if pd.notna(end_real_visual) else None,
+                "end_real_original_raw": pd.to_datetime(end_real_original).strftime("%Y-%m-%d") if pd.notna(end_real_original) else None,
+                "ugb": ugb_value,
+                "setor": row.get("SETOR", "Não especificado"),
+                "grupo": grupo,
+                "progress": int(progress),
+                "inicio_previsto": start_date.strftime("%d/%m/%y") if pd.notna(start_date) and start_date is not None else "N/D",
+                "termino_previsto": end_date.strftime("%d/%m/%y") if pd.notna(end_date) and end_date is not None else "N/D",
+                "inicio_real": pd.to_datetime(start_real).strftime("%d/%m/%y") if pd.notna(start_real) else "N/D",
+                "termino_real": pd.to_datetime(end_real_original).strftime("%d/%m/%y") if pd.notna(end_real_original) else "N/D",
+                "duracao_prev_meses": f"{dur_prev_meses:.1f}".replace('.', ',') if dur_prev_meses is not None else "-",
+                "duracao_real_meses": f"{dur_real_meses:.1f}".replace('.', ',') if dur_real_meses is not None else "-",
+                "vt_text": f"{int(vt):+d}d" if pd.notna(vt) else "-",
+                "vd_text": f"{int(vd):+d}d" if pd.notna(vd) else "-",
+                "status_color_class": status_color_class,
+                "baselines": {},
+            })
+
+        data_meta = None
+        df_meta = df_emp[df_emp["Etapa"] == "DEMANDA MÍNIMA"]
+        if not df_meta.empty:
+            for col in ["Inicio_Prevista", "Inicio_Real", "Termino_Prevista", "Termino_Real"]:
+                if pd.notna(df_meta[col].iloc[0]):
+                    data_meta = pd.to_datetime(df_meta[col].iloc[0])
+                    break
+
+        gantt_data.append({
+            "id": f"p{len(gantt_data)}", "name": empreendimento,
+            "tasks": tasks,
+            "meta_assinatura_date": data_meta.strftime("%Y-%m-%d") if data_meta else None,
+        })
+    return gantt_data
+
+
+def benchmark_gantt(n_empreendimentos):
+    from gantt_builder import construir_gantt_por_projeto
+
+    df_agg = _agregar_como_gantt_por_projeto(gerar_dados_sinteticos(n_empreendimentos))
+    agora = datetime(2025, 6, 2, 10, 30)
+    print(f"Gantt por projeto: {df_agg['Empreendimento'].nunique()} empreendimentos, {len(df_agg)} linhas agregadas")
+
+    for baseline_ativa in (False, True):
+        t_antigo, antigo = _cronometrar(lambda: converter_dados_para_gantt_iterrows(df_agg, baseline_ativa, agora), repeticoes=1)
+        t_novo, novo = _cronometrar(lambda: construir_gantt_por_projeto(df_agg, baseline_ativa, agora))
+        iguais = json.dumps(antigo, default=str) == json.dumps(novo, default=str)
+        print(f"  baseline_ativa={baseline_ativa}: iterrows {t_antigo:.2f}s | vetorizado {t_novo:.3f}s "
+              f"| {t_antigo / t_novo:.0f}x | saída idêntica: {iguais}")
+
+
+def gerar_csv_relatorio(caminho, n_empreendimentos=300, semente=42):
+    """CSV no formato do 'Relatório MF- Smart' exportado pelo Smartsheet."""
+    rng = np.random.default_rng(semente)
+    base = pd.Timestamp("2023-01-02")
+    linhas = []
+    for e in range(n_empreendimentos):
+        emp = f"{e % 9 + 1}.EMPREENDIMENTO {e:04d}"
+        for k, etapa in enumerate(ORDEM_ETAPAS_GLOBAL):
+            inicio = base + pd.Timedelta(days=int(rng.integers(0, 900)))
+            fim = inicio + pd.Timedelta(days=int(rng.integers(5, 120)))
+            linhas.append({
+                "ID": len(linhas) + 1,
+                "Empreendimento": emp,
+                "Primário": etapa,
+                "Serviço": f"Serviço {k}",
+                "%": f"{int(rng.choice([0, 25, 50, 75, 100]))}%",
+                "Data de Início": inicio.strftime("%d/%m/%Y") if rng.random() < 0.8 else "",
+                "Data de Fim": fim.strftime("%d/%m/%Y") if rng.random() < 0.6 else "",
+                "Fase": "EXECUÇÃO",
+                "Início LB": inicio.strftime("%d/%m/%Y"),
+                "Término LB": fim.strftime("%d/%m/%Y"),
+                "Origem Planil": "MACROFLUXO",
+            })
+    pd.DataFrame(linhas).to_csv(caminho, index=False)
+    return len(linhas)
+
+
+def get_report_data_legado(client, report_id):
+    """Caminho anterior: download para o diretório do app, read_csv padrão e remoção do arquivo."""
+    result = client.Reports.get_report_as_csv(report_id, download_path=".")
+    try:
+        return pd.read_csv(result.filename, sep=',')
+    finally:
+        os.remove(result.filename)
+
+
+def _normalizar(df):
+    """Mesmo conteúdo independentemente de dtype (object x string) e do tipo de nulo."""
+    df = df.reset_index(drop=True).astype(object)
+    return df.where(df.notna(), None)
+
+
+def benchmark_csv(n_empreendimentos):
+    from smartsheet_local import ClienteSmartsheetLocal, ID_RELATORIO_LOCAL
+    from tratamento_dados_reais import ENGINE_CSV, get_report_data, processar_dados_macrofluxo
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "relatorio.csv")
+        n_linhas = gerar_csv_relatorio(caminho, n_empreendimentos)
+        client = ClienteSmartsheetLocal(caminho)
+        print(f"CSV do relatório: {n_linhas} linhas, {os.path.getsize(caminho) / 1e6:.1f} MB")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            t_antigo, antigo = _cronometrar(lambda: get_report_data_legado(client, ID_RELATORIO_LOCAL))
+            t_novo, novo = _cronometrar(lambda: get_report_data(client, ID_RELATORIO_LOCAL))
+            processado_antigo = processar_dados_macrofluxo(antigo)
+            processado_novo = processar_dados_macrofluxo(novo)
+
+    iguais = _normalizar(processado_antigo).equals(_normalizar(processado_novo))
+    print(f"  download + leitura: arquivo no diretório do app + read_csv padrão {t_antigo:.3f}s "
+          f"| diretório temporário + {ENGINE_CSV} com dtypes {t_novo:.3f}s "
+          f"| {t_antigo / t_novo:.1f}x | saída processada idêntica: {iguais}")
+
+
+def extrair_atributos_legado(atributo):
+    """Parse anterior, aplicado linha a linha (cópia de referência de tratar_macrofluxo)."""
+    match_completo = pd.Series(atributo).str.extract(r'(.+)\.(REAL|PREV)\.(INICIO|TERMINO)').iloc[0]
+    if not match_completo.isnull().any():
+        return match_completo
+    match_simples = pd.Series(atributo).str.extract(r'(.+)\.(INICIO|TERMINO)').iloc[0]
+    if not match_simples.isnull().any():
+        etapa_tipo = match_simples[0]
+        inicio_fim = match_simples[1]
+        match_tipo = pd.Series(etapa_tipo).str.extract(r'(.+)\.(REAL|PREV)').iloc[0]
+        if not match_tipo.isnull().any():
+            return pd.Series([match_tipo[0], match_tipo[1], inicio_fim])
+        return pd.Series([etapa_tipo, 'PREV', inicio_fim])
+    return pd.Series([None, None, None])
+
+
+def benchmark_macrofluxo(planilha):
+    from tratamento_macrofluxo import separar_atributos
+
+    df = pd.read_excel(planilha, sheet_name="GERAL", header=6)
+    colunas_unpivot = [c for c in df.columns if any(t in str(c) for t in (".INICIO", ".TERMINO"))]
+    colunas_fixas = [c for c in df.columns if c not in colunas_unpivot]
+    atributos = pd.melt(df, id_vars=colunas_fixas, value_vars=colunas_unpivot, var_name="Atributo")["Atributo"]
+    print(f"Planilha {planilha}: {len(atributos)} linhas após o melt, {atributos.nunique()} cabeçalhos distintos")
+
+    t_antigo, antigo = _cronometrar(lambda: atributos.apply(extrair_atributos_legado), repeticoes=1)
+    t_novo, novo = _cronometrar(lambda: separar_atributos(atributos))
+    antigo.columns = novo.columns
+    iguais = _normalizar(antigo).equals(_normalizar(novo))
+    print(f"  parse dos atributos: apply por linha {t_antigo:.3f}s | por cabeçalho distinto {t_novo * 1000:.1f}ms "
+          f"| {t_antigo / t_novo:.0f}x | saída idêntica: {iguais}")
+
+
+def _filter_dataframe(df, ugb_filter, emp_filter, grupo_filter, setor_filter):
+    """Corpo do antigo filter_dataframe (app.py), sem o st.cache_data."""
+    if not ugb_filter:
+        return df.iloc[0:0]
+    df_filtered = df[df["UGB"].isin(ugb_filter)]
+    if emp_filter:
+        df_filtered = df_filtered[df_filtered["Empreendimento"].isin(emp_filter)]
+    if grupo_filter:
+        df_filtered = df_filtered[df_filtered["GRUPO"].isin(grupo_filter)]
+    if setor_filter:
+        df_filtered = df_filtered[df_filtered["SETOR"].isin(setor_filter)]
+    return df_filtered
+
+
+def _agregar_por_empreendimento_etapa(df, **kwargs):
+    """Conversão das datas (se ainda não são datetime64) + groupby(['Empreendimento', 'Etapa']) de gerar_gantt_por_projeto."""
+    df = df.copy()
+    for col in ["Inicio_Prevista", "Termino_Prevista", "Inicio_Real", "Termino_Real"]:
+        if not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+    return df.groupby(["Empreendimento", "Etapa"], **kwargs).agg(
+        Inicio_Prevista=("Inicio_Prevista", "min"),
+        Termino_Prevista=("Termino_Prevista", "max"),
+        Inicio_Real=("Inicio_Real", "min"),
+        Termino_Real=("Termino_Real", "max"),
+        **{"% concluído": ("% concluído", "max")},
+        UGB=("UGB", "first"),
+        SETOR=("SETOR", "first"),
+    ).reset_index()
+
+
+def benchmark_tipos(n_empreendimentos):
+    from pipeline_dados import compactar_tipos, memoria_por_coluna
+
+    # Formato devolvido pelo pipeline antes da compactação: textos e datas (datetime.date) como object
+    legado = gerar_dados_sinteticos(n_empreendimentos)
+    for col in ["Inicio_Prevista", "Termino_Prevista", "Inicio_Real", "Termino_Real"]:
+        legado[col] = legado[col].dt.date.astype(object).where(legado[col].notna(), None)
+    compacto = compactar_tipos(legado)
+
+    memoria_antes = memoria_por_coluna(legado).sum() / 1e6
+    memoria_depois = memoria_por_coluna(compacto).sum() / 1e6
+    print(f"df_data: {len(legado)} linhas | memória {memoria_antes:.1f} MB -> {memoria_depois:.1f} MB "
+          f"({memoria_antes / memoria_depois:.1f}x menor)")
+
+    t_antigo, _ = _cronometrar(legado.copy, repeticoes=10)
+    t_novo, _ = _cronometrar(compacto.copy, repeticoes=10)
+    print(f"  df.copy(): object {t_antigo * 1000:.1f}ms | compacto {t_novo * 1000:.1f}ms | {t_antigo / t_novo:.1f}x")
+
+    ugbs = sorted(legado["UGB"].unique())[: max(1, legado["UGB"].nunique() // 2)]
+    filtros = (
+        ugbs,
+        sorted(legado.loc[legado["UGB"].isin(ugbs), "Empreendimento"].unique()),
+        sorted(legado["GRUPO"].unique()),
+        sorted(legado["SETOR"].unique()),
+    )
+    t_antigo, antigo = _cronometrar(lambda: _filter_dataframe(legado, *filtros), repeticoes=10)
+    t_novo, novo = _cronometrar(lambda: _filter_dataframe(compacto, *filtros), repeticoes=10)
+    iguais = antigo.index.equals(novo.index)
+    print(f"  filter_dataframe: object {t_antigo * 1000:.1f}ms | compacto {t_novo * 1000:.1f}ms "
+          f"| {t_antigo / t_novo:.1f}x | mesmas linhas: {iguais}")
+
+    t_antigo, antigo = _cronometrar(lambda: _agregar_por_empreendimento_etapa(legado))
+    t_novo, novo = _cronometrar(lambda: _agregar_por_empreendimento_etapa(compacto, observed=True))
+    novo["% concluído"] = novo["% concluído"].astype(float)
+    iguais = _normalizar(antigo).equals(_normalizar(novo))
+    print(f"  groupby(['Empreendimento', 'Etapa']).agg: object {t_antigo * 1000:.1f}ms | compacto {t_novo * 1000:.1f}ms "
+          f"| {t_antigo / t_novo:.1f}x | saída idêntica: {iguais}")
+
+
+def benchmark_filtros(n_empreendimentos):
+    from filtros_dados import MotorFiltros
+    from pipeline_dados import compactar_tipos
+
+    df = compactar_tipos(gerar_dados_sinteticos(n_empreendimentos))
+    rng = np.random.default_rng(7)
+    ugbs = sorted(df["UGB"].unique())
+    combinacoes = []
+    for _ in range(20):
+        ugb = sorted(rng.choice(ugbs, size=int(rng.integers(1, len(ugbs) + 1)), replace=False))
+        emps = sorted(df.loc[df["UGB"].isin(ugb), "Empreendimento"].unique())
+        emp = sorted(rng.choice(emps, size=int(rng.integers(1, len(emps) + 1)), replace=False)) if rng.random() < 0.5 else emps
+        grupo = sorted(df["GRUPO"].unique())
+        setor = sorted(rng.choice(sorted(df["SETOR"].unique()), size=3, replace=False)) if rng.random() < 0.5 else []
+        combinacoes.append((ugb, emp, grupo, setor))
+    print(f"Filtros: {len(df)} linhas, {len(combinacoes)} combinações de filtro, cada uma aplicada 2x por rerun")
+
+    def antigo():
+        # st.cache_data hasheia o df (pd.util.hash_pandas_object) a cada chamada para achar a entrada do cache
+        for filtros in combinacoes:
+            for _ in range(2):
+                pd.util.hash_pandas_object(df).values.tobytes()
+                resultado = _filter_dataframe(df, *filtros)
+        return resultado
+
+    t_montagem, motor = _cronometrar(lambda: MotorFiltros(df), repeticoes=1)
+
+    def novo():
+        # Motor novo a cada repetição: a montagem entra na conta e o cache interno começa vazio
+        motor = MotorFiltros(df)
+        for filtros in combinacoes:
+            for _ in range(2):
+                resultado = motor.filtrar(*filtros)
+        return resultado
+
+    t_antigo, _ = _cronometrar(antigo)
+    t_novo, _ = _cronometrar(novo)
+    iguais = all(_filter_dataframe(df, *f).equals(motor.filtrar(*f)) for f in combinacoes)
+    print(f"  montagem do MotorFiltros (uma vez por snapshot): {t_montagem * 1000:.1f}ms")
+    print(f"  filtros: hash + máscaras {t_antigo * 1000:.1f}ms | montagem + índices {t_novo * 1000:.1f}ms "
+          f"| {t_antigo / t_novo:.0f}x | mesmas linhas: {iguais}")
+
+
+def _montar_tabelao(df):
+    """df_agregado, df_final e df_formatado como no Tabelão Horizontal (ordenação padrão)."""
+    df_agregado = df.groupby(["UGB", "Empreendimento", "Etapa"], observed=True).agg(
+        Inicio_Prevista=("Inicio_Prevista", "min"),
+        Termino_Prevista=("Termino_Prevista", "max"),
+        Inicio_Real=("Inicio_Real", "min"),
+        Termino_Real=("Termino_Real", "max"),
+        Percentual_Concluido=("% concluído", "max"),
+    ).reset_index()
+    df_agregado["Var. Term"] = dias_uteis(df_agregado["Termino_Prevista"], df_agregado["Termino_Real"])
+    df_pivot = df_agregado.pivot_table(
+        index=["UGB", "Empreendimento"], columns="Etapa",
+        values=["Inicio_Prevista", "Termino_Prevista", "Inicio_Real", "Termino_Real", "Var. Term"],
+        aggfunc="first", observed=True,
+    )
+    existentes = set(df_pivot.columns.get_level_values(1))
+    tipos = ["Inicio_Prevista", "Termino_Prevista", "Inicio_Real", "Termino_Real", "Var. Term"]
+    colunas = [(tipo, etapa) for etapa in ORDEM_ETAPAS_GLOBAL if etapa in existentes
+               for tipo in tipos if (tipo, etapa) in df_pivot.columns]
+    df_final = df_pivot[colunas].reset_index()
+    nomes_tipo = {"Inicio_Prevista": "Início Prev.", "Termino_Prevista": "Término Prev.", "Inicio_Real": "Início Real",
+                  "Termino_Real": "Término Real", "Var. Term": "VarTerm"}
+    df_final.columns = pd.MultiIndex.from_tuples([
+        (col[0], "") if col[0] in ["UGB", "Empreendimento"] else (sigla_para_nome_completo.get(col[1], col[1]), nomes_tipo[col[0]])
+        for col in df_final.columns
+    ])
+    df_formatado = df_final.copy()
+    for col in df_formatado.columns:
+        if col[1] in ("Início Prev.", "Término Prev.", "Início Real", "Término Real"):
+            df_formatado[col] = df_formatado[col].apply(lambda x: "-" if pd.isna(x) else x.strftime("%d/%m/%Y"))
+        elif col[1] == "VarTerm":
+            df_formatado[col] = df_formatado[col].apply(
+                lambda x: "-" if pd.isna(x) else f"{'▼' if x > 0 else '▲'} {abs(int(x))} dias")
+    return df_agregado, df_final, df_formatado
+
+
+def aplicar_estilos_legado(df, df_agregado, hoje):
+    """aplicar_estilos/determinar_cor originais do Tabelão: um filtro do df_agregado por célula."""
+    def determinar_cor(row, col_tuple):
+        if len(col_tuple) == 2 and (col_tuple[1] in ["Início Real", "Término Real"]):
+            etapa_sigla = nome_completo_para_sigla.get(col_tuple[0])
+            if etapa_sigla:
+                etapa_data = df_agregado[
+                    (df_agregado["UGB"] == row[("UGB", "")]) &
+                    (df_agregado["Empreendimento"] == row[("Empreendimento", "")]) &
+                    (df_agregado["Etapa"] == etapa_sigla)
+                ]
+                if not etapa_data.empty:
+                    etapa_data = etapa_data.iloc[0]
+                    percentual = etapa_data.get("Percentual_Concluido", 0)
+                    termino_real = etapa_data["Termino_Real"]
+                    termino_previsto = etapa_data["Termino_Prevista"]
+                    if percentual == 100:
+                        if pd.notna(termino_real) and pd.notna(termino_previsto):
+                            if termino_real < termino_previsto:
+                                return "color: #2EAF5B; font-weight: bold;"
+                            elif termino_real > termino_previsto:
+                                return "color: #C30202; font-weight: bold;"
+                    elif pd.notna(termino_real) and (termino_real < hoje):
+                        return "color: #A38408; font-weight: bold;"
+        return ""
+
+    styles = pd.DataFrame("", index=df.index, columns=df.columns)
+    for i, row in df.iterrows():
+        cor_fundo = "#fbfbfb" if i % 2 == 0 else "#ffffff"
+        for col_tuple in df.columns:
+            cell_style = f"background-color: {cor_fundo};"
+            if len(col_tuple) == 2 and col_tuple[1] != "":
+                if row[col_tuple] == "-":
+                    cell_style += " color: #999999; font-style: italic;"
+                elif col_tuple[1] in ["Início Real", "Término Real"]:
+                    cor_condicional = determinar_cor(row, col_tuple)
+                    if cor_condicional:
+                        cell_style += f" {cor_condicional}"
+                elif "VarTerm" in col_tuple[1]:
+                    if "▲" in str(row[col_tuple]):
+                        cell_style += " color: #e74c3c; font-weight: 600;"
+                    elif "▼" in str(row[col_tuple]):
+                        cell_style += " color: #2ecc71; font-weight: 600;"
+            styles.at[i, col_tuple] = cell_style
+    return styles
+
+
+def benchmark_tabelao(n_empreendimentos):
+    from estilo_tabelao import matriz_estilos
+    from pipeline_dados import compactar_tipos
+
+    df_agregado, _, df_formatado = _montar_tabelao(compactar_tipos(gerar_dados_sinteticos(n_empreendimentos)))
+    hoje = pd.Timestamp("2025-06-02")
+    print(f"Tabelão: {df_formatado.shape[0]} linhas x {df_formatado.shape[1]} colunas, "
+          f"{len(df_agregado)} linhas no df_agregado")
+
+    t_antigo, antigo = _cronometrar(lambda: aplicar_estilos_legado(df_formatado, df_agregado, hoje), repeticoes=1)
+    t_novo, novo = _cronometrar(lambda: matriz_estilos(df_formatado, df_agregado, hoje))
+    print(f"  estilos: filtro por célula {t_antigo:.2f}s | vetorizado {t_novo * 1000:.1f}ms "
+          f"| {t_antigo / t_novo:.0f}x | matriz idêntica: {antigo.equals(novo)}")
+
+
+def _textos_da_grade(linhas, etapas):
+    """Texto que a grade exibe em cada célula (espelho dos valueFormatter de grade_tabelao.py)."""
+    textos = {("UGB", ""): linhas["ugb"], ("Empreendimento", ""): linhas["emp"]}
+    for nome, campos in etapas:
+        for tipo, campo in campos:
+            if tipo == "VarTerm":
+                textos[(nome, tipo)] = linhas[campo].map(
+                    lambda v: "-" if pd.isna(v) else f"{'▼' if v > 0 else '▲'} {abs(int(v))} dias")
+            else:
+                textos[(nome, tipo)] = linhas[campo].map(lambda v: "-" if pd.isna(v) else f"{v[8:10]}/{v[5:7]}/{v[:4]}")
+    return pd.DataFrame(textos)
+
+
+def benchmark_grade(n_empreendimentos):
+    from estilo_tabelao import CSS_POR_STATUS, matriz_estilos
+    from grade_tabelao import linhas_grade
+    from pipeline_dados import compactar_tipos
+
+    df_agregado, df_final, df_formatado = _montar_tabelao(
+        compactar_tipos(gerar_dados_sinteticos(n_empreendimentos)))
+    hoje = pd.Timestamp("2025-06-02")
+    print(f"Tabelão: {df_final.shape[0]} linhas x {df_final.shape[1]} colunas")
+
+    def styler():
+        return df_formatado.style.apply(lambda df: matriz_estilos(df, df_agregado, hoje), axis=None).to_html()
+
+    def grade():
+        linhas, etapas = linhas_grade(df_final, df_agregado, hoje)
+        return linhas, etapas, linhas.to_json(orient="records")
+
+    t_styler, html = _cronometrar(styler, repeticoes=1)
+    t_grade, (linhas, etapas, registros) = _cronometrar(grade)
+    print(f"  Styler (texto + CSS por célula): {t_styler:.2f}s, {len(html.encode()) / 1e6:.1f} MB de HTML")
+    print(f"  grade (valores crus + status):   {t_grade * 1000:.0f}ms, {len(registros.encode()) / 1e6:.2f} MB de JSON")
+
+    # Mesmo texto por célula e mesmo status das datas reais que o Styler
+    textos = _textos_da_grade(linhas, etapas)
+    textos.columns = pd.MultiIndex.from_tuples(textos.columns)
+    mesmos_textos = textos.astype(str).equals(df_formatado.astype(str))
+    estilos = matriz_estilos(df_formatado, df_agregado, hoje)
+    mesmo_status = True
+    for k, (nome, campos) in enumerate(etapas):
+        for tipo, campo in campos:
+            if tipo in ("Início Real", "Término Real"):
+                esperado = np.where(linhas[campo].isna(), "", CSS_POR_STATUS[linhas[f"e{k}_st"].to_numpy()])
+                obtido = estilos[(nome, tipo)].map(
+                    lambda css: next((c for c in CSS_POR_STATUS[1:] if c in css), "") if "italic" not in css else "")
+                mesmo_status &= bool((obtido.to_numpy() == esperado).all())
+    print(f"  textos idênticos: {mesmos_textos} | status das datas reais idêntico: {mesmo_status}")
+
+
+def _dias_uteis_legado(inicio, fim):
+    """calculate_business_days original: np.busday_count escalar, sem feriados."""
+    if pd.isna(inicio) or pd.isna(fim):
+        return np.nan
+    return np.busday_count(pd.to_datetime(inicio).date(), pd.to_datetime(fim).date())
+
+
+def benchmark_dias_uteis(n_empreendimentos):
+    df = gerar_dados_sinteticos(n_empreendimentos)
+    calendario = calendario_padrao()
+    print(f"dias úteis: {len(df)} linhas, {len(calendario.holidays)} feriados no calendário")
+
+    def por_linha():
+        return df.apply(lambda row: _dias_uteis_legado(row["Termino_Prevista"], row["Termino_Real"]), axis=1)
+
+    def vetorizado():
+        return dias_uteis(df["Termino_Prevista"], df["Termino_Real"])
+
+    t_antigo, antigo = _cronometrar(por_linha, repeticoes=1)
+    t_novo, novo = _cronometrar(vetorizado)
+    print(f"  VT: apply por linha {t_antigo:.2f}s | coluna inteira {t_novo * 1000:.1f}ms | {t_antigo / t_novo:.0f}x")
+
+    # Equivalências: sem feriados reproduz o cálculo antigo; com feriados, o busday_count escalar com o mesmo calendário
+    sem_feriados = dias_uteis(df["Termino_Prevista"], df["Termino_Real"], calendario=np.busdaycalendar())
+    iguais_legado = np.allclose(sem_feriados, antigo.to_numpy(dtype=float), equal_nan=True)
+    com_feriados = df.apply(lambda row: np.nan if pd.isna(row["Termino_Prevista"]) or pd.isna(row["Termino_Real"])
+                            else np.busday_count(row["Termino_Prevista"].date(), row["Termino_Real"].date(),
+                                                 busdaycal=calendario), axis=1)
+    iguais_feriados = np.allclose(novo, com_feriados.to_numpy(dtype=float), equal_nan=True)
+    inclusivo = dias_uteis(df["Inicio_Real"], df["Termino_Real"], inclusivo=True, calendario=np.busdaycalendar())
+    legado_inclusivo = df.apply(lambda row: _dias_uteis_legado(row["Inicio_Real"], row["Termino_Real"]) + 1, axis=1)
+    iguais_inclusivo = np.allclose(inclusivo, legado_inclusivo.to_numpy(dtype=float), equal_nan=True)
+    diferentes = int(np.sum(~np.isnan(novo) & (novo != sem_feriados)))
+    print(f"  sem feriados = legado: {iguais_legado} | com feriados = escalar: {iguais_feriados} "
+          f"| inclusivo = calcular_dias_uteis: {iguais_inclusivo} | linhas alteradas pelos feriados: {diferentes}")
+
+
+def ajustar_datas_com_pulmao_legado(df, meses_pulmao=0):
+    """ajustar_datas_com_pulmao original: iterrows + df.loc célula a célula."""
+    from dateutil.relativedelta import relativedelta
+
+    df_copy = df.copy()
+    if meses_pulmao > 0:
+        for i, row in df_copy.iterrows():
+            if "PULMÃO" in row["Etapa"].upper():
+                if pd.notna(row["Termino_Prevista"]):
+                    df_copy.loc[i, "Termino_Prevista"] = row["Termino_Prevista"] + relativedelta(months=meses_pulmao)
+            else:
+                if pd.notna(row["Inicio_Prevista"]):
+                    df_copy.loc[i, "Inicio_Prevista"] = row["Inicio_Prevista"] + relativedelta(months=meses_pulmao)
+                if pd.notna(row["Termino_Prevista"]):
+                    df_copy.loc[i, "Termino_Prevista"] = row["Termino_Prevista"] + relativedelta(months=meses_pulmao)
+    return df_copy
+
+
+def benchmark_pulmao(n_empreendimentos):
+    from ajuste_pulmao import AjustePulmao, ajustar_datas_com_pulmao
+
+    df = gerar_dados_sinteticos(n_empreendimentos)
+    df["Etapa"] = df["Etapa"].map(sigla_para_nome_completo).fillna(df["Etapa"])  # "PULMÃO ..." por extenso
+    print(f"pulmão: {len(df)} linhas, {df['Etapa'].str.contains('PULMÃO').sum()} de pulmão")
+
+    t_antigo, antigo = _cronometrar(lambda: ajustar_datas_com_pulmao_legado(df, 3), repeticoes=1)
+    t_novo, novo = _cronometrar(lambda: ajustar_datas_com_pulmao(df, 3))
+    print(f"  3 meses: iterrows {t_antigo:.2f}s | vetorizado {t_novo * 1000:.1f}ms | {t_antigo / t_novo:.0f}x "
+          f"| resultado idêntico: {antigo.equals(novo)}")
+
+    # Modo incremental: o usuário alterna os meses de pulmão sobre o mesmo df
+    sequencia = [1, 2, 3, 6, 3, 2, 1, 12]
+    t_avulso, _ = _cronometrar(lambda: [ajustar_datas_com_pulmao(df, m) for m in sequencia])
+    ajuste = AjustePulmao(df)
+    t_incremental, resultados = _cronometrar(lambda: [ajuste.aplicar(m) for m in sequencia])
+    iguais = all(r.equals(ajustar_datas_com_pulmao_legado(df, m)) for r, m in zip(resultados, sequencia))
+    print(f"  {len(sequencia)} trocas de meses: sem preparo {t_avulso * 1000:.1f}ms | AjustePulmao "
+          f"{t_incremental * 1000:.1f}ms | resultados idênticos ao legado: {iguais}")
+
+
+# Roda o script de frontend_gantt/index.html num contexto mínimo e mede, no mesmo
+# motor do navegador (V8), JSON.parse dos objetos x JSON.parse + expandirTasks
+JS_BENCHMARK_FORMATO = r"""
+const fs = require("fs"), vm = require("vm");
+const [html, objetos, colunar] = process.argv.slice(2).map(f => fs.readFileSync(f, "utf8"));
+const alvo = () => ({ addEventListener() {}, removeEventListener() {} });
+const window = Object.assign(alvo(), { parent: { postMessage() {} }, setTimeout, setInterval, clearTimeout, clearInterval });
+// createElement/head.appendChild: o carregador das bibliotecas roda na carga do script e nunca termina aqui
+const document = Object.assign(alvo(), {
+    createElement: () => Object.assign(alvo(), { remove() {} }), head: { appendChild() {} }, body: {},
+    documentElement: { style: { setProperty() {} } },
+});
+vm.runInNewContext(html.match(/<script>([\s\S]*?)<\/script>/)[1], { window, document });
+const expandir = projetos => projetos.map(p => Object.assign({}, p, { tasks: window.GanttMacrofluxo.expandirTasks(p.tasks) }));
+function cronometrar(f) {
+    let melhor = Infinity, saida;
+    for (let i = 0; i < 5; i++) { const t = process.hrtime.bigint(); saida = f(); melhor = Math.min(melhor, Number(process.hrtime.bigint() - t) / 1e6); }
+    return [melhor, saida];
+}
+const [tObjetos, esperado] = cronometrar(() => JSON.parse(objetos));
+const [tColunar, obtido] = cronometrar(() => expandir(JSON.parse(colunar)));
+console.log(JSON.stringify({ objetos: tObjetos, colunar: tColunar, iguais: JSON.stringify(obtido) === JSON.stringify(esperado) }));
+"""
+
+
+def _projetos_com_baselines(n_empreendimentos):
+    """Projetos do Gantt como converter_dados_para_gantt monta: P0 e duas baselines salvas por task"""
+    from gantt_builder import construir_gantt_por_projeto
+
+    projetos = construir_gantt_por_projeto(
+        _agregar_como_gantt_por_projeto(gerar_dados_sinteticos(n_empreendimentos)), agora=datetime(2025, 6, 2, 10, 30))
+    rng = np.random.default_rng(7)
+    for projeto in projetos:
+        for task in projeto["tasks"]:
+            task["baselines"]["P0-(padrão)"] = {"start": task["start_previsto"], "end": task["end_previsto"]}
+            for versao in ("P1-(jan/25)", "P2-(abr/25)"):
+                if task["start_previsto"] is None or rng.random() < 0.1:
+                    task["baselines"][versao] = {"start": None, "end": None}
+                    continue
+                desvio = timedelta(days=int(rng.integers(-20, 40)))
+                inicio = datetime.strptime(task["start_previsto"], "%Y-%m-%d") + desvio
+                fim = datetime.strptime(task["end_previsto"], "%Y-%m-%d") + desvio
+                task["baselines"][versao] = {"start": inicio.strftime("%Y-%m-%d"), "end": fim.strftime("%Y-%m-%d")}
+    return projetos
+
+
+def benchmark_formato(n_empreendimentos):
+    import gzip
+
+    from formato_gantt import compactar_projeto
+
+    projetos = _projetos_com_baselines(n_empreendimentos)
+    print(f"Formato das tasks: {len(projetos)} projetos, {sum(len(p['tasks']) for p in projetos)} tasks")
+
+    objetos = json.dumps(projetos)
+    t_compactar, compactos = _cronometrar(lambda: [compactar_projeto(p) for p in projetos])
+    colunar = json.dumps(compactos)
+    for nome, payload in (("objetos (atual)", objetos), ("colunar", colunar)):
+        dados = payload.encode()
+        print(f"  {nome:16s} {len(dados) / 1e6:6.2f} MB | gzip {len(gzip.compress(dados)) / 1e3:7.1f} KB")
+    print(f"  compactar_projeto no Python: {t_compactar * 1000:.0f}ms")
+
+    if shutil.which("node") is None:
+        print("AVISO: node não encontrado; tempo de parse no navegador não medido.")
+        return
+    html = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend_gantt", "index.html")
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivos = []
+        for nome, conteudo in (("bench.js", JS_BENCHMARK_FORMATO), ("objetos.json", objetos), ("colunar.json", colunar)):
+            arquivos.append(os.path.join(pasta, nome))
+            with open(arquivos[-1], "w", encoding="utf-8") as arquivo:
+                arquivo.write(conteudo)
+        saida = subprocess.run(["node", arquivos[0], html, *arquivos[1:]], capture_output=True, text=True, check=True)
+    resultado = json.loads(saida.stdout)
+    print(f"  navegador (node): JSON.parse dos objetos {resultado['objetos']:.1f}ms | JSON.parse + expandirTasks "
+          f"{resultado['colunar']:.1f}ms | tasks expandidas idênticas: {resultado['iguais']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    p_gantt = sub.add_parser("gantt", help="converter_dados_para_gantt: iterrows x vetorizado")
+    p_gantt.add_argument("--empreendimentos", type=int, default=500)
+
+    p_csv = sub.add_parser("csv", help="get_report_data: arquivo no diretório do app x diretório temporário + pyarrow")
+    p_csv.add_argument("--empreendimentos", type=int, default=300)
+
+    p_macro = sub.add_parser("macrofluxo", help="tratar_macrofluxo: parse dos atributos linha a linha x por cabeçalho")
+    p_macro.add_argument("--planilha", default="GRÁFICO MACROFLUXO.xlsx")
+
+    p_tipos = sub.add_parser("tipos", help="df_data com object x categorias/datetime64/float32")
+    p_tipos.add_argument("--empreendimentos", type=int, default=500)
+
+    p_filtros = sub.add_parser("filtros", help="filter_dataframe com st.cache_data x MotorFiltros")
+    p_filtros.add_argument("--empreendimentos", type=int, default=500)
+
+    p_tabelao = sub.add_parser("tabelao", help="estilos do Tabelão: filtro do df_agregado por célula x vetorizado")
+    p_tabelao.add_argument("--empreendimentos", type=int, default=60)
+
+    p_grade = sub.add_parser("grade", help="Tabelão: Styler com CSS por célula x linhas cruas da grade virtualizada")
+    p_grade.add_argument("--empreendimentos", type=int, default=300)
+
+    p_dias = sub.add_parser("dias_uteis", help="VT por linha com busday_count escalar x coluna inteira com feriados")
+    p_dias.add_argument("--empreendimentos", type=int, default=500)
+
+    p_pulmao = sub.add_parser("pulmao", help="ajustar_datas_com_pulmao: iterrows x DateOffset por coluna")
+    p_pulmao.add_argument("--empreendimentos", type=int, default=100)
+
+    p_formato = sub.add_parser("formato", help="payload do Gantt: lista de objetos x formato colunar (tamanho e parse)")
+    p_formato.add_argument("--empreendimentos", type=int, default=200)
+
+    args = parser.parse_args()
+    if args.benchmark == "gantt":
+        benchmark_gantt(args.empreendimentos)
+    elif args.benchmark == "csv":
+        benchmark_csv(args.empreendimentos)
+    elif args.benchmark == "macrofluxo":
+        benchmark_macrofluxo(args.planilha)
+    elif args.benchmark == "tipos":
+        benchmark_tipos(args.empreendimentos)
+    elif args.benchmark == "filtros":
+        benchmark_filtros(args.empreendimentos)
+    elif args.benchmark == "tabelao":
+        benchmark_tabelao(args.empreendimentos)
+    elif args.benchmark == "grade":
+        benchmark_grade(args.empreendimentos)
+    elif args.benchmark == "dias_uteis":
+        benchmark_dias_uteis(args.empreendimentos)
+    elif args.benchmark == "pulmao":
+        benchmark_pulmao(args.empreendimentos)
+    elif args.benchmark == "formato":
+        benchmark_formato(args.empreendimentos)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,12 @@
-import pandas as pd
 import numpy as np
 
+from dias_uteis import dias_uteis_entre
+
 def calculate_business_days(start_date, end_date):
     """
-    Calcula o número de dias úteis entre duas datas
+    Calcula o número de dias úteis entre duas datas (descontando feriados; ver dias_uteis.py)
     """
-    if pd.isna(start_date) or pd.isna(end_date):
-        return np.nan
-    
     try:
-        # Converter para datetime se necessário
-        start_date = pd.to_datetime(start_date)
-        end_date = pd.to_datetime(end_date)
-        
-        # Calcular dias úteis
-        business_days = np.busday_count(start_date.date(), end_date.date())
-        return business_days
-    except:
+        return dias_uteis_entre(start_date, end_date)
+    except (TypeError, ValueError):
         return np.nan
-
@@ -0,0 +1,84 @@
+"""
+Gantt do Macrofluxo como componente Streamlit declarado.
+
+O HTML/CSS/JavaScript das três visões (por projeto, consolidado por etapa e por
+setor) fica em arquivos estáticos em frontend_gantt/, servidos pelo Streamlit na
+rota do componente. O iframe é criado uma vez por visão (a key fica fixa) e, a
+cada rerun, só os dados viajam como args em JSON; o código vem do cache do
+navegador, identificado pelo hash do conteúdo (?v=...), que muda sozinho quando
+os arquivos mudam.
+
+virtual-select e a fonte Inter vêm de static/vendor/ (servida pelo Streamlit em
+/app/static/, ver .streamlit/config.toml e baixar_assets.py); enquanto os
+arquivos não forem baixados, index.html cai para o jsDelivr na mesma versão.
+"""
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from baixar_assets import assets_faltando
+
+PASTA_FRONTEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend_gantt")
+
+# Id fixo dos elementos do Gantt no markup (cada iframe desenha um único gráfico)
+ID_GANTT = "gantt"
+
+_componente_gantt = components.declare_component("gantt_macrofluxo", path=PASTA_FRONTEND)
+
+if assets_faltando():
+    print(f"AVISO: Arquivos ausentes em static/ ({', '.join(assets_faltando())}); "
+          "o Gantt vai buscá-los no CDN; rode 'python baixar_assets.py' para funcionar sem internet.")
+
+
+@lru_cache(maxsize=None)
+def versao_visao(visao):
+    """Hash curto do CSS + JS da visão, usado para invalidar o cache do navegador"""
+    digest = hashlib.sha1()
+    for extensao in ("css", "js"):
+        with open(os.path.join(PASTA_FRONTEND, f"{visao}.{extensao}"), "rb") as arquivo:
+            digest.update(arquivo.read())
+    return digest.hexdigest()[:12]
+
+
+def _sem_nan(valor):
+    """NaN/infinito -> None em estruturas aninhadas (o JSON dos args não aceita NaN)"""
+    if isinstance(valor, float) and (valor != valor or valor in (float("inf"), float("-inf"))):
+        return None
+    if isinstance(valor, dict):
+        return {chave: _sem_nan(v) for chave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_sem_nan(v) for v in valor]
+    return valor
+
+
+def exibir_gantt(visao, altura, key=None, responder=None, **dados):
+    """
+    Desenha a visão ('projeto', 'consolidado' ou 'setor') com os dados dados
+    (ver os args lidos em frontend_gantt/<visao>.js). `dados` precisa ser
+    serializável em JSON.
+
+    `responder(pedido)` atende os pedidos que o navegador faz com
+    GanttMacrofluxo.pedir (o pedido é o valor atual do componente): o que ela
+    devolver vai em args.resposta, e o navegador entrega ao callback do pedido
+    sem remontar o gráfico. Cada pedido é respondido uma única vez: nos reruns
+    seguintes ele conta como já atendido.
+    """
+    key = key or f"gantt_{visao}"
+    args = dict(dados, visao=visao, altura=altura, versao=versao_visao(visao))
+    pedido = st.session_state.get(key)
+    if responder is not None and isinstance(pedido, dict) and "id" in pedido:
+        # O navegador reenvia o último valor do componente a cada rerun; sem marcar o
+        # pedido como atendido, todo rerun chamaria responder e mandaria a resposta de novo
+        chave_atendido = f"{key}_pedido_atendido"
+        if st.session_state.get(chave_atendido) != pedido["id"]:
+            st.session_state[chave_atendido] = pedido["id"]
+            args["resposta"] = {"id": pedido["id"], "dados": responder(pedido)}
+    try:
+        json.dumps(args, allow_nan=False)
+    except ValueError:
+        args = _sem_nan(args)
+    return _componente_gantt(**args, key=key, default=None)
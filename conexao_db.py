@@ -0,0 +1,299 @@
+"""
+Pool de conexões com o banco (MySQL/RDS) compartilhado por todo o app.
+
+Em vez de abrir uma conexão nova (TLS + autenticação) a cada chamada, as funções
+de banco pegam uma conexão emprestada do pool com `obter_conexao(DB_CONFIG)` e a
+devolvem com `conn.close()`, exatamente como antes. O pool:
+
+- tem tamanho máximo (quem passa do limite espera até `timeout` segundos);
+- testa a conexão antes de emprestar (health check) e descarta as que caíram;
+- tenta reconectar com backoff exponencial e, se o banco continuar fora, fica
+  alguns segundos sem tentar (o app cai no modo mock sem travar cada rerun).
+
+Para testar o caminho com pool sem o RDS, defina a variável de ambiente
+GANTT_SQLITE_PATH com o caminho de um arquivo SQLite: as conexões passam a ser
+SQLite, com o SQL do MySQL usado pelo app traduzido (ver _traduzir_sql).
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+
+try:
+    import mysql.connector
+    from mysql.connector import Error as ErroBanco
+except ImportError:  # permite usar o stand-in SQLite sem o conector instalado
+    mysql = None
+
+    class ErroBanco(Exception):
+        def __init__(self, msg=None, errno=None):
+            super().__init__(msg)
+            self.msg = msg
+            self.errno = errno
+
+try:
+    import streamlit as st
+    _cache_resource = st.cache_resource(show_spinner=False)
+except ImportError:  # scripts de linha de comando: um pool por processo
+    def _cache_resource(func):
+        pools = {}
+        lock = threading.Lock()
+
+        def wrapper(*args):
+            chave = repr(args)
+            with lock:
+                if chave not in pools:
+                    pools[chave] = func(*args)
+                return pools[chave]
+        return wrapper
+
+TAMANHO_POOL = 5
+TENTATIVAS = 3
+ESPERA_INICIAL = 0.5   # segundos; dobra a cada nova tentativa
+TIMEOUT_EMPRESTIMO = 10
+PAUSA_APOS_FALHA = 60  # segundos sem tentar conectar depois de esgotar as tentativas
+
+
+class ConexaoIndisponivel(Exception):
+    """Não foi possível obter uma conexão do pool."""
+
+
+class _ConexaoEmprestada:
+    """Proxy da conexão real: close() devolve ao pool em vez de fechar."""
+
+    def __init__(self, pool, conexao):
+        self._pool = pool
+        self._conexao = conexao
+
+    def close(self):
+        if self._conexao is not None:
+            conexao, self._conexao = self._conexao, None
+            self._pool._devolver(conexao)
+
+    def is_connected(self):
+        return self._conexao is not None and self._pool._saudavel(self._conexao)
+
+    def __getattr__(self, nome):
+        if self._conexao is None:
+            raise ConexaoIndisponivel("Conexão já devolvida ao pool")
+        return getattr(self._conexao, nome)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class PoolConexoes:
+    """Pool limitado de conexões criadas por `fabrica()`."""
+
+    def __init__(self, fabrica, tamanho=TAMANHO_POOL, tentativas=TENTATIVAS,
+                 espera_inicial=ESPERA_INICIAL, timeout=TIMEOUT_EMPRESTIMO,
+                 pausa_apos_falha=PAUSA_APOS_FALHA, descricao="banco"):
+        self._fabrica = fabrica
+        self._tentativas = tentativas
+        self._espera_inicial = espera_inicial
+        self._timeout = timeout
+        self._pausa_apos_falha = pausa_apos_falha
+        self._vagas = threading.BoundedSemaphore(tamanho)
+        self._ociosas = []
+        self._lock = threading.Lock()
+        self._indisponivel_ate = 0.0
+        self.descricao = descricao
+
+    @staticmethod
+    def _saudavel(conexao):
+        try:
+            if hasattr(conexao, 'is_connected'):
+                return conexao.is_connected()
+            conexao.execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _fechar(conexao):
+        try:
+            conexao.close()
+        except Exception:
+            pass
+
+    def _conectar_com_backoff(self):
+        if time.monotonic() < self._indisponivel_ate:
+            raise ConexaoIndisponivel(f"{self.descricao} indisponível (aguardando nova tentativa)")
+        espera = self._espera_inicial
+        ultimo_erro = None
+        for tentativa in range(1, self._tentativas + 1):
+            try:
+                return self._fabrica()
+            except Exception as e:
+                ultimo_erro = e
+                print(f"AVISO: Falha ao conectar em {self.descricao} (tentativa {tentativa}/{self._tentativas}): {e}")
+                if tentativa < self._tentativas:
+                    time.sleep(espera)
+                    espera *= 2
+        self._indisponivel_ate = time.monotonic() + self._pausa_apos_falha
+        raise ConexaoIndisponivel(f"{self.descricao} indisponível: {ultimo_erro}")
+
+    def conexao(self):
+        """Empresta uma conexão saudável; devolva com close()."""
+        if not self._vagas.acquire(timeout=self._timeout):
+            raise ConexaoIndisponivel(f"Pool de {self.descricao} esgotado após {self._timeout}s")
+        try:
+            while True:
+                with self._lock:
+                    conexao = self._ociosas.pop() if self._ociosas else None
+                if conexao is None:
+                    conexao = self._conectar_com_backoff()
+                    break
+                if self._saudavel(conexao):
+                    break
+                self._fechar(conexao)
+            return _ConexaoEmprestada(self, conexao)
+        except Exception:
+            self._vagas.release()
+            raise
+
+    def _devolver(self, conexao):
+        try:
+            # Descarta transações pendentes para o próximo usuário receber a conexão limpa
+            conexao.rollback()
+            with self._lock:
+                self._ociosas.append(conexao)
+        except Exception:
+            self._fechar(conexao)
+        finally:
+            self._vagas.release()
+
+    def fechar(self):
+        with self._lock:
+            ociosas, self._ociosas = self._ociosas, []
+        for conexao in ociosas:
+            self._fechar(conexao)
+
+
+# --- Stand-in SQLite --------------------------------------------------------
+
+# Erros do SQLite com o código equivalente do MySQL (quem trata o erro olha só e.errno)
+_ERRNO_MYSQL = [
+    (re.compile(r'\bindex \S+ already exists', re.I), 1061),  # ER_DUP_KEYNAME
+]
+
+
+def _errno_mysql(erro):
+    return next((errno for padrao, errno in _ERRNO_MYSQL if padrao.search(str(erro))), None)
+
+
+def _traduzir_sql(query):
+    """Traduz o dialeto MySQL usado pelo app para SQLite."""
+    query = query.replace('%s', '?')
+    query = re.sub(r'\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b', 'INTEGER PRIMARY KEY AUTOINCREMENT', query, flags=re.I)
+    query = re.sub(r'\bUNIQUE\s+KEY\s+\w+\s*\(', 'UNIQUE (', query, flags=re.I)
+    query = re.sub(r'\bJSON_UNQUOTE\s*\(', '(', query, flags=re.I)
+    partes = re.split(r'\bON\s+DUPLICATE\s+KEY\s+UPDATE\b', query, flags=re.I)
+    if len(partes) == 2:
+        atualizacao = re.sub(r'\bVALUES\((\w+)\)', r'excluded.\1', partes[1], flags=re.I)
+        query = partes[0] + 'ON CONFLICT DO UPDATE SET' + atualizacao
+    return query
+
+
+class _CursorSQLite:
+    """Cursor com a interface do mysql.connector (dictionary=True, %s)."""
+
+    def __init__(self, cursor, dicionario):
+        self._cursor = cursor
+        self._dicionario = dicionario
+
+    def execute(self, query, params=()):
+        try:
+            self._cursor.execute(_traduzir_sql(query), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise ErroBanco(str(e), errno=_errno_mysql(e)) from e
+
+    def _linha(self, row):
+        if row is None or not self._dicionario:
+            return row
+        return {col[0]: valor for col, valor in zip(self._cursor.description, row)}
+
+    def fetchone(self):
+        return self._linha(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._linha(row) for row in self._cursor.fetchall()]
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+class ConexaoSQLite:
+    """Conexão SQLite com os métodos do mysql.connector usados pelo app."""
+
+    def __init__(self, caminho):
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+
+    def cursor(self, dictionary=False, **kwargs):
+        return _CursorSQLite(self._conexao.cursor(), dictionary)
+
+    def is_connected(self):
+        try:
+            self._conexao.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def commit(self):
+        self._conexao.commit()
+
+    def rollback(self):
+        self._conexao.rollback()
+
+    def close(self):
+        self._conexao.close()
+
+
+# --- Ponto de entrada ------------------------------------------------------
+
+def criar_pool(db_config, tamanho=TAMANHO_POOL):
+    """Cria o pool para o MySQL de `db_config` (ou para o SQLite de GANTT_SQLITE_PATH)."""
+    caminho_sqlite = os.environ.get('GANTT_SQLITE_PATH')
+    if caminho_sqlite:
+        return PoolConexoes(lambda: ConexaoSQLite(caminho_sqlite), tamanho=tamanho,
+                            descricao=f"SQLite {caminho_sqlite}")
+    if mysql is None:
+        raise ConexaoIndisponivel("mysql-connector-python não está instalado")
+    config = dict(db_config)
+    return PoolConexoes(lambda: mysql.connector.connect(**config), tamanho=tamanho,
+                        descricao=f"MySQL {config.get('host')}")
+
+
+@_cache_resource
+def obter_pool(db_config):
+    """Pool único por processo para cada configuração de banco."""
+    return criar_pool(db_config)
+
+
+def obter_conexao(db_config):
+    """Conexão emprestada do pool, ou None se o banco estiver indisponível."""
+    if not db_config:
+        return None
+    try:
+        return obter_pool(db_config).conexao()
+    except Exception as e:
+        print(f"ERRO: Conexão com o banco indisponível: {e}")
+        return None
@@ -0,0 +1,102 @@
+"""
+Dias úteis (VT, VD, durações) calculados para colunas inteiras.
+
+Um único np.busdaycalendar (segunda a sexta, menos os feriados nacionais do
+pacote holidays e, opcionalmente, feriados estaduais/municipais) é montado uma
+vez por processo e reaproveitado em todas as contagens. A convenção é a de
+calculate_business_days: np.busday_count(inicio, fim), ou seja, conta os dias
+úteis em [inicio, fim) e fica negativa quando fim < inicio; `inclusivo=True`
+soma o dia final (antigo calcular_dias_uteis). Datas nulas resultam em NaN.
+
+Feriados locais podem vir por parâmetro ou pelas variáveis de ambiente
+FERIADOS_UF (sigla do estado, ex.: "BA") e FERIADOS_MUNICIPAIS (datas
+"AAAA-MM-DD" separadas por vírgula).
+"""
+import os
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+try:
+    import holidays
+except ImportError:
+    holidays = None
+
+ANOS_FERIADOS = range(2000, 2051)
+DIAS_SEMANA_UTEIS = "1111100"
+
+
+@lru_cache(maxsize=8)
+def _feriados_do_ambiente(uf, municipais):
+    municipais = tuple(d.strip() for d in municipais.split(",") if d.strip())
+    return uf or None, municipais
+
+
+@lru_cache(maxsize=8)
+def calendario_dias_uteis(uf=None, feriados_municipais=()):
+    """np.busdaycalendar com os feriados nacionais (e da UF, se informada) mais as datas extras"""
+    feriados = list(feriados_municipais)
+    if holidays is not None:
+        feriados.extend(holidays.Brazil(years=ANOS_FERIADOS, subdiv=uf).keys())
+    else:
+        print("AVISO: Pacote 'holidays' não encontrado; dias úteis contados sem feriados.")
+    return np.busdaycalendar(weekmask=DIAS_SEMANA_UTEIS, holidays=np.array(feriados, dtype="datetime64[D]"))
+
+
+def calendario_padrao():
+    """Calendário do processo (feriados nacionais + FERIADOS_UF/FERIADOS_MUNICIPAIS)"""
+    uf, municipais = _feriados_do_ambiente(os.environ.get("FERIADOS_UF"), os.environ.get("FERIADOS_MUNICIPAIS", ""))
+    return calendario_dias_uteis(uf, municipais)
+
+
+def _como_dias(valores):
+    """Datas (Series, array, lista ou escalar) -> (array datetime64[D], máscara de válidas)"""
+    # pd.to_datetime custa caro mesmo em colunas que já são datetime64
+    if not pd.api.types.is_datetime64_any_dtype(getattr(valores, "dtype", None)):
+        valores = pd.to_datetime(valores)
+    datas = np.atleast_1d(np.asarray(valores, dtype="datetime64[ns]")).astype("datetime64[D]")
+    return datas, ~np.isnat(datas)
+
+
+def dias_uteis(inicio, fim, inclusivo=False, calendario=None):
+    """
+    Dias úteis entre `inicio` e `fim` (colunas, arrays ou escalares de mesmo
+    tamanho), numa única chamada a np.busday_count. Retorna array float com NaN
+    onde alguma das datas é nula.
+    """
+    dias_inicio, validos_inicio = _como_dias(inicio)
+    dias_fim, validos_fim = _como_dias(fim)
+    validos = validos_inicio & validos_fim
+    resultado = np.full(validos.shape, np.nan)
+    if validos.any():
+        if calendario is None:
+            calendario = calendario_padrao()
+        contagem = np.busday_count(dias_inicio[validos], dias_fim[validos], busdaycal=calendario)
+        if inclusivo:
+            contagem = contagem + 1
+        resultado[validos] = contagem
+    return resultado
+
+
+_EPOCA = date(1970, 1, 1).toordinal()
+
+
+def _dia(valor):
+    """Data escalar -> datetime64[D]; pd.Timestamp fica só para textos e afins"""
+    if isinstance(valor, np.datetime64):
+        return valor.astype("datetime64[D]")
+    if not isinstance(valor, date):  # pd.Timestamp e datetime são date
+        valor = pd.Timestamp(valor)
+    return np.datetime64(valor.toordinal() - _EPOCA, "D")
+
+
+def dias_uteis_entre(inicio, fim, inclusivo=False, calendario=None):
+    """Versão escalar de dias_uteis: int, ou NaN se alguma das datas for nula"""
+    if pd.isna(inicio) or pd.isna(fim):
+        return np.nan
+    if calendario is None:
+        calendario = calendario_padrao()
+    contagem = int(np.busday_count(_dia(inicio), _dia(fim), busdaycal=calendario))
+    return contagem + 1 if inclusivo else contagem
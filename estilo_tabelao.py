@@ -0,0 +1,103 @@
+"""
+Estilos das células do Tabelão Horizontal, calculados de forma vetorizada.
+
+A cor de status (concluída no prazo, concluída com atraso, em andamento com
+término real vencido) é calculada uma vez por (UGB, Empreendimento, Etapa) no
+df_agregado e pivotada como as datas; a matriz de CSS do Styler é montada de uma
+vez sobre a matriz de textos da tabela, sem filtrar o df_agregado por célula.
+"""
+import numpy as np
+import pandas as pd
+
+from config_etapas import nome_completo_para_sigla
+
+# Códigos de status por etapa (também enviados à grade virtualizada, ver grade_tabelao.py)
+STATUS_SEM_COR, STATUS_NO_PRAZO, STATUS_ATRASADA, STATUS_VENCIDA = 0, 1, 2, 3
+
+CORES_STATUS = ("", "#2EAF5B", "#C30202", "#A38408")  # cor do texto por código de status
+
+COR_NO_PRAZO = f"color: {CORES_STATUS[STATUS_NO_PRAZO]}; font-weight: bold;"
+COR_ATRASADA = f"color: {CORES_STATUS[STATUS_ATRASADA]}; font-weight: bold;"
+COR_VENCIDA = f"color: {CORES_STATUS[STATUS_VENCIDA]}; font-weight: bold;"
+CSS_POR_STATUS = np.array(["", COR_NO_PRAZO, COR_ATRASADA, COR_VENCIDA], dtype=object)
+
+COR_VAZIO, COR_VAR_ATRASO, COR_VAR_ADIANTAMENTO = "#999999", "#e74c3c", "#2ecc71"
+FUNDO_LINHA_PAR, FUNDO_LINHA_IMPAR = "#fbfbfb", "#ffffff"
+
+ESTILO_VAZIO = f" color: {COR_VAZIO}; font-style: italic;"
+ESTILO_VAR_ATRASO = f" color: {COR_VAR_ATRASO}; font-weight: 600;"
+ESTILO_VAR_ADIANTAMENTO = f" color: {COR_VAR_ADIANTAMENTO}; font-weight: 600;"
+
+CHAVES = ["UGB", "Empreendimento"]
+
+
+def status_etapas(df_agregado, hoje):
+    """
+    Código de status de cada linha do df_agregado: concluída (100%) antes do
+    previsto, concluída depois do previsto, não concluída com término real
+    anterior a hoje; STATUS_SEM_COR nos demais casos.
+    """
+    if "Percentual_Concluido" in df_agregado.columns:
+        concluida = (df_agregado["Percentual_Concluido"] == 100).to_numpy()
+    else:
+        concluida = np.zeros(len(df_agregado), dtype=bool)
+    termino_real = df_agregado["Termino_Real"]
+    termino_previsto = df_agregado["Termino_Prevista"]
+    # Comparações com NaT são falsas, o que cobre as checagens de data ausente
+    return np.select(
+        [
+            concluida & (termino_real < termino_previsto).to_numpy(),
+            concluida & (termino_real > termino_previsto).to_numpy(),
+            ~concluida & (termino_real < hoje).to_numpy(),
+        ],
+        [STATUS_NO_PRAZO, STATUS_ATRASADA, STATUS_VENCIDA],
+        default=STATUS_SEM_COR,
+    ).astype(np.int8)
+
+
+def status_por_linha(df_agregado, linhas, hoje):
+    """
+    Códigos de status pivotados: uma linha por (UGB, Empreendimento) de `linhas`
+    (na mesma ordem) e uma coluna por sigla de etapa.
+    """
+    status = df_agregado[CHAVES + ["Etapa"]].astype(object).assign(_status=status_etapas(df_agregado, hoje))
+    status = status.drop_duplicates(CHAVES + ["Etapa"])
+    pivot = status.pivot(index=CHAVES, columns="Etapa", values="_status")
+    return pivot.reindex(pd.MultiIndex.from_arrays(linhas, names=CHAVES)).fillna(STATUS_SEM_COR).astype(np.int8)
+
+
+def matriz_estilos(df_formatado, df_agregado, hoje):
+    """
+    Matriz de CSS do Styler para o Tabelão já formatado (colunas MultiIndex
+    (etapa, tipo), mais ('UGB', '') e ('Empreendimento', '')), montada de uma vez
+    sobre a matriz de textos.
+    """
+    textos = df_formatado.to_numpy().astype(str)
+    nomes_etapa = df_formatado.columns.get_level_values(0)
+    tipos = np.asarray(df_formatado.columns.get_level_values(1))
+    extra = np.full(textos.shape, "", dtype=object)
+
+    # Datas reais: cor de status da etapa (a coluna extra de `status` atende etapas sem status)
+    real = np.isin(tipos, ["Início Real", "Término Real"])
+    if real.any():
+        status = status_por_linha(
+            df_agregado, [df_formatado[("UGB", "")].to_numpy(), df_formatado[("Empreendimento", "")].to_numpy()], hoje
+        )
+        posicao = {sigla: i for i, sigla in enumerate(status.columns)}
+        indices = [posicao.get(nome_completo_para_sigla.get(nome), len(posicao)) for nome in nomes_etapa[real]]
+        status = np.hstack([status.to_numpy(), np.full((len(status), 1), STATUS_SEM_COR, dtype=np.int8)])[:, indices]
+        extra[:, real] = np.where(status != STATUS_SEM_COR, " " + CSS_POR_STATUS[status], "")
+
+    # Variação de término: ▲ atraso, ▼ adiantamento
+    variacao = np.char.find(tipos.astype(str), "VarTerm") >= 0
+    if variacao.any():
+        textos_variacao = textos[:, variacao]
+        extra[:, variacao] = np.where(np.char.find(textos_variacao, "▲") >= 0, ESTILO_VAR_ATRASO,
+                                      np.where(np.char.find(textos_variacao, "▼") >= 0, ESTILO_VAR_ADIANTAMENTO, ""))
+
+    # Células sem valor ('-') ficam cinza; UGB e Empreendimento só recebem o fundo
+    extra = np.where((textos == "-") & (tipos != ""), ESTILO_VAZIO, extra)
+    extra[:, tipos == ""] = ""
+    fundo = np.where(np.asarray(df_formatado.index) % 2 == 0, f"background-color: {FUNDO_LINHA_PAR};",
+                     f"background-color: {FUNDO_LINHA_IMPAR};")
+    return pd.DataFrame(fundo.astype(object)[:, None] + extra, index=df_formatado.index, columns=df_formatado.columns)
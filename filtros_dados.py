@@ -0,0 +1,68 @@
+"""
+Filtros da sidebar (UGB, Empreendimento, GRUPO, SETOR) respondidos por índices.
+
+O MotorFiltros é montado uma vez por versão do snapshot de dados (ver
+get_motor_filtros em app.py): para cada valor de cada coluna de filtro guarda as
+posições das linhas que o contêm. Uma combinação de filtros é a união das
+posições dos valores escolhidos em cada coluna, intersectada entre as colunas,
+sem varrer nem hashear o DataFrame a cada rerun. Combinações repetidas (o mesmo
+filtro é aplicado mais de uma vez por rerun) saem de um cache interno.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+COLUNAS_FILTRO = ("UGB", "Empreendimento", "GRUPO", "SETOR")
+
+
+def _chave(valores):
+    """Lista de filtro -> tupla hasheável e independente da ordem (None/vazia = sem filtro)"""
+    return tuple(sorted(set(valores), key=str)) if valores else None
+
+
+class MotorFiltros:
+    """
+    Índices de filtro de um df_data. O frame não deve ser alterado depois de
+    montado o motor: filtrar() devolve sempre uma cópia das linhas.
+    """
+
+    def __init__(self, df, colunas=COLUNAS_FILTRO):
+        self.df = df
+        self._posicoes = {
+            coluna: df.groupby(coluna, observed=True, sort=False).indices
+            for coluna in colunas if coluna in df.columns
+        }
+        self._calcular_posicoes = lru_cache(maxsize=64)(self._calcular_posicoes)
+
+    def _posicoes_da_coluna(self, coluna, valores):
+        indice = self._posicoes.get(coluna, {})
+        partes = [indice[valor] for valor in valores if valor in indice]
+        if not partes:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate(partes))
+
+    def _calcular_posicoes(self, ugb, emp, grupo, setor):
+        # Mesma regra do antigo filter_dataframe: sem UGB não há linhas; demais filtros vazios não restringem
+        if not ugb:
+            return np.empty(0, dtype=np.intp)
+        resultado = self._posicoes_da_coluna("UGB", ugb)
+        for coluna, valores in (("Empreendimento", emp), ("GRUPO", grupo), ("SETOR", setor)):
+            if valores:
+                resultado = np.intersect1d(resultado, self._posicoes_da_coluna(coluna, valores), assume_unique=True)
+        resultado.flags.writeable = False  # compartilhado pelo cache entre sessões
+        return resultado
+
+    def posicoes(self, ugb_filter, emp_filter=None, grupo_filter=None, setor_filter=None):
+        """Posições (iloc), em ordem crescente, das linhas que passam nos filtros"""
+        return self._calcular_posicoes(_chave(ugb_filter), _chave(emp_filter), _chave(grupo_filter), _chave(setor_filter))
+
+    def filtrar(self, ugb_filter, emp_filter=None, grupo_filter=None, setor_filter=None):
+        """Equivalente a filter_dataframe(df, ugb, emp, grupo, setor), na ordem original das linhas"""
+        return self.df.iloc[self.posicoes(ugb_filter, emp_filter, grupo_filter, setor_filter)]
+
+    def valores(self, coluna, posicoes=None):
+        """Valores distintos (ordenados, sem nulos) da coluna, no df inteiro ou nas posições dadas"""
+        if posicoes is None and coluna in self._posicoes:
+            return sorted(self._posicoes[coluna])
+        serie = self.df[coluna] if posicoes is None else self.df[coluna].iloc[posicoes]
+        return sorted(serie.dropna().unique().tolist())
@@ -0,0 +1,186 @@
+"""
+Formato colunar das tasks do Gantt enviado ao navegador.
+
+Cada task é um dict de ~20 campos (ver gantt_builder.py) e a lista inteira
+viajava como JSON de objetos, repetindo as chaves e trazendo textos derivados
+ao lado dos dados (data 'dd/mm/yy' junto da ISO, duração '12,5', VT '+5d') e um
+dict de baselines por task. compactar_tasks troca a lista por colunas:
+
+- datas ISO ('YYYY-MM-DD') -> dias desde 1970-01-01 (inteiros);
+- textos repetidos (grupo, setor, ugb, classe de status, nome da etapa) ->
+  dicionário de valores + códigos;
+- datas 'dd/mm/yy' -> referência à coluna ISO correspondente; VT/VD e durações
+  -> números; o navegador formata com Intl.DateTimeFormat/NumberFormat;
+- baselines {nome: {start, end}} -> duas colunas de datas por baseline (a P0,
+  igual às datas previstas, vira só uma referência) e a lista das tasks que não
+  têm aquela baseline.
+
+frontend_gantt/index.html expande o formato uma única vez, antes de entregar os
+args à visão, que continua recebendo as tasks como objetos. Uma coluna só é
+compactada quando a forma compacta reproduz exatamente os valores originais;
+senão vai como veio ("bruto").
+"""
+import re
+from datetime import date
+
+FORMATO = "tasks_colunares"
+
+_EPOCA = date(1970, 1, 1).toordinal()
+_RE_DATA_ISO = re.compile(r"\d{4}-\d{2}-\d{2}")
+_RE_VARIACAO = re.compile(r"[+-]\d+d")
+
+# Texto 'dd/mm/yy' -> coluna ISO de onde ele é derivado
+DATAS_BR = {
+    "inicio_previsto": "start_previsto",
+    "termino_previsto": "end_previsto",
+    "inicio_real": "start_real",
+    "termino_real": "end_real_original_raw",
+}
+TEXTOS_VARIACAO = ("vt_text", "vd_text")
+TEXTOS_MESES = ("duracao_prev_meses", "duracao_real_meses")
+# Baselines iguais às datas previstas viram referência a estas colunas
+REFERENCIA_BASELINE = {"start": "start_previsto", "end": "end_previsto"}
+
+
+def _dias(valores):
+    """Datas ISO (ou None) -> dias desde a época; None se algum valor não for data ISO"""
+    cache = {}
+    dias = []
+    for valor in valores:
+        if valor is None:
+            dias.append(None)
+            continue
+        if valor not in cache:
+            if not isinstance(valor, str) or not _RE_DATA_ISO.fullmatch(valor):
+                return None
+            try:
+                cache[valor] = date.fromisoformat(valor).toordinal() - _EPOCA
+            except ValueError:
+                return None
+        dias.append(cache[valor])
+    return dias
+
+
+def _data_br(valor_iso):
+    return f"{valor_iso[8:10]}/{valor_iso[5:7]}/{valor_iso[2:4]}" if valor_iso else "N/D"
+
+
+def _variacoes(textos):
+    """'+5d'/'-3d'/'-' -> 5/-3/None; None se algum texto fugir do formato"""
+    numeros = []
+    for texto in textos:
+        if texto == "-":
+            numeros.append(None)
+        elif isinstance(texto, str) and _RE_VARIACAO.fullmatch(texto):
+            numeros.append(int(texto[:-1]))
+        else:
+            return None
+    return numeros
+
+
+def _meses(textos):
+    """'12,5'/'-' -> 12.5/None; None se algum texto não voltar idêntico de f'{v:.1f}'"""
+    numeros = []
+    for texto in textos:
+        if texto == "-":
+            numeros.append(None)
+            continue
+        try:
+            numero = float(texto.replace(",", "."))
+        except (AttributeError, ValueError):
+            return None
+        if f"{numero:.1f}".replace(".", ",") != texto:
+            return None
+        numeros.append(numero)
+    return numeros
+
+
+def _coluna_generica(valores):
+    """Textos repetidos -> dicionário + códigos; o resto vai bruto"""
+    if all(v is None or isinstance(v, str) for v in valores):
+        dicionario = {}
+        codigos = [dicionario.setdefault(v, len(dicionario)) for v in valores]
+        if len(dicionario) < len(valores):
+            return {"t": "dic", "d": list(dicionario), "v": codigos}
+    return {"t": "bruto", "v": list(valores)}
+
+
+def _coluna_datas(valores):
+    dias = _dias(valores)
+    return {"t": "dia", "v": dias} if dias is not None else _coluna_generica(valores)
+
+
+def _coluna_baselines(tasks, colunas_originais):
+    """{nome: {"start": col, "end": col, "ausentes": [i, ...]}} com as baselines de todas as tasks"""
+    nomes = list(dict.fromkeys(nome for task in tasks for nome in task["baselines"]))
+    baselines = {}
+    for nome in nomes:
+        periodos = [task["baselines"].get(nome) for task in tasks]
+        ausentes = [i for i, periodo in enumerate(periodos) if periodo is None]
+        if any(periodo is not None and set(periodo) != {"start", "end"} for periodo in periodos):
+            return None
+        entrada = {}
+        for chave, referencia in REFERENCIA_BASELINE.items():
+            valores = [periodo[chave] if periodo is not None else None for periodo in periodos]
+            originais = colunas_originais.get(referencia)
+            if originais is not None and all(
+                periodo is None or valor == original
+                for periodo, valor, original in zip(periodos, valores, originais)
+            ):
+                entrada[chave] = {"t": "ref", "de": referencia}
+            else:
+                entrada[chave] = _coluna_datas(valores)
+        if ausentes:
+            entrada["ausentes"] = ausentes
+        baselines[nome] = entrada
+    return {"t": "baselines", "b": baselines}
+
+
+def compactar_tasks(tasks):
+    """
+    Lista de tasks -> formato colunar (ver docstring do módulo). Listas vazias ou
+    com tasks de campos diferentes voltam como vieram.
+    """
+    if not tasks or not isinstance(tasks, list) or not all(isinstance(task, dict) for task in tasks):
+        return tasks
+    campos = list(tasks[0])
+    if any(list(task) != campos for task in tasks):
+        return tasks
+
+    originais = {campo: [task[campo] for task in tasks] for campo in campos}
+    colunas = {}
+    for campo, valores in originais.items():
+        coluna = None
+        if campo in DATAS_BR and DATAS_BR[campo] in originais:
+            origem = originais[DATAS_BR[campo]]
+            if all(_data_br(iso) == texto for iso, texto in zip(origem, valores)):
+                coluna = {"t": "data_br", "de": DATAS_BR[campo]}
+        elif campo in TEXTOS_VARIACAO:
+            numeros = _variacoes(valores)
+            coluna = {"t": "variacao", "v": numeros} if numeros is not None else None
+        elif campo in TEXTOS_MESES:
+            numeros = _meses(valores)
+            coluna = {"t": "meses", "v": numeros} if numeros is not None else None
+        elif campo == "baselines" and all(isinstance(v, dict) for v in valores):
+            coluna = _coluna_baselines(tasks, originais)
+        elif all(v is None or isinstance(v, str) for v in valores) and any(v is not None for v in valores):
+            coluna = _coluna_datas(valores)
+        colunas[campo] = coluna or _coluna_generica(valores)
+
+    # data_br e ref só valem se a coluna ISO de origem virou "dia"
+    for campo, coluna in colunas.items():
+        if coluna["t"] == "data_br" and colunas[coluna["de"]]["t"] != "dia":
+            colunas[campo] = _coluna_generica(originais[campo])
+        if coluna["t"] == "baselines":
+            for entrada in coluna["b"].values():
+                for chave in REFERENCIA_BASELINE:
+                    if entrada[chave]["t"] == "ref" and colunas[entrada[chave]["de"]]["t"] != "dia":
+                        colunas[campo] = _coluna_generica(originais[campo])
+    return {"formato": FORMATO, "n": len(tasks), "colunas": colunas}
+
+
+def compactar_projeto(projeto):
+    """Projeto do Gantt ({"id", "name", "tasks", ...}) com as tasks no formato colunar"""
+    if projeto is None:
+        return None
+    return dict(projeto, tasks=compactar_tasks(projeto["tasks"]))
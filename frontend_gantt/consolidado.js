@@ -0,0 +1,1441 @@
+/*
+ * Gantt consolidado por etapa (gerar_gantt_consolidado em app.py).
+ */
+GanttMacrofluxo.registrarVisao("consolidado", {
+    markup: (A, { esc }) => `
+<div class="gantt-container" id="gantt-container-gantt">
+        <div class="gantt-toolbar" id="gantt-toolbar-gantt">
+            <button class="toolbar-btn" id="filter-btn-gantt" title="Filtros">
+            <span>
+                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                    <polygon points="22 3 2 3 10 12.46 10 19 14 21 14 12.46 22 3"></polygon>
+                </svg>
+            </span>
+        </button>
+        <button class="toolbar-btn" id="baseline-btn-gantt" title="Linhas de Base">
+            <span>
+                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                    <rect x="3" y="3" width="18" height="18" rx="2" ry="2"></rect>
+                    <line x1="3" y1="9" x2="21" y2="9"></line>
+                    <line x1="3" y1="15" x2="21" y2="15"></line>
+                </svg>
+            </span>
+        </button>
+        <button class="toolbar-btn" id="fullscreen-btn-gantt" title="Tela Cheia">
+            <span>
+                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                    <path d="M8 3H5a2 2 0 0 0-2 2v3m18 0V5a2 2 0 0 0-2-2h-3m0 18h3a2 2 0 0 0 2-2v-3M3 16v3a2 2 0 0 0 2 2h3"></path>
+                </svg>
+            </span>
+        </button>
+    </div>
+
+    <!-- Seletor de Baseline (NOVO) -->
+    <div class="baseline-selector" id="baseline-selector-gantt" style="
+        display: none;
+        position: absolute;
+        top: 10px;
+        right: 50px;
+        width: 280px;
+        min-height: 200px;
+        background: white;
+        border-radius: 8px;
+        box-shadow: 0 5px 15px rgba(0,0,0,0.3);
+        z-index: 99;
+        padding: 15px;
+        border: 1px solid #e2e8f0;
+    ">
+        <div style="margin-bottom: 12px; font-weight: 700; color: #1a202c; font-size: 14px; border-bottom: 2px solid #1a202c; padding-bottom: 8px;">
+            Selecione Linhas de Base
+        </div>
+
+        <!-- Checkboxes de Aplicação Rápida -->
+        <div style="margin-bottom: 15px; padding: 10px; background: #f7fafc; border-radius: 6px; border: 1px solid #e2e8f0;">
+            <div style="font-weight: 600; color: #2d3748; font-size: 12px; margin-bottom: 10px;">
+                Aplicação Rápida
+            </div>
+            <div style="display: flex; flex-direction: column; gap: 6px;">
+                <label style="display: flex; align-items: center; cursor: pointer;">
+                    <input type="checkbox" id="apply-p0-all-gantt" 
+                           onchange="handleQuickApply('p0')" 
+                           style="margin-right: 6px; cursor: pointer;">
+                    <span style="font-size: 11px; color: #4a5568;">Aplicar P0 para todos</span>
+                </label>
+                <label style="display: flex; align-items: center; cursor: pointer;">
+                    <input type="checkbox" id="apply-latest-all-gantt" 
+                           onchange="handleQuickApply('latest')" 
+                           style="margin-right: 6px; cursor: pointer;">
+                    <span style="font-size: 11px; color: #4a5568;">Aplicar última baseline para todos</span>
+                </label>
+            </div>
+        </div>
+
+        <div class="baseline-selector-table" style="
+            max-height: 400px;
+            overflow-y: auto;
+            margin-top: 10px;
+        ">
+            ${A.linhas_baseline_html}
+        </div>
+        <div class="baseline-resize-corner" title="Arrastar para redimensionar"></div>
+    </div>
+
+    <style>
+        .baseline-row {
+            display: grid;
+            grid-template-columns: 1.2fr 1fr;
+            gap: 10px;
+            padding: 8px 6px;
+            border-bottom: 1px solid #e2e8f0;
+            align-items: center;
+            transition: background-color 0.15s ease;
+        }
+
+        .baseline-row:hover {
+            background-color: #f7fafc;
+        }
+
+        .baseline-row:last-child {
+            border-bottom: none;
+        }
+
+        .baseline-row label {
+            font-size: 11px;
+            font-weight: 500;
+            color: #2d3748;
+            display: flex;
+            align-items: center;
+            padding-left: 5px;
+            overflow: hidden;
+            text-overflow: ellipsis;
+            white-space: nowrap;
+        }
+
+        .baseline-resize-corner {
+            position: absolute;
+            bottom: 0;
+            left: 0;
+            width: 16px;
+            height: 16px;
+            cursor: nwse-resize;
+            z-index: 100;
+        }
+
+        .baseline-resize-corner::before {
+            content: '';
+            position: absolute;
+            bottom: -2px;
+            left: -2px;
+            width: 0;
+            height: 0;
+            border-style: solid;
+            border-width: 0 0 18px 18px;
+            border-color: transparent;
+            transform: rotate(-45deg);
+            transform-origin: bottom left;
+        }
+
+        .baseline-resize-corner:hover::before {
+            border-color: transparent;
+        }
+
+        .baseline-resize-corner::after {
+            content: '';
+            position: absolute;
+            bottom: 2px;
+            left: 2px;
+            width: 10px;
+            height: 10px;
+            transform: rotate(-45deg);
+            transform-origin: center;
+            background: 
+                linear-gradient(90deg, transparent 48%, #9ca3af 48%, #9ca3af 52%, transparent 52%),
+                linear-gradient(90deg, transparent 56%, #9ca3af 56%, #9ca3af 60%, transparent 60%),
+                linear-gradient(90deg, transparent 64%, #9ca3af 64%, #9ca3af 68%, transparent 68%);
+        }
+
+        .baseline-row select.baseline-dropdown-emp {
+            width: 100%;
+            padding: 5px 8px;
+            border: 1px solid #cbd5e0;
+            border-radius: 5px;
+            font-size: 11px;
+            background-color: white;
+            transition: all 0.2s ease;
+            cursor: pointer;
+        }
+
+        .baseline-row select.baseline-dropdown-emp:hover {
+            border-color: #4299e1;
+            box-shadow: 0 0 0 1px rgba(66, 153, 225, 0.1);
+        }
+
+        .baseline-row select.baseline-dropdown-emp:focus {
+            outline: none;
+            border-color: #4299e1;
+            box-shadow: 0 0 0 3px rgba(66, 153, 225, 0.1);
+        }
+    </style>
+
+    <div class="floating-filter-menu" id="filter-menu-gantt">
+
+        <div class="filter-group">
+            <label for="filter-etapa-consolidada-gantt">Etapa (Visão Atual)</label>
+            <select id="filter-etapa-consolidada-gantt">
+                </select>
+        </div>
+
+        <div class="filter-group">
+            <label for="filter-ugb-consolidado-gantt">UGB</label>
+            <div id="filter-ugb-consolidado-gantt"></div>
+        </div>
+
+        <div class="filter-group">
+            <label for="filter-empreendimento-gantt">Empreendimento</label>
+            <div id="filter-empreendimento-gantt"></div>
+        </div>
+
+        <div class="filter-group">
+            <div class="filter-group-checkbox">
+                <input type="checkbox" id="filter-concluidas-gantt">
+                <label for="filter-concluidas-gantt">Mostrar apenas não concluídas</label>
+            </div>
+        </div>
+
+        <div class="filter-group">
+            <label>Visualização</label>
+            <div class="filter-group-radio">
+                <input type="radio" id="filter-vis-ambos-gantt" name="filter-vis-gantt" value="Ambos" checked>
+                <label for="filter-vis-ambos-gantt">Ambos</label>
+            </div>
+            <div class="filter-group-radio">
+                <input type="radio" id="filter-vis-previsto-gantt" name="filter-vis-gantt" value="Previsto">
+                <label for="filter-vis-previsto-gantt">Previsto</label>
+            </div>
+            <div class="filter-group-radio">
+                <input type="radio" id="filter-vis-real-gantt" name="filter-vis-gantt" value="Real">
+                <label for="filter-vis-real-gantt">Real</label>
+            </div>
+        </div>
+
+        <div class="filter-group">
+            <label>Simulação Pulmão</label>
+            <div class="filter-group-radio">
+                <input type="radio" id="filter-pulmao-sem-gantt" name="filter-pulmao-gantt" value="Sem Pulmão">
+                <label for="filter-pulmao-sem-gantt">Sem Pulmão</label>
+            </div>
+            <div class="filter-group-radio">
+                <input type="radio" id="filter-pulmao-com-gantt" name="filter-pulmao-gantt" value="Com Pulmão">
+                <label for="filter-pulmao-com-gantt">Com Pulmão</label>
+            </div>
+            <div class="filter-group" id="pulmao-meses-group-gantt" style="margin-top: 8px; display: none; padding-left: 25px;">
+                <label for="filter-pulmao-meses-gantt" style="font-size: 12px; font-weight: 500;">Meses de Pulmão:</label>
+                <input type="number" id="filter-pulmao-meses-gantt" value="${A.pulmao_meses}" min="0" max="36" step="1" style="padding: 4px 6px; font-size: 12px; height: 28px; width: 80px;">
+            </div>
+        </div>
+        <button class="filter-apply-btn" id="filter-apply-btn-gantt">Aplicar Filtros</button>
+    </div>
+
+    <div class="gantt-main">
+        <div class="gantt-sidebar-wrapper" id="gantt-sidebar-wrapper-gantt">
+            <div class="gantt-sidebar-header">
+                <div class="project-title-row">
+                    <span>${esc(A.titulo)}</span>
+                    <button class="toggle-sidebar-btn" id="toggle-sidebar-btn-gantt" title="Recolher/Expandir Tabela">«</button>
+                </div>
+                <div class="sidebar-grid-header-wrapper">
+                    <div style="width: 0px;"></div>
+                    <div class="sidebar-grid-header">
+                        <div class="header-cell task-name-cell">EMPREENDIMENTO</div>
+                        <div class="header-cell">UGB</div>
+                        <div class="header-cell">INÍCIO-P</div>
+                        <div class="header-cell">TÉRMINO-P</div>
+                        <div class="header-cell">DUR-P</div>
+                        <div class="header-cell">INÍCIO-R</div>
+                        <div class="header-cell">TÉRMINO-R</div>
+                        <div class="header-cell">DUR-R</div>
+                        <div class="header-cell">%</div>
+                        <div class="header-cell">VT</div>
+                        <div class="header-cell">VD</div>
+                    </div>
+                </div>
+            </div>
+            <div class="gantt-sidebar-content" id="gantt-sidebar-content-gantt"></div>
+        </div>
+        <div class="gantt-chart-content" id="gantt-chart-content-gantt">
+            <div class="chart-container" id="chart-container-gantt">
+                <div class="chart-header">
+                    <div class="year-header" id="year-header-gantt"></div>
+                    <div class="month-header" id="month-header-gantt"></div>
+                </div>
+                <div class="chart-body" id="chart-body-gantt"></div>
+                <div class="today-line" id="today-line-gantt"></div>
+                <div class="meta-line" id="meta-line-gantt" style="display: none;"></div>
+                <div class="meta-line-label" id="meta-line-label-gantt" style="display: none;"></div>
+            </div>
+        </div>
+    </div>
+    <div class="tooltip" id="tooltip-gantt"></div>
+</div>
+`,
+
+    iniciar: function (A) {
+        // Funções usadas pelos handlers inline do markup
+        window.handleQuickApply = handleQuickApply;
+        window.applyBaselineForEmp = applyBaselineForEmp;
+
+        // DEBUG: Verificar dados
+        console.log('Inicializando Gantt Consolidado para:', A.titulo);
+
+        const coresPorSetor = A.cores_por_setor;
+
+        // --- NOVAS VARIÁVEIS DE DADOS ---
+        // 'projectData' armazena o estado ATUAL (inicia com a etapa selecionada)
+        // 'allDataByStage' armazena TUDO, chaveado por nome de etapa
+        const allDataByStage = A.dados_por_etapa;
+        const projectData = [Object.assign({}, A.projeto, { tasks: JSON.parse(JSON.stringify(allDataByStage[A.etapa_inicial] || [])) })];
+
+        // 'allTasks_baseData' agora armazena os dados "crus" da etapa ATUAL
+        let allTasks_baseData = JSON.parse(JSON.stringify(allDataByStage[A.etapa_inicial] || []));
+
+        // Linhas da sidebar e do gráfico: roladas juntas, montadas só na janela visível
+        const rolagem = GanttMacrofluxo.rolagemVirtual([
+            document.getElementById('gantt-sidebar-content-gantt'),
+            document.getElementById('gantt-chart-content-gantt'),
+        ], { alturaLinha: 30 });
+
+        const initialStageName = A.etapa_inicial;
+        let currentStageName = initialStageName;
+        // --- FIM NOVAS VARIÁVEIS ---
+
+        const dataMinStr = A.data_min; // Range global
+        const dataMaxStr = A.data_max; // Range global
+        let tipoVisualizacao = A.tipo_visualizacao;
+        const PIXELS_PER_MONTH = 30;
+
+        // --- Helpers de Data ---
+        const formatDateDisplay = (dateStr) => {
+            if (!dateStr) return "N/D";
+            const d = parseDate(dateStr);
+            if (!d || isNaN(d.getTime())) return "N/D";
+            const day = String(d.getUTCDate()).padStart(2, '0');
+            const month = String(d.getUTCMonth() + 1).padStart(2, '0');
+            const year = String(d.getUTCFullYear()).slice(-2);
+            return `${day}/${month}/${year}`;
+        };
+
+        function addMonths(dateStr, months) {
+            if (!dateStr) return null;
+            const date = parseDate(dateStr);
+            if (!date || isNaN(date.getTime())) return null;
+            const originalDay = date.getUTCDate();
+            date.setUTCMonth(date.getUTCMonth() + months);
+            if (date.getUTCDate() !== originalDay) {
+                date.setUTCDate(0);
+            }
+            return date.toISOString().split('T')[0];
+        }
+
+        function parseDate(dateStr) { 
+            if (!dateStr) return null; 
+            const [year, month, day] = dateStr.split('-').map(Number); 
+            return new Date(Date.UTC(year, month - 1, day)); 
+        }
+
+        // --- Dados de Filtro e Tasks ---
+        const filterOptions = A.filter_options;
+        // 'allTasks_baseData' (definido acima) é a base da etapa inicial
+
+        const initialPulmaoStatus = A.pulmao_status;
+        const initialPulmaoMeses = A.pulmao_meses;
+
+        let pulmaoStatus = A.pulmao_status;
+        let filtersPopulated = false;
+
+        // *** Variáveis Globais para Filtros ***
+        // let vsSetor, vsGrupo; // REMOVIDO
+        let vsUgbConsolidado; // NOVO: Filtro de UGB
+        let vsEmpreendimento; 
+        let selEtapaConsolidada; // Novo <select>
+
+        // *** CONSTANTES DE ETAPA ***
+        const etapas_pulmao = ["PULMÃO VENDA", "PULMÃO INFRA", "PULMÃO RADIER"];
+        const etapas_sem_alteracao = ["PROSPECÇÃO", "RADIER", "DEMANDA MÍNIMA", "PE. ÁREAS COMUNS (URB)", "PE. ÁREAS COMUNS (ENG)", "ORÇ. ÁREAS COMUNS", "SUP. ÁREAS COMUNS", "EXECUÇÃO ÁREAS COMUNS"];
+
+        // --- Lógica de Pulmão para Consolidado ---
+        // *** aplicarLogicaPulmaoConsolidado ***
+        function aplicarLogicaPulmaoConsolidado(tasks, offsetMeses, stageName) {
+            console.log(`Aplicando pulmão de ${offsetMeses}m para etapa: ${stageName}`);
+
+            // Verifica o *tipo* de etapa que estamos processando
+            if (etapas_sem_alteracao.includes(stageName)) {
+                console.log("Etapa sem alteração, retornando tasks originais.");
+                return tasks; // Não altera datas
+
+            } else if (etapas_pulmao.includes(stageName)) {
+                console.log("Etapa Pulmão: movendo apenas início PREVISTO.");
+                // Para etapas de pulmão, move apenas o Início PREVISTO
+                tasks.forEach(task => {
+                    task.start_previsto = addMonths(task.start_previsto, offsetMeses);
+                    // DATAS REAIS PERMANECEM INALTERADAS
+                    task.inicio_previsto = formatDateDisplay(task.start_previsto);
+                    // Não mexe no 'end_date' real
+                });
+
+            } else {
+                console.log("Etapa Padrão: movendo apenas PREVISTO.");
+                // Para todas as outras etapas, move apenas Início e Fim PREVISTOS
+                tasks.forEach(task => {
+                    task.start_previsto = addMonths(task.start_previsto, offsetMeses);
+                    task.end_previsto = addMonths(task.end_previsto, offsetMeses);
+                    // DATAS REAIS PERMANECEM INALTERADAS
+
+                    task.inicio_previsto = formatDateDisplay(task.start_previsto);
+                    task.termino_previsto = formatDateDisplay(task.end_previsto);
+                    // Datas reais mantêm seus valores originais
+                });
+            }
+            return tasks;
+        }
+
+        // *** FUNÇÃO CORRIGIDA: applyInitialPulmaoState ***
+        function applyInitialPulmaoState() {
+            if (initialPulmaoStatus === 'Com Pulmão' && initialPulmaoMeses > 0) {
+                const offsetMeses = -initialPulmaoMeses;
+                let baseTasks = JSON.parse(JSON.stringify(allTasks_baseData));
+
+                // Passa o nome da etapa inicial - APENAS DATAS PREVISTAS SERÃO MODIFICADAS
+                const tasksProcessadas = aplicarLogicaPulmaoConsolidado(baseTasks, offsetMeses, initialStageName);
+
+                projectData[0].tasks = tasksProcessadas;
+                // Atualiza também o 'allTasks_baseData' que é a fonte "crua" da etapa atual
+                allTasks_baseData = JSON.parse(JSON.stringify(tasksProcessadas));
+            }
+        }
+
+
+        function initGantt() {
+            console.log('Iniciando Gantt Consolidado com dados:', projectData);
+
+            if (!projectData || !projectData[0] || !projectData[0].tasks || projectData[0].tasks.length === 0) {
+                console.warn('Nenhum dado disponível para renderizar na etapa inicial');
+            }
+
+            // NOTA: applyInitialPulmaoState foi movida para DENTRO de initGantt
+            applyInitialPulmaoState(); 
+
+            // Inicializar estado de baselines por empreendimento
+            initializeBaselineState();
+
+            renderSidebar();
+            renderHeader();
+            renderChart();
+            renderMonthDividers();
+            setupEventListeners();
+            positionTodayLine();
+            populateFilters();
+        }
+
+        // *** FUNÇÃO CORRIGIDA: renderSidebar para ordenação ***
+        function renderSidebar() {
+            const sidebarContent = document.getElementById('gantt-sidebar-content-gantt');
+            let tasks = projectData[0].tasks;
+
+            if (!tasks || tasks.length === 0) {
+                rolagem.camada('sidebar', sidebarContent, 0);
+                sidebarContent.innerHTML = '<div style="padding: 20px; text-align: center; color: #666;">Nenhum empreendimento disponível</div>';
+                return;
+            }
+
+            // Ordenação dinâmica
+            const dateSortFallback = new Date(8640000000000000);
+
+            if (tipoVisualizacao === 'Real') {
+                tasks.sort((a, b) => {
+                    const dateA = a.start_real ? parseDate(a.start_real) : dateSortFallback;
+                    const dateB = b.start_real ? parseDate(b.start_real) : dateSortFallback;
+                    if (dateA > dateB) return 1;
+                    if (dateA < dateB) return -1;
+                    return a.name.localeCompare(b.name);
+                });
+            } else {
+                tasks.sort((a, b) => {
+                    const dateA = a.start_previsto ? parseDate(a.start_previsto) : dateSortFallback;
+                    const dateB = b.start_previsto ? parseDate(b.start_previsto) : dateSortFallback;
+                    if (dateA > dateB) return 1;
+                    if (dateA < dateB) return -1;
+                    return a.name.localeCompare(b.name);
+                });
+            }
+
+            tasks.forEach((task, i) => { task.numero_etapa = i + 1; });
+
+            // Só as linhas visíveis são montadas (ver rolagemVirtual em index.html)
+            let rowsContainer = sidebarContent.querySelector('.sidebar-rows-container');
+            if (!rowsContainer) {
+                sidebarContent.innerHTML = '<div class="sidebar-rows-container"></div>';
+                rowsContainer = sidebarContent.firstChild;
+            }
+            rolagem.camada('sidebar', rowsContainer, tasks.length, i => criarLinhaSidebar(tasks[i], i, tasks.length));
+        }
+
+        function criarLinhaSidebar(task, indice, total) {
+            const rowClass = (indice % 2 === 0 ? ' odd-row' : '') + (indice === total - 1 ? ' ultima-linha' : '');
+            const modelo = document.createElement('template');
+            modelo.innerHTML = '<div class="sidebar-row' + rowClass + '">' +
+                    '<div class="sidebar-cell task-name-cell" title="' + task.numero_etapa + '. ' + task.name + '">' + task.numero_etapa + '. ' + task.name + '</div>' +
+                    '<div class="sidebar-cell">' + (task.ugb || 'N/D') + '</div>' +
+                    '<div class="sidebar-cell">' + task.inicio_previsto + '</div>' +
+                    '<div class="sidebar-cell">' + task.termino_previsto + '</div>' +
+                    '<div class="sidebar-cell">' + task.duracao_prev_meses + '</div>' +
+                    '<div class="sidebar-cell">' + task.inicio_real + '</div>' +
+                    '<div class="sidebar-cell">' + task.termino_real + '</div>' +
+                    '<div class="sidebar-cell">' + task.duracao_real_meses + '</div>' +
+                    '<div class="sidebar-cell ' + task.status_color_class + '">' + task.progress + '%</div>' +
+                    '<div class="sidebar-cell ' + task.status_color_class + '">' + task.vt_text + '</div>' +
+                    '<div class="sidebar-cell ' + task.status_color_class + '">' + task.vd_text + '</div>' +
+                    '</div>';
+            return modelo.content.firstChild;
+        }
+
+        // *** FUNÇÃO CORRIGIDA: renderHeader ***
+        function renderHeader() {
+            const yearHeader = document.getElementById('year-header-gantt');
+            const monthHeader = document.getElementById('month-header-gantt');
+            let yearHtml = '', monthHtml = '';
+            const yearsData = [];
+            let currentDate = parseDate(dataMinStr);
+            const dataMax = parseDate(dataMaxStr);
+
+            if (!currentDate || !dataMax || isNaN(currentDate.getTime()) || isNaN(dataMax.getTime())) {
+                 yearHeader.innerHTML = "Datas inválidas";
+                 monthHeader.innerHTML = "";
+                 return;
+            }
+
+            // DECLARE estas variáveis
+            let currentYear = -1, monthsInCurrentYear = 0;
+
+            let totalMonths = 0;
+            while (currentDate <= dataMax && totalMonths < 240) {
+                const year = currentDate.getUTCFullYear();
+                if (year !== currentYear) {
+                    if (currentYear !== -1) yearsData.push({ year: currentYear, count: monthsInCurrentYear });
+                    currentYear = year; 
+                    monthsInCurrentYear = 0;
+                }
+                const monthNumber = String(currentDate.getUTCMonth() + 1).padStart(2, '0');
+                monthHtml += '<div class="month-cell">' + monthNumber + '</div>';
+                monthsInCurrentYear++;
+                currentDate.setUTCMonth(currentDate.getUTCMonth() + 1);
+                totalMonths++;
+            }
+            if (currentYear !== -1) yearsData.push({ year: currentYear, count: monthsInCurrentYear });
+            yearsData.forEach(data => { 
+                const yearWidth = data.count * PIXELS_PER_MONTH; 
+                yearHtml += '<div class="year-section" style="width:' + yearWidth + 'px">' + data.year + '</div>'; 
+            });
+
+            const chartContainer = document.getElementById('chart-container-gantt');
+            if (chartContainer) {
+                chartContainer.style.minWidth = totalMonths * PIXELS_PER_MONTH + 'px';
+            }
+
+            yearHeader.innerHTML = yearHtml;
+            monthHeader.innerHTML = monthHtml;
+        }
+
+        function renderChart() {
+            const chartBody = document.getElementById('chart-body-gantt');
+            const tasks = projectData[0].tasks;
+
+            if (!tasks || tasks.length === 0) {
+                rolagem.camada('grafico', chartBody, 0);
+                chartBody.innerHTML = '<div style="padding: 20px; text-align: center; color: #666;">Nenhum empreendimento disponível</div>';
+                return;
+            }
+
+            rolagem.camada('grafico', chartBody, tasks.length, i => criarLinhaGrafico(tasks[i]));
+        }
+
+        function criarLinhaGrafico(task) {
+            const row = document.createElement('div'); 
+            row.className = 'gantt-row';
+            let barPrevisto = null;
+            if (tipoVisualizacao === 'Ambos' || tipoVisualizacao === 'Previsto') { 
+                barPrevisto = createBar(task, 'previsto'); 
+                row.appendChild(barPrevisto); 
+            }
+            let barReal = null;
+            if ((tipoVisualizacao === 'Ambos' || tipoVisualizacao === 'Real') && task.start_real && (task.end_real_original_raw || task.end_real)) { 
+                barReal = createBar(task, 'real'); 
+                row.appendChild(barReal); 
+            }
+            if (barPrevisto && barReal) {
+                const s_prev = parseDate(task.start_previsto), e_prev = parseDate(task.end_previsto), s_real = parseDate(task.start_real), e_real = parseDate(task.end_real_original_raw || task.end_real);
+                if (s_prev && e_prev && s_real && e_real && s_real <= s_prev && e_real >= e_prev) { 
+                    barPrevisto.style.zIndex = '8'; 
+                    barReal.style.zIndex = '7'; 
+                }
+                renderOverlapBar(task, row);
+            }
+            return row;
+        }
+
+        function createBar(task, tipo) {
+            const startDate = parseDate(tipo === 'previsto' ? task.start_previsto : task.start_real);
+            const endDate = parseDate(tipo === 'previsto' ? task.end_previsto : (task.end_real_original_raw || task.end_real));
+            if (!startDate || !endDate) return document.createElement('div');
+            const left = getPosition(startDate);
+            const width = getPosition(endDate) - left + (PIXELS_PER_MONTH / 30);
+            const bar = document.createElement('div'); 
+            bar.className = 'gantt-bar ' + tipo;
+            const coresSetor = coresPorSetor[task.setor] || coresPorSetor['Não especificado'] || {previsto: '#cccccc', real: '#888888'};
+            bar.style.backgroundColor = tipo === 'previsto' ? coresSetor.previsto : coresSetor.real;
+            bar.style.left = left + 'px'; 
+            bar.style.width = width + 'px';
+            const barLabel = document.createElement('span'); 
+            barLabel.className = 'bar-label'; 
+            barLabel.textContent = task.name + ' (' + task.progress + '%)'; 
+            bar.appendChild(barLabel);
+            bar.addEventListener('mousemove', e => showTooltip(e, task, tipo));
+            bar.addEventListener('mouseout', () => hideTooltip());
+            return bar;
+        }
+
+        function renderOverlapBar(task, row) {
+           if (!task.start_real || !(task.end_real_original_raw || task.end_real)) return;
+            const s_prev = parseDate(task.start_previsto), e_prev = parseDate(task.end_previsto), s_real = parseDate(task.start_real), e_real = parseDate(task.end_real_original_raw || task.end_real);
+            const overlap_start = new Date(Math.max(s_prev, s_real)), overlap_end = new Date(Math.min(e_prev, e_real));
+            if (overlap_start < overlap_end) {
+                const left = getPosition(overlap_start), width = getPosition(overlap_end) - left + (PIXELS_PER_MONTH / 30);
+                if (width > 0) { 
+                    const overlapBar = document.createElement('div'); 
+                    overlapBar.className = 'gantt-bar-overlap'; 
+                    overlapBar.style.left = left + 'px'; 
+                    overlapBar.style.width = width + 'px'; 
+                    row.appendChild(overlapBar); 
+                }
+            }
+        }
+
+        function getPosition(date) {
+            if (!date) return 0;
+            const chartStart = parseDate(dataMinStr);
+            if (!chartStart || isNaN(chartStart.getTime())) return 0;
+            const monthsOffset = (date.getUTCFullYear() - chartStart.getUTCFullYear()) * 12 + (date.getUTCMonth() - chartStart.getUTCMonth());
+            const dayOfMonth = date.getUTCDate() - 1;
+            const daysInMonth = new Date(date.getUTCFullYear(), date.getUTCMonth() + 1, 0).getUTCDate();
+            const fractionOfMonth = daysInMonth > 0 ? dayOfMonth / daysInMonth : 0;
+            return (monthsOffset + fractionOfMonth) * PIXELS_PER_MONTH;
+        }
+
+        function positionTodayLine() {
+            const todayLine = document.getElementById('today-line-gantt');
+            const today = new Date(), todayUTC = new Date(Date.UTC(today.getFullYear(), today.getMonth(), today.getDate()));
+            const chartStart = parseDate(dataMinStr), chartEnd = parseDate(dataMaxStr);
+            if (chartStart && chartEnd && !isNaN(chartStart.getTime()) && !isNaN(chartEnd.getTime()) && todayUTC >= chartStart && todayUTC <= chartEnd) { 
+                const offset = getPosition(todayUTC); 
+                todayLine.style.left = offset + 'px'; 
+                todayLine.style.display = 'block'; 
+            } else { 
+                todayLine.style.display = 'none'; 
+            }
+        }
+
+        function showTooltip(e, task, tipo) {
+            const tooltip = document.getElementById('tooltip-gantt');
+            let content = '<b>' + task.name + '</b><br>';
+            if (tipo === 'previsto') { 
+                content += 'Previsto: ' + task.inicio_previsto + ' - ' + task.termino_previsto + '<br>Duração: ' + task.duracao_prev_meses + 'M'; 
+            } else { 
+                content += 'Real: ' + task.inicio_real + ' - ' + task.termino_real + '<br>Duração: ' + task.duracao_real_meses + 'M<br>Variação Término: ' + task.vt_text + '<br>Variação Duração: ' + task.vd_text; 
+            }
+            content += '<br><b>Progresso: ' + task.progress + '%</b><br>Setor: ' + task.setor + '<br>Grupo: ' + task.grupo;
+            tooltip.innerHTML = content;
+            tooltip.classList.add('show');
+            const tooltipWidth = tooltip.offsetWidth, tooltipHeight = tooltip.offsetHeight;
+            const viewportWidth = window.innerWidth, viewportHeight = window.innerHeight;
+            const mouseX = e.clientX, mouseY = e.clientY;
+            const padding = 15;
+            let left, top;
+            if ((mouseX + padding + tooltipWidth) > viewportWidth) { 
+                left = mouseX - padding - tooltipWidth; 
+            } else { 
+                left = mouseX + padding; 
+            }
+            if ((mouseY + padding + tooltipHeight) > viewportHeight) { 
+                top = mouseY - padding - tooltipHeight; 
+            } else { 
+                top = mouseY + padding; 
+            }
+            if (left < padding) left = padding;
+            if (top < padding) top = padding;
+            tooltip.style.left = left + 'px';
+            tooltip.style.top = top + 'px';
+        }
+
+        function hideTooltip() { 
+            document.getElementById('tooltip-gantt').classList.remove('show'); 
+        }
+
+        function renderMonthDividers() {
+            const chartContainer = document.getElementById('chart-container-gantt');
+            chartContainer.querySelectorAll('.month-divider, .month-divider-label').forEach(el => el.remove());
+            let currentDate = parseDate(dataMinStr);
+            const dataMax = parseDate(dataMaxStr);
+             if (!currentDate || !dataMax || isNaN(currentDate.getTime()) || isNaN(dataMax.getTime())) return;
+            let totalMonths = 0;
+            while (currentDate <= dataMax && totalMonths < 240) {
+                const left = getPosition(currentDate);
+                const divider = document.createElement('div'); 
+                divider.className = 'month-divider';
+                if (currentDate.getUTCMonth() === 0) divider.classList.add('first');
+                divider.style.left = left + 'px'; 
+                chartContainer.appendChild(divider);
+                currentDate.setUTCMonth(currentDate.getUTCMonth() + 1);
+                totalMonths++;
+            }
+        }
+
+        function setupEventListeners() {
+            const ganttChartContent = document.getElementById('gantt-chart-content-gantt'), sidebarContent = document.getElementById('gantt-sidebar-content-gantt');
+            const fullscreenBtn = document.getElementById('fullscreen-btn-gantt'), toggleBtn = document.getElementById('toggle-sidebar-btn-gantt');
+            const filterBtn = document.getElementById('filter-btn-gantt');
+            const filterMenu = document.getElementById('filter-menu-gantt');
+            const container = document.getElementById('gantt-container-gantt');
+
+            const applyBtn = document.getElementById('filter-apply-btn-gantt');
+            if (applyBtn) applyBtn.addEventListener('click', () => applyFiltersAndRedraw());
+
+            if (fullscreenBtn) fullscreenBtn.addEventListener('click', () => toggleFullscreen());
+
+            // Adiciona listener para o botão de filtro
+            if (filterBtn) {
+                filterBtn.addEventListener('click', () => {
+                    filterMenu.classList.toggle('is-open');
+                });
+            }
+
+            // Fecha o menu de filtro ao clicar fora
+            document.addEventListener('click', (event) => { 
+                if (filterMenu && filterBtn && !filterMenu.contains(event.target) && !filterBtn.contains(event.target)) {
+                    filterMenu.classList.remove('is-open');
+                }
+            });
+
+            if (container) container.addEventListener('fullscreenchange', () => handleFullscreenChange());
+
+            if (toggleBtn) toggleBtn.addEventListener('click', () => toggleSidebar());
+            if (ganttChartContent && sidebarContent) {
+                // A sincronização vertical com a sidebar fica na rolagem virtual
+                let isDown = false, startX, scrollLeft;
+                ganttChartContent.addEventListener('mousedown', (e) => { isDown = true; ganttChartContent.classList.add('active'); startX = e.pageX - ganttChartContent.offsetLeft; scrollLeft = ganttChartContent.scrollLeft; });
+                ganttChartContent.addEventListener('mouseleave', () => { isDown = false; ganttChartContent.classList.remove('active'); });
+                ganttChartContent.addEventListener('mouseup', () => { isDown = false; ganttChartContent.classList.remove('active'); });
+                ganttChartContent.addEventListener('mousemove', (e) => { if (!isDown) return; e.preventDefault(); const x = e.pageX - ganttChartContent.offsetLeft; const walk = (x - startX) * 2; ganttChartContent.scrollLeft = scrollLeft - walk; });
+            }
+        }
+
+        function toggleSidebar() { 
+            document.getElementById('gantt-sidebar-wrapper-gantt').classList.toggle('collapsed'); 
+        }
+
+        function toggleFullscreen() {
+            const container = document.getElementById('gantt-container-gantt');
+            if (!document.fullscreenElement) {
+                container.requestFullscreen().catch(err => alert('Erro: ' + err.message));
+            } else {
+                document.exitFullscreen();
+            }
+        }
+
+        function handleFullscreenChange() {
+                const btn = document.getElementById('fullscreen-btn-gantt');
+                const container = document.getElementById('gantt-container-gantt');
+                if (document.fullscreenElement === container) {
+                    btn.innerHTML = '<span><svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M9 9l6 6m0-6l-6 6M3 20.29V5a2 2 0 012-2h14a2 2 0 012 2v10a2 2 0 01-2 2H5a2 2 0 01-2-2v-.29"></path></svg></span>';
+                    btn.classList.add('is-fullscreen');
+                } else {
+                    btn.innerHTML = '<span><svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2"><path d="M8 3H5a2 2 0 0 0-2 2v3m18 0V5a2 2 0 0 0-2-2h-3m0 18h3a2 2 0 0 0 2-2v-3M3 16v3a2 2 0 0 0 2 2h3"></path></svg></span>';
+                    btn.classList.remove('is-fullscreen');
+                    document.getElementById('filter-menu-gantt').classList.remove('is-open');
+                }
+            }
+        function updatePulmaoInputVisibility() {
+            const radioCom = document.getElementById('filter-pulmao-com-gantt');
+            const mesesGroup = document.getElementById('pulmao-meses-group-gantt');
+            if (radioCom && mesesGroup) {
+                if (radioCom.checked) { 
+                    mesesGroup.style.display = 'block'; 
+                } else { 
+                    mesesGroup.style.display = 'none'; 
+                }
+            }
+         }
+
+        // Função para atualizar opções de empreendimento baseado nas UGBs selecionadas
+        function updateEmpreendimentoOptionsConsolidado() {
+            const selUgbArray = vsUgbConsolidado ? vsUgbConsolidado.getValue() || [] : [];
+
+            // Obter tarefas da etapa atual (usar allTasks_baseData que é a fonte correta)
+            let tasksAtual = allTasks_baseData || [];
+
+            if (!tasksAtual || tasksAtual.length === 0) {
+                console.warn('Nenhuma task disponível para filtrar empreendimentos');
+                return;
+            }
+
+            // Filtrar empreendimentos por UGB
+            let filteredEmps = [...new Set(tasksAtual.map(t => t.name))];
+            if (selUgbArray.length > 0 && !selUgbArray.includes('Todas')) {
+                filteredEmps = [...new Set(tasksAtual
+                    .filter(t => selUgbArray.includes(t.ugb))
+                    .map(t => t.name))];
+            }
+
+            // Atualizar opções do VirtualSelect de empreendimento
+            const empreendimentoOptions = ["Todos"].concat(filteredEmps).map(e => ({ label: e, value: e }));
+
+            // Destruir e recriar o VirtualSelect para forçar re-render
+            if (vsEmpreendimento) {
+                vsEmpreendimento.destroy();
+            }
+
+            vsEmpreendimento = VirtualSelect.init({
+                multiple: true,
+                search: true,
+                optionsCount: 6,
+                showResetButton: true,
+                resetButtonText: 'Limpar',
+                selectAllText: 'Selecionar Todos',
+                allOptionsSelectedText: 'Todos',
+                optionsSelectedText: 'selecionados',
+                searchPlaceholderText: 'Buscar...',
+                optionHeight: '30px',
+                popupDropboxBreakpoint: '3000px',
+                noOptionsText: 'Nenhuma opção encontrada',
+                noSearchResultsText: 'Nenhum resultado encontrado',
+                ele: '#filter-empreendimento-gantt',
+                options: empreendimentoOptions,
+                placeholder: "Selecionar Empreendimento(s)",
+                selectedValue: ["Todos"]
+            });
+
+            console.log('Opções de empreendimento no consolidado atualizadas. Total:', filteredEmps.length);
+            console.log('Empreendimentos:', filteredEmps);
+        }
+
+        // *** FUNÇÃO populateFilters MODIFICADA ***
+        function populateFilters() {
+            if (filtersPopulated) return;
+
+            // *** 1. NOVO FILTRO DE ETAPA (Single Select) ***
+            selEtapaConsolidada = document.getElementById('filter-etapa-consolidada-gantt');
+            filterOptions.etapas_consolidadas.forEach(etapaNome => {
+                const isSelected = (etapaNome === initialStageName) ? 'selected' : '';
+                selEtapaConsolidada.innerHTML += `<option value="${etapaNome}" ${isSelected}>${etapaNome}</option>`;
+            });
+
+            const vsConfig = {
+                multiple: true,
+                search: true,
+                optionsCount: 6,
+                showResetButton: true,
+                resetButtonText: 'Limpar',
+                selectAllText: 'Selecionar Todos',
+                allOptionsSelectedText: 'Todos',
+                optionsSelectedText: 'selecionados',
+                searchPlaceholderText: 'Buscar...',
+                optionHeight: '30px',
+                popupDropboxBreakpoint: '3000px',
+                noOptionsText: 'Nenhuma opção encontrada',
+                noSearchResultsText: 'Nenhum resultado encontrado',
+            };
+
+            // *** NOVO: FILTRO DE UGB ***
+            const ugbOptions = (filterOptions.ugbs || ["Todas"]).map(u => ({ label: u, value: u }));
+            vsUgbConsolidado = VirtualSelect.init({
+                ...vsConfig,
+                ele: '#filter-ugb-consolidado-gantt',
+                options: ugbOptions,
+                placeholder: "Selecionar UGB(s)",
+                selectedValue: ["Todas"]
+            });
+
+            // Listener para atualizar opções de empreendimento quando UGB mudar
+            document.querySelector('#filter-ugb-consolidado-gantt').addEventListener('change', function() {
+                updateEmpreendimentoOptionsConsolidado();
+            });
+
+            // *** 2. FILTRO DE SETOR (REMOVIDO) ***
+            // if (filterOptions.setores) {
+            //     const setorOptions = filterOptions.setores.map(s => ({ label: s, value: s }));
+            //     vsSetor = VirtualSelect.init({ ... });
+            // }
+
+            // *** 3. FILTRO DE GRUPO (REMOVIDO) ***
+            // if (filterOptions.grupos) {
+            //     const grupoOptions = filterOptions.grupos.map(g => ({ label: g, value: g }));
+            //     vsGrupo = VirtualSelect.init({ ... });
+            // }
+
+            // *** 4. FILTRO DE EMPREENDIMENTO (Renomeado) ***
+            // Inicializar com todas as opções primeiro
+            const empreendimentoOptions = filterOptions.empreendimentos.map(e => ({ label: e, value: e }));
+            console.log('Inicializando vsEmpreendimento com opções:', empreendimentoOptions);
+
+            vsEmpreendimento = VirtualSelect.init({ // Renomeado de vsEtapa
+                ...vsConfig,
+                ele: '#filter-empreendimento-gantt', // ID Modificado
+                options: empreendimentoOptions,
+                placeholder: "Selecionar Empreendimento(s)",
+                selectedValue: ["Todos"]
+            });
+
+            console.log('vsEmpreendimento inicializado:', vsEmpreendimento ? 'OK' : 'FALHOU');
+
+            // *** 5. RESTO DOS FILTROS (Idêntico) ***
+            const visRadio = document.querySelector('input[name="filter-vis-gantt"][value="' + tipoVisualizacao + '"]');
+            if(visRadio) visRadio.checked = true;
+
+            const radioCom = document.getElementById('filter-pulmao-com-gantt');
+            const radioSem = document.getElementById('filter-pulmao-sem-gantt');
+            radioCom.addEventListener('change', updatePulmaoInputVisibility);
+            radioSem.addEventListener('change', updatePulmaoInputVisibility);
+            const pulmaoRadioInitial = document.querySelector('input[name="filter-pulmao-gantt"][value="' + initialPulmaoStatus + '"]');
+            if(pulmaoRadioInitial) pulmaoRadioInitial.checked = true;
+            document.getElementById('filter-pulmao-meses-gantt').value = A.pulmao_meses;
+            updatePulmaoInputVisibility();
+
+            filtersPopulated = true;
+        }
+
+        // *** FUNÇÃO updateProjectTitle (Nova/Modificada) ***
+        function updateProjectTitle(newStageName) {
+            const projectTitle = document.querySelector('#gantt-sidebar-wrapper-gantt .project-title-row span');
+            if (projectTitle) {
+                projectTitle.textContent = `Comparativo: ${newStageName}`;
+                // Atualiza também o 'projectData' global se necessário, embora o 'name' não seja mais usado
+                projectData[0].name = `Comparativo: ${newStageName}`;
+            }
+        }
+
+        // *** FUNÇÃO applyFiltersAndRedraw MODIFICADA ***
+        function applyFiltersAndRedraw() {
+            try {
+                // *** 1. LER A ETAPA PRIMEIRO ***
+                const selEtapaNome = selEtapaConsolidada.value;
+
+                // *** 2. LER OUTROS FILTROS ***
+                // Nota: UGB não é lido aqui pois apenas filtra opções de empreendimento, não tarefas
+                const selEmpreendimentoArray = vsEmpreendimento ? vsEmpreendimento.getValue() || [] : []; // Renomeado
+
+                const selConcluidas = document.getElementById('filter-concluidas-gantt').checked;
+                const selVis = document.querySelector('input[name="filter-vis-gantt"]:checked').value;
+                const selPulmao = document.querySelector('input[name="filter-pulmao-gantt"]:checked').value;
+                const selPulmaoMeses = parseInt(document.getElementById('filter-pulmao-meses-gantt').value, 10) || 0;
+
+                // *** FECHAR MENU DE FILTROS ***
+                document.getElementById('filter-menu-gantt').classList.remove('is-open');
+
+                // *** 3. ATUALIZAR DADOS BASE SE A ETAPA MUDOU ***
+                if (selEtapaNome !== currentStageName) {
+                    currentStageName = selEtapaNome;
+                    // Pegar os dados "crus" para a nova etapa
+                    allTasks_baseData = JSON.parse(JSON.stringify(allDataByStage[currentStageName] || []));
+                    console.log(`Mudando para etapa: ${currentStageName}. Tasks carregadas: ${allTasks_baseData.length}`);
+                }
+
+                // Começar com os dados da etapa (já atualizados ou não)
+                let baseTasks = JSON.parse(JSON.stringify(allTasks_baseData));
+
+                // *** 4. APLICAR LÓGICA DE PULMÃO (CORRIGIDO) ***
+                if (selPulmao === 'Com Pulmão' && selPulmaoMeses > 0) {
+                    const offsetMeses = -selPulmaoMeses;
+                    // Passa o nome da etapa atual para a lógica - APENAS PREVISTO AFETADO
+                    baseTasks = aplicarLogicaPulmaoConsolidado(baseTasks, offsetMeses, currentStageName);
+                }
+
+                // *** 5. APLICAR FILTROS SECUNDÁRIOS ***
+                let filteredTasks = baseTasks;
+
+                // Nota: Filtro de UGB não filtra tarefas, apenas opções de empreendimento
+
+                // if (selSetorArray.length > 0 && !selSetorArray.includes('Todos')) {
+                //     filteredTasks = filteredTasks.filter(t => selSetorArray.includes(t.setor));
+                // } // REMOVIDO
+
+                // if (selGrupoArray.length > 0 && !selGrupoArray.includes('Todos')) {
+                //     filteredTasks = filteredTasks.filter(t => selGrupoArray.includes(t.grupo));
+                // } // REMOVIDO
+
+                // Lógica de filtro de empreendimento (antiga 'etapa')
+                if (selEmpreendimentoArray.length > 0 && !selEmpreendimentoArray.includes('Todos')) {
+                    filteredTasks = filteredTasks.filter(t => selEmpreendimentoArray.includes(t.name));
+                }
+
+                if (selConcluidas) {
+                    filteredTasks = filteredTasks.filter(t => t.progress < 100);
+                }
+
+                console.log('Empreendimentos após filtros:', filteredTasks.length);
+
+                // *** 6. ATUALIZAR DADOS E REDESENHAR ***
+                projectData[0].tasks = filteredTasks; // Atualiza as tarefas ativas
+                tipoVisualizacao = selVis;
+                pulmaoStatus = selPulmao;
+
+                // *** 7. REPLICAR BASELINES SELECIONADAS ***
+                // Após filtrar, reaplicar as baselines que o usuário selecionou
+                filteredTasks.forEach(task => {
+                    const emp = task.name;
+                    const selectedBaseline = baselinesPorEmpreendimento[emp];
+
+                    if (selectedBaseline && selectedBaseline !== "P0-(padrão)") {
+                        // Aplicar baseline sem re-renderizar (será feito no final)
+                        if (task.baselines && task.baselines[selectedBaseline]) {
+                            const baselineData = task.baselines[selectedBaseline];
+
+                            if (baselineData.start !== null && baselineData.end !== null) {
+                                // Aplicar dados da baseline
+                                let startPrevisto = baselineData.start;
+                                let endPrevisto = baselineData.end;
+
+                                // *** APLICAR PULMÃO SE NECESSÁRIO ***
+                                if (selPulmao === 'Com Pulmão' && selPulmaoMeses > 0) {
+                                    const offsetMeses = -selPulmaoMeses;
+                                    const startDate = parseDate(startPrevisto);
+                                    const endDate = parseDate(endPrevisto);
+
+                                    if (startDate && endDate) {
+                                        startDate.setMonth(startDate.getMonth() + offsetMeses);
+                                        endDate.setMonth(endDate.getMonth() + offsetMeses);
+
+                                        startPrevisto = startDate.toISOString().split('T')[0];
+                                        endPrevisto = endDate.toISOString().split('T')[0];
+                                    }
+                                }
+
+                                task.start_previsto = startPrevisto;
+                                task.end_previsto = endPrevisto;
+                                task.inicio_previsto = formatDateDisplay(task.start_previsto);
+                                task.termino_previsto = formatDateDisplay(task.end_previsto);
+
+                                const startDate = parseDate(task.start_previsto);
+                                const endDate = parseDate(task.end_previsto);
+                                if (startDate && endDate) {
+                                    const diffDays = (endDate - startDate) / (1000 * 60 * 60 * 24);
+                                    task.duracao_prev_meses = (diffDays / 30.4375).toFixed(1).replace('.', ',');
+                                }
+
+                                if (task.end_real_original_raw && task.end_previsto) {
+                                    const endReal = parseDate(task.end_real_original_raw);
+                                    const endPrev = parseDate(task.end_previsto);
+                                    if (endReal && endPrev) {
+                                        const diffDays = Math.round((endReal - endPrev) / (1000 * 60 * 60 * 24));
+                                        task.vt_text = diffDays > 0 ? `+${diffDays}d` : diffDays < 0 ? `${diffDays}d` : '0d';
+                                    }
+                                }
+                            }
+                        }
+                    }
+                });
+
+                // *** 8. ATUALIZAR TÍTULO DO PROJETO ***
+                updateProjectTitle(currentStageName);
+
+                // Redesenhar
+                renderSidebar();
+                renderChart();
+
+            } catch (error) {
+                console.error('Erro ao aplicar filtros no consolidado:', error);
+                alert('Erro ao aplicar filtros: ' + error.message);
+            }
+        }
+
+        // DEBUG: Verificar dados antes de inicializar
+        console.log('Dados do projeto consolidado (inicial):', projectData);
+        console.log('Tasks base consolidado (inicial):', allTasks_baseData);
+        console.log('TODOS os dados de etapa (full):', allDataByStage);
+
+        //  FUNÇÃO GLOBAL PARA APLICAR BASELINE
+        window.handleBaselineChange = function(empreendimento, baselineName) {
+            console.log(`📊 Baseline selected: ${baselineName} for ${empreendimento}`);
+
+            // Update URL parameters to trigger Streamlit rerun
+            const url = new URL(window.location.href);
+            url.searchParams.set('change_baseline', baselineName);
+            url.searchParams.set('empreendimento', empreendimento);
+
+            // Reload page with new parameters
+            window.location.href = url.toString();
+        }
+
+        // *** BASELINE INDIVIDUAL POR EMPREENDIMENTO (MODIFICADO) ***
+        // Mapa para rastrear baseline ativa de cada empreendimento
+        let baselinesPorEmpreendimento = {};
+
+        // Inicializar estado com P0 para todos
+        function initializeBaselineState() {
+            const tasks = projectData[0].tasks;
+            if (tasks) {
+                tasks.forEach(task => {
+                    baselinesPorEmpreendimento[task.name] = "P0-(padrão)";
+                });
+            }
+            console.log('Estado de baselines inicializado:', baselinesPorEmpreendimento);
+        }
+
+        // Aplicar baseline para um empreendimento específico
+        function applyBaselineForEmp(empreendimento, baselineName) {
+            console.log(`🔄 Aplicando baseline "${baselineName}" para: ${empreendimento}`);
+
+            const tasks = projectData[0].tasks;
+            if (!tasks || tasks.length === 0) {
+                console.warn('Nenhuma task disponível');
+                return;
+            }
+
+            // Atualizar estado
+            baselinesPorEmpreendimento[empreendimento] = baselineName;
+
+            // Encontrar a task deste empreendimento
+            const task = tasks.find(t => t.name === empreendimento);
+
+            if (!task) {
+                console.warn(`Task não encontrada para empreendimento: ${empreendimento}`);
+                return;
+            }
+
+            if (!task.baselines || !task.baselines[baselineName]) {
+                console.warn(`Task ${task.name} não tem baseline ${baselineName}`);
+                return;
+            }
+
+            const baselineData = task.baselines[baselineName];
+
+            if (baselineData.start !== null && baselineData.end !== null) {
+                // Atualizar datas previstas
+                task.start_previsto = baselineData.start;
+                task.end_previsto = baselineData.end;
+
+                // Recalcular campos de exibição
+                task.inicio_previsto = formatDateDisplay(task.start_previsto);
+                task.termino_previsto = formatDateDisplay(task.end_previsto);
+
+                // Recalcular duração
+                const startDate = parseDate(task.start_previsto);
+                const endDate = parseDate(task.end_previsto);
+                if (startDate && endDate) {
+                    const diffDays = (endDate - startDate) / (1000 * 60 * 60 * 24);
+                    task.duracao_prev_meses = (diffDays / 30.4375).toFixed(1).replace('.', ',');
+                }
+
+                // Recalcular VT (Variação de Término)
+                if (task.end_real_original_raw && task.end_previsto) {
+                    const endReal = parseDate(task.end_real_original_raw);
+                    const endPrev = parseDate(task.end_previsto);
+                    if (endReal && endPrev) {
+                        const diffDays = Math.round((endReal - endPrev) / (1000 * 60 * 60 * 24));
+                        task.vt_text = diffDays > 0 ? `+${diffDays}d` : diffDays < 0 ? `${diffDays}d` : '0d';
+                    }
+                }
+
+                console.log(`✅ Baseline aplicada para ${empreendimento}: ${baselineName}`);
+            } else {
+                // Baseline não tem dados para esta etapa
+                task.start_previsto = null;
+                task.end_previsto = null;
+                task.inicio_previsto = "N/D";
+                task.termino_previsto = "N/D";
+                task.duracao_prev_meses = "-";
+                task.vt_text = "-";
+
+                console.log(`⚠️ Baseline ${baselineName} não tem dados para ${empreendimento}`);
+            }
+
+            // Re-renderizar o gráfico
+            renderSidebar();
+            renderChart();
+
+            console.log(`🎨 Gráfico re-renderizado após aplicar baseline`);
+        }
+
+        // *** FUNÇÕES DE APLICAÇÃO RÁPIDA (NOVO) ***
+
+        // Encontrar última baseline disponível para um empreendimento
+        function findLatestBaseline(baselines) {
+            if (!baselines) return "P0-(padrão)";
+
+            const baselineNames = Object.keys(baselines);
+
+            // Filtrar apenas baselines válidas (não P0)
+            const validBaselines = baselineNames.filter(name => name !== "P0-(padrão)");
+
+            if (validBaselines.length === 0) {
+                return "P0-(padrão)";
+            }
+
+            // Ordenar por hierarquia numérica (P10 > P9 > ... > P1)
+            validBaselines.sort((a, b) => {
+                // Extrair número de P1, P2, P10, etc.
+                const numA = parseInt(a.match(/P(\d+)/)?.[1] || '0');
+                const numB = parseInt(b.match(/P(\d+)/)?.[1] || '0');
+
+                // Maior número = mais recente
+                return numB - numA;
+            });
+
+            console.log(`Última baseline encontrada: ${validBaselines[0]}`);
+            return validBaselines[0];
+        }
+
+        // Aplicar P0 para todos os empreendimentos
+        function applyP0ToAll() {
+            console.log('🔄 Aplicando P0 para todos os empreendimentos');
+
+            const tasks = projectData[0].tasks;
+            if (!tasks) return;
+
+            let count = 0;
+            tasks.forEach(task => {
+                const emp = task.name;
+                const baselineName = "P0-(padrão)";
+
+                // Atualizar estado
+                baselinesPorEmpreendimento[emp] = baselineName;
+
+                // Aplicar baseline P0 diretamente
+                if (task.baselines && task.baselines[baselineName]) {
+                    const baselineData = task.baselines[baselineName];
+
+                    if (baselineData.start !== null && baselineData.end !== null) {
+                        task.start_previsto = baselineData.start;
+                        task.end_previsto = baselineData.end;
+                        task.inicio_previsto = formatDateDisplay(task.start_previsto);
+                        task.termino_previsto = formatDateDisplay(task.end_previsto);
+
+                        const startDate = parseDate(task.start_previsto);
+                        const endDate = parseDate(task.end_previsto);
+                        if (startDate && endDate) {
+                            const diffDays = (endDate - startDate) / (1000 * 60 * 60 * 24);
+                            task.duracao_prev_meses = (diffDays / 30.4375).toFixed(1).replace('.', ',');
+                        }
+
+                        if (task.end_real_original_raw && task.end_previsto) {
+                            const endReal = parseDate(task.end_real_original_raw);
+                            const endPrev = parseDate(task.end_previsto);
+                            if (endReal && endPrev) {
+                                const diffDays = Math.round((endReal - endPrev) / (1000 * 60 * 60 * 24));
+                                task.vt_text = diffDays > 0 ? `+${diffDays}d` : diffDays < 0 ? `${diffDays}d` : '0d';
+                            }
+                        }
+                    }
+                }
+
+                // Atualizar dropdown visual
+                const dropdown = document.querySelector(`select[data-emp="${emp}"]`);
+                if (dropdown) {
+                    dropdown.value = baselineName;
+                }
+
+                count++;
+            });
+
+            // Renderizar apenas uma vez no final
+            renderSidebar();
+            renderChart();
+
+            console.log(`✅ P0 aplicado para ${count} empreendimentos`);
+        }
+
+
+        // Aplicar última baseline para todos os empreendimentos
+        function applyLatestToAll() {
+            console.log('🔄 Aplicando última baseline para todos os empreendimentos');
+
+            const tasks = projectData[0].tasks;
+            if (!tasks) return;
+
+            let count = 0;
+            tasks.forEach(task => {
+                const emp = task.name;
+
+                // Encontrar última baseline deste empreendimento
+                const latestBaseline = findLatestBaseline(task.baselines);
+
+                if (latestBaseline) {
+                    // Atualizar estado
+                    baselinesPorEmpreendimento[emp] = latestBaseline;
+
+                    // Aplicar baseline diretamente
+                    if (task.baselines && task.baselines[latestBaseline]) {
+                        const baselineData = task.baselines[latestBaseline];
+
+                        if (baselineData.start !== null && baselineData.end !== null) {
+                            task.start_previsto = baselineData.start;
+                            task.end_previsto = baselineData.end;
+                            task.inicio_previsto = formatDateDisplay(task.start_previsto);
+                            task.termino_previsto = formatDateDisplay(task.end_previsto);
+
+                            const startDate = parseDate(task.start_previsto);
+                            const endDate = parseDate(task.end_previsto);
+                            if (startDate && endDate) {
+                                const diffDays = (endDate - startDate) / (1000 * 60 * 60 * 24);
+                                task.duracao_prev_meses = (diffDays / 30.4375).toFixed(1).replace('.', ',');
+                            }
+
+                            if (task.end_real_original_raw && task.end_previsto) {
+                                const endReal = parseDate(task.end_real_original_raw);
+                                const endPrev = parseDate(task.end_previsto);
+                                if (endReal && endPrev) {
+                                    const diffDays = Math.round((endReal - endPrev) / (1000 * 60 * 60 * 24));
+                                    task.vt_text = diffDays > 0 ? `+${diffDays}d` : diffDays < 0 ? `${diffDays}d` : '0d';
+                                }
+                            }
+                        } else {
+                            task.start_previsto = null;
+                            task.end_previsto = null;
+                            task.inicio_previsto = "N/D";
+                            task.termino_previsto = "N/D";
+                            task.duracao_prev_meses = "-";
+                            task.vt_text = "-";
+                        }
+                    }
+
+                    // Atualizar dropdown visual
+                    const dropdown = document.querySelector(`select[data-emp="${emp}"]`);
+                    if (dropdown) {
+                        dropdown.value = latestBaseline;
+                    }
+
+                    count++;
+                }
+            });
+
+            // Renderizar apenas uma vez no final
+            renderSidebar();
+            renderChart();
+
+            console.log(`✅ Última baseline aplicada para ${count} empreendimentos`);
+        }
+
+
+        // Gerenciar checkboxes de aplicação rápida
+        function handleQuickApply(mode) {
+            const p0Checkbox = document.getElementById('apply-p0-all-gantt');
+            const latestCheckbox = document.getElementById('apply-latest-all-gantt');
+
+            if (mode === 'p0') {
+                // Desmarcar "latest"
+                if (latestCheckbox) latestCheckbox.checked = false;
+
+                if (p0Checkbox && p0Checkbox.checked) {
+                    applyP0ToAll();
+                }
+            } else if (mode === 'latest') {
+                // Desmarcar "p0"
+                if (p0Checkbox) p0Checkbox.checked = false;
+
+                if (latestCheckbox && latestCheckbox.checked) {
+                    applyLatestToAll();
+                }
+            }
+        }
+
+        // Configurar redimensionamento arrastável
+        function setupBaselineResize() {
+            const corner = document.querySelector('.baseline-resize-corner');
+            const selector = document.getElementById('baseline-selector-gantt');
+            const table = selector ? selector.querySelector('.baseline-selector-table') : null;
+
+            if (!corner || !selector || !table) return;
+
+            let isResizing = false;
+            let startX = 0;
+            let startY = 0;
+            let startWidth = 0;
+            let startHeight = 0;
+
+            corner.addEventListener('mousedown', function(e) {
+                isResizing = true;
+                startX = e.clientX;
+                startY = e.clientY;
+                startWidth = selector.offsetWidth;
+                startHeight = table.offsetHeight;
+
+                // Prevenir seleção de texto
+                e.preventDefault();
+                e.stopPropagation();
+                document.body.style.userSelect = 'none';
+                document.body.style.cursor = 'nwse-resize';
+            });
+
+            document.addEventListener('mousemove', function(e) {
+                if (!isResizing) return;
+
+                // Calcular nova largura (arrastar para esquerda diminui, direita aumenta)
+                const diffX = startX - e.clientX; // Invertido porque é borda esquerda
+                const newWidth = Math.max(250, Math.min(600, startWidth + diffX));
+                selector.style.width = `${newWidth}px`;
+
+                // Calcular nova altura (arrastar para baixo aumenta, cima diminui)
+                const diffY = e.clientY - startY;
+                const newHeight = Math.max(150, Math.min(600, startHeight + diffY));
+                table.style.maxHeight = `${newHeight}px`;
+            });
+
+            document.addEventListener('mouseup', function() {
+                if (isResizing) {
+                    isResizing = false;
+                    document.body.style.userSelect = '';
+                    document.body.style.cursor = '';
+                }
+            });
+        }
+
+
+
+        // Event Listeners para baseline
+        function setupBaselineListeners() {
+            const baselineBtn = document.getElementById('baseline-btn-gantt');
+            const baselineSelector = document.getElementById('baseline-selector-gantt');
+            const filterMenu = document.getElementById('filter-menu-gantt');
+
+            if (baselineBtn) {
+                baselineBtn.addEventListener('click', function(e) {
+                    e.stopPropagation();
+
+                    // Fechar filtro se aberto
+                    if (filterMenu) {
+                        filterMenu.classList.remove('is-open');
+                    }
+
+                    // Toggle baseline selector
+                    if (baselineSelector.style.display === 'block') {
+                        baselineSelector.style.display = 'none';
+                    } else {
+                        baselineSelector.style.display = 'block';
+                    }
+                });
+            }
+
+            // Fechar ao clicar fora
+            document.addEventListener('click', function(e) {
+                if (baselineSelector && baselineBtn && 
+                    !baselineSelector.contains(e.target) && 
+                    e.target !== baselineBtn && 
+                    !baselineBtn.contains(e.target)) {
+                    baselineSelector.style.display = 'none';
+                }
+            });
+        }
+
+        // Inicializar o Gantt Consolidado
+        initGantt();
+        setupBaselineListeners();  // *** NOVO: Ativar event listeners de baseline ***
+        setupBaselineResize();      // *** NOVO: Ativar redimensionamento arrastável ***
+    },
+});
@@ -0,0 +1,1170 @@
+/*
+ * Gantt por setor (gerar_gantt_por_setor em app.py).
+ */
+GanttMacrofluxo.registrarVisao("setor", {
+    markup: (A, { esc }) => `
+<div class="gantt-container" id="gantt-container-gantt">
+    <div class="gantt-toolbar" id="gantt-toolbar-gantt">
+        <button class="toolbar-btn" id="filter-btn-gantt" title="Filtros">
+            <span>
+                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                    <polygon points="22 3 2 3 10 12.46 10 19 14 21 14 12.46 22 3"></polygon>
+                </svg>
+            </span>
+        </button>
+        <button class="toolbar-btn" id="baseline-btn-gantt" title="Linhas de Base">
+            <span>
+                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                    <rect x="3" y="3" width="18" height="18" rx="2" ry="2"></rect>
+                    <line x1="3" y1="9" x2="21" y2="9"></line>
+                    <line x1="3" y1="15" x2="21" y2="15"></line>
+                </svg>
+            </span>
+        </button>
+        <button class="toolbar-btn" id="fullscreen-btn-gantt" title="Tela Cheia">
+            <span>
+                <svg width="16" height="16" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
+                    <path d="M8 3H5a2 2 0 0 0-2 2v3m18 0V5a2 2 0 0 0-2-2h-3m0 18h3a2 2 0 0 0 2-2v-3M3 16v3a2 2 0 0 0 2 2h3"></path>
+                </svg>
+            </span>
+        </button>
+    </div>
+
+    <!-- Seletor de Setor (NOVO) -->
+    <div class="floating-filter-menu" id="filter-menu-gantt">
+        <div class="filter-group">
+            <label for="filter-setor-gantt">Setor</label>
+            <select id="filter-setor-gantt">
+                ${A.setores.map(([nome, icone]) => `<option value="${esc(nome)}" ${nome === A.setor_inicial ? 'selected' : ''}>${esc(icone)} ${esc(nome)}</option>`).join('')}
+            </select>
+        </div>
+
+        <div class="filter-group">
+            <label for="filter-ugb-setor-gantt">UGB</label>
+            <div id="filter-ugb-setor-gantt"></div>
+        </div>
+
+        <div class="filter-group">
+            <label for="filter-project-gantt">Empreendimento</label>
+            <div id="filter-project-gantt"></div>
+        </div>
+        <div class="filter-group">
+            <label for="filter-grupo-gantt">Grupo</label>
+            <div id="filter-grupo-gantt"></div>
+        </div>
+        <div class="filter-group">
+            <label for="filter-etapa-gantt">Etapa</label>
+            <div id="filter-etapa-gantt"></div>
+        </div>
+        <div class="filter-group">
+            <label for="filter-macroetapa-gantt">Macroetapas</label>
+            <div id="filter-macroetapa-gantt"></div>
+        </div>
+        <div class="filter-group">
+            <div class="filter-group-checkbox">
+                <input type="checkbox" id="filter-concluidas-gantt">
+                <label for="filter-concluidas-gantt">Mostrar apenas não concluídas</label>
+            </div>
+        </div>
+        <div class="filter-group">
+            <label>Visualização</label>
+            <div class="filter-group-radio">
+                <input type="radio" id="filter-vis-ambos-gantt" name="filter-vis-gantt" value="Ambos" checked>
+                <label for="filter-vis-ambos-gantt">Ambos</label>
+            </div>
+            <div class="filter-group-radio">
+                <input type="radio" id="filter-vis-previsto-gantt" name="filter-vis-gantt" value="Previsto">
+                <label for="filter-vis-previsto-gantt">Previsto</label>
+            </div>
+            <div class="filter-group-radio">
+                <input type="radio" id="filter-vis-real-gantt" name="filter-vis-gantt" value="Real">
+                <label for="filter-vis-real-gantt">Real</label>
+            </div>
+        </div>
+        <button class="filter-apply-btn" id="filter-apply-btn-gantt">Aplicar Filtros</button>
+    </div>
+
+    <!-- Seletor de Baselines -->
+    <div class="baseline-selector" id="baseline-selector-gantt">
+        <div style="margin-bottom: 12px; font-weight: 700; color: #1a202c; font-size: 14px; border-bottom: 2px solid #1a202c; padding-bottom: 8px;">
+            Selecione Linhas de Base
+        </div>
+
+        <div style="margin-bottom: 15px; padding: 10px; background: #f7fafc; border-radius: 6px; border: 1px solid #e2e8f0;">
+            <div style="font-weight: 600; color: #2d3748; font-size: 12px; margin-bottom: 10px;">
+                Aplicação Rápida
+            </div>
+            <div style="display: flex; flex-direction: column; gap: 6px;">
+                <label style="display: flex; align-items: center; cursor: pointer;">
+                    <input type="checkbox" id="apply-p0-all-gantt" 
+                           onchange="handleQuickApply('p0')"
+                           style="margin-right: 6px; cursor: pointer;">
+                    <span style="font-size: 11px; color: #4a5568;">Aplicar P0 para todos</span>
+                </label>
+                <label style="display: flex; align-items: center; cursor: pointer;">
+                    <input type="checkbox" id="apply-latest-all-gantt" 
+                           onchange="handleQuickApply('latest')"
+                           style="margin-right: 6px; cursor: pointer;">
+                    <span style="font-size: 11px; color: #4a5568;">Aplicar última baseline para todos</span>
+                </label>
+            </div>
+        </div>
+
+        <div class="baseline-selector-table" style="max-height: 400px; overflow-y: auto; margin-top: 10px;">
+            ${A.linhas_baseline_html}
+        </div>
+        <div class="baseline-resize-corner" title="Arrastar para redimensionar"></div>
+    </div>
+
+    <div class="gantt-main">
+        <div class="gantt-sidebar-wrapper" id="gantt-sidebar-wrapper-gantt">
+            <div class="gantt-sidebar-header">
+                <div class="project-title-row">
+                    <span>${esc(A.titulo)}</span>
+                    <button class="toggle-sidebar-btn" id="toggle-sidebar-btn-gantt" title="Recolher/Expandir Tabela">«</button>
+                </div>
+                <div class="sidebar-grid-header-wrapper">
+                    <div></div>
+                    <div class="sidebar-grid-header">
+                        <div class="header-cell task-name-cell">EMP + ETAPA</div>
+                        <div class="header-cell">UGB</div>
+                        <div class="header-cell">INÍCIO-P</div>
+                        <div class="header-cell">TÉRMINO-P</div>
+                        <div class="header-cell">DUR-P</div>
+                        <div class="header-cell">INÍCIO-R</div>
+                        <div class="header-cell">TÉRMINO-R</div>
+                        <div class="header-cell">DUR-R</div>
+                        <div class="header-cell">%</div>
+                        <div class="header-cell">VT</div>
+                        <div class="header-cell">VD</div>
+                    </div>
+                </div>
+            </div>
+            <div class="gantt-sidebar-content" id="gantt-sidebar-content-gantt"></div>
+        </div>
+        <div class="gantt-chart-content" id="gantt-chart-content-gantt">
+            <div class="chart-container" id="chart-container-gantt"></div>
+        </div>
+    </div>
+
+    <!-- Tooltip dentro do container para funcionar em fullscreen -->
+    <div class="tooltip" id="tooltip"></div>
+</div>
+`,
+
+    iniciar: function (A) {
+        // Funções usadas pelos handlers inline do markup
+        window.handleQuickApply = handleQuickApply;
+        window.applyBaselineForEmp = applyBaselineForEmp;
+
+        // Dados de todos os setores
+        const allDataBySector = A.dados_por_setor;
+        const etapasBySector = A.etapas_por_setor;
+        const gruposPorSetor = A.grupos_por_setor;
+        const macroetapasPorSetor = A.macroetapas_por_setor;
+        const mapeamentoGrupos = A.grupos;
+
+        // Opções de filtros
+        const filterOptions = A.filter_options;
+
+        // *** NOVAS VARIÁVEIS GLOBAIS ***
+        const initialSectorName = A.setor_inicial;
+        let currentSector = initialSectorName;
+        let allTasks_baseData = JSON.parse(JSON.stringify(allDataBySector[currentSector] || []));
+        let currentTasks = [...allTasks_baseData];
+
+        // Variável para armazenar o tipo de visualização selecionado
+        let savedVisualizationType = 'Ambos';
+
+        // *** Variável Global para Virtual Select ***
+        let vsEtapa;
+        let vsGrupo;
+        let vsMacroetapas;
+        let vsUgbSetor; // NOVO: Filtro de UGB
+        let vsEmpreendimentoSetor; // NOVO: Filtro de Empreendimento
+
+        // *** FUNÇÃO AUXILIAR: Inicializar Virtual Select de Etapas ***
+        function renderStageCheckboxes(sectorName) {
+            const etapas = etapasBySector[sectorName] || [];
+
+            // Converter para formato do Virtual Select
+            const options = etapas.map(etapa => ({
+                label: etapa.nome,
+                value: etapa.nome
+            }));
+
+            // Destruir instância anterior se existir
+            if (vsEtapa) {
+                vsEtapa.destroy();
+            }
+
+            // Inicializar Virtual Select
+            vsEtapa = VirtualSelect.init({
+                ele: '#filter-etapa-gantt',
+                options: options,
+                multiple: true,
+                search: true,
+                selectedValue: options.map(o => o.value),  // TODAS selecionadas por padrão
+                placeholder: 'Selecione etapas',
+                noOptionsText: 'Nenhuma etapa disponível',
+                searchPlaceholderText: 'Buscar...',
+                selectAllText: 'Selecionar todas',
+                allOptionsSelectedText: 'Todas selecionadas'
+            });
+
+            console.log(`🔄 Virtual Select Etapa renderizado: ${options.length} opções, todas selecionadas`);
+        }
+
+        // *** FUNÇÃO AUXILIAR: Inicializar Virtual Select de Grupos ***
+        function renderGroupCheckboxes(sectorName) {
+            // Usar apenas os grupos que têm etapas presentes neste setor
+            const gruposDoSetor = gruposPorSetor[sectorName] || [];
+
+            // Converter para formato do Virtual Select
+            const options = gruposDoSetor.map(grupo => ({
+                label: grupo,
+                value: grupo
+            }));
+
+            // Destruir instância anterior se existir
+            if (vsGrupo) {
+                vsGrupo.destroy();
+            }
+
+            // Inicializar Virtual Select
+            vsGrupo = VirtualSelect.init({
+                ele: '#filter-grupo-gantt',
+                options: options,
+                multiple: true,
+                search: true,
+                selectedValue: options.map(o => o.value),  // TODAS selecionadas por padrão
+                placeholder: 'Selecione grupos',
+                noOptionsText: 'Nenhum grupo disponível',
+                searchPlaceholderText: 'Buscar...',
+                selectAllText: 'Selecionar todos',
+                allOptionsSelectedText: 'Todos selecionados'
+            });
+
+            console.log(`🔄 Virtual Select Grupo renderizado: ${options.length} opções, todas selecionadas`);
+        }
+
+        // *** FUNÇÃO AUXILIAR: Inicializar Virtual Select de Macroetapas ***
+        function renderMacroetapasCheckboxes(sectorName) {
+            // Usar macroetapas do setor selecionado
+            const macroetapas = macroetapasPorSetor[sectorName] || [];
+
+            // Converter para formato do Virtual Select
+            const options = macroetapas.map(macro => ({
+                label: macro,
+                value: macro
+            }));
+
+            // Destruir instância anterior se existir
+            if (vsMacroetapas) {
+                vsMacroetapas.destroy();
+            }
+
+            // Inicializar Virtual Select
+            vsMacroetapas = VirtualSelect.init({
+                ele: '#filter-macroetapa-gantt',
+                options: options,
+                multiple: true,
+                search: true,
+                selectedValue: options.map(o => o.value),  // TODAS selecionadas por padrão
+                placeholder: 'Selecione macroetapas',
+                noOptionsText: 'Nenhuma macroetapa disponível',
+                searchPlaceholderText: 'Buscar...',
+                selectAllText: 'Selecionar todas',
+                allOptionsSelectedText: 'Todas selecionadas'
+            });
+
+            console.log(`🔄 Virtual Select Macroetapas renderizado: ${options.length} opções, todas selecionadas`);
+        }
+
+        // *** FUNÇÃO: Inicializar Virtual Select de UGB ***
+        function initUGBFilter() {
+            const ugbOptions = (filterOptions.ugbs || ["Todas"]).map(u => ({ label: u, value: u }));
+
+            if (vsUgbSetor) {
+                vsUgbSetor.destroy();
+            }
+
+            vsUgbSetor = VirtualSelect.init({
+                ele: '#filter-ugb-setor-gantt',
+                options: ugbOptions,
+                multiple: true,
+                search: true,
+                selectedValue: ["Todas"],
+                placeholder: 'Selecionar UGB(s)',
+                noOptionsText: 'Nenhuma UGB disponível',
+                searchPlaceholderText: 'Buscar...',
+                selectAllText: 'Selecionar todas',
+                allOptionsSelectedText: 'Todas selecionadas'
+            });
+
+            // Listener para atualizar empreendimentos
+            document.querySelector('#filter-ugb-setor-gantt').addEventListener('change', function() {
+                updateEmpreendimentoOptionsSetor();
+            });
+
+            console.log('🔄 Virtual Select UGB renderizado');
+        }
+
+        // *** FUNÇÃO: Atualizar opções de empreendimento baseado em UGB ***
+        function updateEmpreendimentoOptionsSetor() {
+            const selUgbArray = vsUgbSetor ? vsUgbSetor.getValue() || [] : [];
+            let tasksAtual = allTasks_baseData || [];
+
+            if (!tasksAtual || tasksAtual.length === 0) {
+                console.warn('Nenhuma task disponível para filtrar empreendimentos');
+                return;
+            }
+
+            // Filtrar empreendimentos por UGB
+            let filteredEmps = [...new Set(tasksAtual.map(t => t.empreendimento))];
+            if (selUgbArray.length > 0 && !selUgbArray.includes('Todas')) {
+                filteredEmps = [...new Set(tasksAtual
+                    .filter(t => selUgbArray.includes(t.ugb))
+                    .map(t => t.empreendimento))];
+            }
+
+            // Destruir e recriar VirtualSelect de empreendimento
+            if (vsEmpreendimentoSetor) {
+                vsEmpreendimentoSetor.destroy();
+            }
+
+            const empreendimentoOptions = ["Todos"].concat(filteredEmps).map(e => ({ label: e, value: e }));
+            vsEmpreendimentoSetor = VirtualSelect.init({
+                ele: '#filter-project-gantt',
+                options: empreendimentoOptions,
+                multiple: true,
+                search: true,
+                selectedValue: ["Todos"],
+                placeholder: 'Selecionar Empreendimento(s)',
+                noOptionsText: 'Nenhum empreendimento disponível',
+                searchPlaceholderText: 'Buscar...',
+                selectAllText: 'Selecionar todos',
+                allOptionsSelectedText: 'Todos selecionados'
+            });
+
+            console.log('Opções de empreendimento atualizadas no setor. Total:', filteredEmps.length);
+        }
+
+        // *** FUNÇÃO AUXILIAR: Atualizar Título do Projeto ***
+        function updateProjectTitle(newSectorName) {
+            const projectTitle = document.querySelector('#gantt-sidebar-wrapper-gantt .project-title-row span');
+            if (projectTitle) {
+                projectTitle.textContent = `Setor: ${newSectorName}`;
+            }
+        }
+
+        // *** FUNÇÃO AUXILIAR: Formatar Data para Exibição ***
+        function formatDateDisplay(dateStr) {
+            if (!dateStr) return "N/D";
+            try {
+                const date = new Date(dateStr);
+                if (isNaN(date.getTime())) return "N/D";
+                const day = String(date.getUTCDate()).padStart(2, '0');
+                const month = String(date.getUTCMonth() + 1).padStart(2, '0');
+                const year = String(date.getUTCFullYear()).slice(-2);
+                return `${day}/${month}/${year}`;
+            } catch (e) {
+                return "N/D";
+            }
+        }
+
+        // *** FUNÇÃO PRINCIPAL: Aplicar Filtros e Redesenhar ***
+        function applyFiltersAndRedraw() {
+            try {
+                console.log('=== APLICANDO FILTROS E REDESENHANDO ===');
+
+                // 1. LER SETOR SELECIONADO
+                const selSetor = document.getElementById('filter-setor-gantt').value;
+
+                // 2. LER OUTROS FILTROS
+                const selEmpArray = vsEmpreendimentoSetor ? vsEmpreendimentoSetor.getValue() || [] : ["Todos"];
+
+                // *** ATUALIZADO: Obter etapas, grupos e macroetapas selecionados do Virtual Select ***
+                let etapasSelecionadas = vsEtapa ? vsEtapa.getValue() : [];
+                let gruposSelecionados = vsGrupo ? vsGrupo.getValue() : [];
+                let macroetapasSelecionadas = vsMacroetapas ? vsMacroetapas.getValue() : [];
+
+                console.log('=== DEBUG FILTROS ===');
+                console.log('Setor atual:', currentSector);
+                console.log('Etapas selecionadas:', etapasSelecionadas.length, etapasSelecionadas);
+                console.log('Grupos selecionados:', gruposSelecionados.length, gruposSelecionados);
+                console.log('Macroetapas selecionadas:', macroetapasSelecionadas.length, macroetapasSelecionadas);
+                console.log('Macroetapas disponíveis no setor:', macroetapasPorSetor[currentSector]);
+                console.log('==================');
+
+                const selConcluidas = document.getElementById('filter-concluidas-gantt').checked;
+                const selVis = document.querySelector('input[name="filter-vis-gantt"]:checked').value;
+
+                console.log('Setor:', selSetor);
+                console.log('Empreendimento:', selEmpArray);
+                console.log('Visualização:', selVis);
+                console.log('Mostrar apenas não concluídas:', selConcluidas);
+                console.log('Etapas selecionadas:', etapasSelecionadas.length);
+
+                // 3. ATUALIZAR DADOS BASE SE SETOR MUDOU
+                if (selSetor !== currentSector) {
+                    currentSector = selSetor;
+                    allTasks_baseData = JSON.parse(JSON.stringify(allDataBySector[currentSector] || []));
+                    console.log(`✅ Mudando para setor: ${currentSector}. Tasks carregadas: ${allTasks_baseData.length}`);
+                    updateProjectTitle(currentSector);
+
+                    // *** NOVO: Atualizar filtros de etapas, grupos E macroetapas para o novo setor ***
+                    renderStageCheckboxes(currentSector);
+                    renderGroupCheckboxes(currentSector);
+                    renderMacroetapasCheckboxes(currentSector);
+                    initUGBFilter(); // NOVO: Inicializar filtro de UGB
+
+                    // Como os checkboxes foram recriados (e todos vêm checked por padrão na função render),
+                    // atualizamos TODAS as listas de selecionadas para incluir as novas opções.
+                    const novasEtapas = etapasBySector[currentSector] || [];
+                    etapasSelecionadas = novasEtapas.map(e => e.nome);
+
+                    const novosGrupos = gruposPorSetor[currentSector] || [];
+                    gruposSelecionados = novosGrupos;
+
+                    const novasMacroetapas = macroetapasPorSetor[currentSector] || [];
+                    macroetapasSelecionadas = novasMacroetapas;
+
+                    console.log('🔄 Filtros atualizados para o setor:', currentSector);
+                    console.log('  - Etapas:', etapasSelecionadas.length);
+                    console.log('  - Grupos:', gruposSelecionados.length);
+                    console.log('  - Macroetapas:', macroetapasSelecionadas.length);
+                }
+
+                // 4. COMEÇAR COM DADOS BASE DO SETOR ATUAL
+                let baseTasks = JSON.parse(JSON.stringify(allTasks_baseData));
+
+                // 5. APLICAR FILTROS SECUNDÁRIOS
+                let filteredTasks = baseTasks;
+
+                // Filtro de empreendimento (multiseleção)
+                if (selEmpArray.length > 0 && !selEmpArray.includes('Todos')) {
+                    filteredTasks = filteredTasks.filter(t => selEmpArray.includes(t.empreendimento));
+                }
+
+                // *** MODIFICADO: Filtro de grupos usando mapeamento ***
+                // Só aplicar se NÃO todos os grupos disponíveis estão selecionados
+                const gruposDisponiveis = gruposPorSetor[currentSector] || [];
+                const todosGruposSelecionados = gruposSelecionados.length === gruposDisponiveis.length && gruposDisponiveis.length > 0;
+
+                if (gruposSelecionados.length > 0 && !todosGruposSelecionados) {
+                    const countAntes = filteredTasks.length;
+                    filteredTasks = filteredTasks.filter(task => {
+                        // Verificar se a etapa da task pertence a algum dos grupos selecionados
+                        // Normalizar nome da etapa (remover pontos finais)
+                        const etapaNormalizada = task.etapa.trim().replace(/\.+$/, '');
+
+                        for (const grupoSelecionado of gruposSelecionados) {
+                            const etapasDoGrupo = mapeamentoGrupos[grupoSelecionado] || [];
+                            // Normalizar etapas do grupo também
+                            const etapasNormalizadas = etapasDoGrupo.map(e => e.trim().replace(/\.+$/, ''));
+                            if (etapasNormalizadas.includes(etapaNormalizada)) {
+                                return true; // Task pertence a um grupo selecionado
+                            }
+                        }
+                        return false; // Task não pertence a nenhum grupo selecionado
+                    });
+                    console.log(`📉 Filtro Grupos: ${countAntes} -> ${filteredTasks.length}`);
+                } else if (todosGruposSelecionados) {
+                    console.log('⏭️ Filtro Grupos ignorado: todos os grupos disponíveis selecionados');
+                }
+
+
+                // *** NOVO: Filtro de macroetapas ***
+                // Só aplicar se o setor TEM macroetapas disponíveis E não todas estão selecionadas
+                const macroetapasDisponiveis = macroetapasPorSetor[currentSector] || [];
+                const todasMacroetapasSelecionadas = macroetapasSelecionadas.length === macroetapasDisponiveis.length && macroetapasDisponiveis.length > 0;
+
+                // Se o setor NÃO tem macroetapas (length === 0), pular este filtro completamente
+                if (macroetapasDisponiveis.length > 0 && macroetapasSelecionadas.length > 0 && !todasMacroetapasSelecionadas) {
+                    const countAntes = filteredTasks.length;
+                    filteredTasks = filteredTasks.filter(task => {
+                        // Verificar se a etapa da task começa com alguma das macroetapas selecionadas
+                        for (const macro of macroetapasSelecionadas) {
+                            if (task.etapa.startsWith(macro)) {
+                                return true; // Task começa com uma macroetapa selecionada
+                            }
+                        }
+                        return false; // Task não começa com nenhuma macroetapa selecionada
+                    });
+                    console.log(`📉 Filtro Macroetapas: ${countAntes} -> ${filteredTasks.length}`);
+                } else if (macroetapasDisponiveis.length === 0) {
+                    console.log('⏭️ Filtro Macroetapas ignorado: setor sem macroetapas');
+                }
+
+
+                // Filtro de etapas (melhorado - comparação exata)
+                if (etapasSelecionadas.length > 0) {
+                    const countAntes = filteredTasks.length;
+                    filteredTasks = filteredTasks.filter(task => {
+                        // Comparar diretamente a etapa da task com as selecionadas
+                        const match = etapasSelecionadas.includes(task.etapa);
+                        if (!match) {
+                            // Debug para entender o que está sendo filtrado
+                            if (Math.random() < 0.001) {
+                                console.log(`❌ Rejeitado: Task="${task.etapa}" vs Filtro=[${etapasSelecionadas.slice(0,3)}...]`);
+                            }
+                        }
+                        return match;
+                    });
+                    console.log(`📉 Filtro Etapas: ${countAntes} -> ${filteredTasks.length}`);
+                }
+
+                // Filtro de concluídas
+                if (selConcluidas) {
+                    filteredTasks = filteredTasks.filter(t => t.progress < 100);
+                }
+
+                console.log(`📊 Tasks após filtros: ${filteredTasks.length} de ${baseTasks.length}`);
+
+                // 6. REAPLICAR BASELINES SELECIONADAS
+                filteredTasks.forEach(task => {
+                    const emp = task.empreendimento;
+                    const dropdown = document.querySelector(`select[data-emp="${emp}"]`);
+
+                    if (dropdown && dropdown.value !== "P0-(padrão)") {
+                        const baselineName = dropdown.value;
+
+                        if (task.baselines && task.baselines[baselineName]) {
+                            const baselineData = task.baselines[baselineName];
+
+                            if (baselineData.start && baselineData.end) {
+                                task.start_previsto = baselineData.start;
+                                task.end_previsto = baselineData.end;
+                                task.inicio_previsto = formatDateDisplay(baselineData.start);
+                                task.termino_previsto = formatDateDisplay(baselineData.end);
+                                console.log(`🔄 Baseline ${baselineName} reaplicada para ${emp}`);
+                            }
+                        }
+                    }
+                });
+
+                // 7. ATUALIZAR VARIÁVEIS GLOBAIS
+                currentTasks = filteredTasks;
+                savedVisualizationType = selVis;
+
+                // 8. REDESENHAR GRÁFICO
+                renderGantt();
+
+                // 9. FECHAR MENU DE FILTROS
+                document.getElementById('filter-menu-gantt').classList.remove('is-open');
+
+                console.log('✅ Filtros aplicados e gráfico redesenhado');
+
+            } catch (error) {
+                console.error('❌ Erro ao aplicar filtros:', error);
+                alert('Erro ao aplicar filtros. Verifique o console para detalhes.');
+            }
+        }
+
+        // Event listener para dropdown de setor (atualiza filtros, mas não renderiza)
+        document.getElementById('filter-setor-gantt').addEventListener('change', function() {
+            const novoSetor = this.value;
+            console.log(`🔄 Setor alterado para: ${novoSetor} (filtros serão atualizados)`);
+
+            // Atualizar título do projeto
+            updateProjectTitle(novoSetor);
+
+            // Atualizar filtros de Etapas (CORRIGIDO: nome correto da função)
+            renderStageCheckboxes(novoSetor);
+
+            // Atualizar filtros de Grupos (CORRIGIDO: nome correto da função)
+            renderGroupCheckboxes(novoSetor);
+
+            // Atualizar filtros de Macroetapas
+            renderMacroetapasCheckboxes(novoSetor);
+
+            console.log(`✅ Filtros atualizados. Clique em "Aplicar Filtros" para visualizar.`);
+
+            // NÃO chamar applyFiltersAndRedraw() - deixar para o botão
+        });
+
+        // Event listener APENAS para botão "Aplicar Filtros"
+        document.getElementById('filter-apply-btn-gantt')?.addEventListener('click', applyFiltersAndRedraw);
+
+        // *** REMOVIDO: Event listeners de checkboxes - agora usa Virtual Select ***
+
+
+        // Função para aplicar baseline em um empreendimento
+        function applyBaselineForEmp(emp, baselineName) {
+            console.log('=== APLICANDO BASELINE ===');
+            console.log('Empreendimento:', emp);
+            console.log('Baseline:', baselineName);
+            console.log('Total de tasks antes:', currentTasks.length);
+
+            let tasksAtualizadas = 0;
+            currentTasks.forEach(task => {
+                if (task.empreendimento === emp) {
+                    console.log('Task encontrada:', task.name, 'Baselines:', task.baselines);
+                    if (task.baselines && task.baselines[baselineName]) {
+                        const baselineData = task.baselines[baselineName];
+                        if (baselineData.start && baselineData.end) {
+                            task.start_previsto = baselineData.start;
+                            task.end_previsto = baselineData.end;
+                            task.inicio_previsto = formatDateDisplay(task.start_previsto);
+                            task.termino_previsto = formatDateDisplay(task.end_previsto);
+                            tasksAtualizadas++;
+                            console.log('Baseline aplicada:', task.name, 'Novo início:', task.inicio_previsto);
+                        }
+                    }
+                }
+            });
+
+            console.log('Tasks atualizadas:', tasksAtualizadas);
+            console.log('Re-renderizando gráfico...');
+            renderGantt();
+        }
+
+        // Função para aplicação rápida (aplica imediatamente ao marcar checkbox)
+        function handleQuickApply(mode) {
+            const emps = [...new Set(currentTasks.map(t => t.empreendimento))];
+
+            emps.forEach(emp => {
+                const empTasks = currentTasks.filter(t => t.empreendimento === emp);
+                if (empTasks.length === 0) return;
+
+                let targetBaseline = "P0-(padrão)";
+
+                if (mode === 'latest') {
+                    const baselines = empTasks[0].baselines || {};
+                    const baselineNames = Object.keys(baselines).filter(b => b !== "P0-(padrão)");
+                    if (baselineNames.length > 0) {
+                        targetBaseline = baselineNames[baselineNames.length - 1];
+                    }
+                }
+
+                applyBaselineForEmp(emp, targetBaseline);
+
+                const dropdown = document.querySelector(`.baseline-dropdown-emp[data-emp="${emp}"]`);
+                if (dropdown) dropdown.value = targetBaseline;
+            });
+
+            // Desmarcar o outro checkbox
+            if (mode === 'p0') {
+                const checkLatest = document.getElementById('apply-latest-all-gantt');
+                if (checkLatest) checkLatest.checked = false;
+            } else {
+                const checkP0 = document.getElementById('apply-p0-all-gantt');
+                if (checkP0) checkP0.checked = false;
+            }
+        }
+
+        // Funções auxiliares
+        function formatDateDisplay(dateStr) {
+            if (!dateStr) return "N/D";
+            const d = new Date(dateStr);
+            return `${String(d.getDate()).padStart(2,'0')}/${String(d.getMonth()+1).padStart(2,'0')}/${String(d.getFullYear()).slice(-2)}`;
+        }
+
+        function parseDate(dateStr) {
+            if (!dateStr || dateStr === "N/D") return null;
+            return new Date(dateStr);
+        }
+
+        // Cores por setor
+        const coresPorSetor = {
+            "PROSPECÇÃO": {"previsto": "#FEEFC4", "real": "#AE8141"},
+            "LEGALIZAÇÃO": {"previsto": "#fadbfe", "real": "#BF08D3"},
+            "PULMÃO": {"previsto": "#E9E8E8", "real": "#535252"},
+            "ENGENHARIA": {"previsto": "#fbe3cf", "real": "#be5900"},
+            "INFRA": {"previsto": "#daebfb", "real": "#125287"},
+            "PRODUÇÃO": {"previsto": "#E1DFDF", "real": "#252424"},
+            "ARQUITETURA & URBANISMO": {"previsto": "#D4D3F9", "real": "#453ECC"},
+            "VENDA": {"previsto": "#dffde1", "real": "#096710"},
+            "Não especificado": {"previsto": "#ffffff", "real": "#FFFFFF"}
+        };
+
+        // Dados do projeto
+        const dataInicio = new Date(A.data_min);
+        const dataFim = new Date(A.data_max);
+        const totalMeses = A.total_meses;
+        const larguraMes = 30;
+
+        // Linhas da sidebar e do gráfico: roladas juntas, montadas só na janela visível
+        // (ver rolagemVirtual em index.html)
+        const rolagem = GanttMacrofluxo.rolagemVirtual([
+            document.getElementById('gantt-sidebar-content-gantt'),
+            document.getElementById('gantt-chart-content-gantt'),
+        ], { alturaLinha: 30 });
+
+        // Renderizar Gantt completo
+        function renderGantt() {
+            const sidebarContent = document.getElementById('gantt-sidebar-content-gantt');
+            const chartContainer = document.getElementById('chart-container-gantt');
+
+            sidebarContent.innerHTML = '';
+            chartContainer.innerHTML = '';
+
+            // --- ORDENAÇÃO DINÂMICA: Por data de início (prevista ou real) ---
+            // Usar o tipo de visualização SALVO
+            const visualizacaoReal = savedVisualizationType === 'Real';
+
+            // Ordenar tasks do mais antigo para o mais novo
+            currentTasks.sort((a, b) => {
+                let dateA, dateB;
+
+                if (visualizacaoReal) {
+                    // Se visualização for "Real", ordenar por data real
+                    dateA = a.start_real ? new Date(a.start_real) : new Date('9999-12-31');
+                    dateB = b.start_real ? new Date(b.start_real) : new Date('9999-12-31');
+                } else {
+                    // Caso contrário, ordenar por data prevista
+                    dateA = a.start_previsto ? new Date(a.start_previsto) : new Date('9999-12-31');
+                    dateB = b.start_previsto ? new Date(b.start_previsto) : new Date('9999-12-31');
+                }
+
+                return dateA - dateB;
+            });
+
+            // --- 1. Renderizar Sidebar ---
+            const sidebarRows = document.createElement('div');
+            sidebarContent.appendChild(sidebarRows);
+            rolagem.camada('sidebar', sidebarRows, currentTasks.length, i => criarLinhaSidebar(currentTasks[i]));
+
+            // --- 2. Renderizar Header do Gráfico (Anos e Meses) ---
+            renderHeader(chartContainer);
+
+            // --- 3. Renderizar Body do Gráfico (Barras) ---
+            const body = document.createElement('div');
+            body.className = 'chart-body';
+            body.style.minWidth = `${totalMeses * larguraMes}px`;
+
+            // Divisores e linha do hoje ficam no body; as linhas, num contêiner próprio
+            const chartRows = document.createElement('div');
+            body.appendChild(chartRows);
+            chartContainer.appendChild(body);
+            rolagem.camada('grafico', chartRows, currentTasks.length, i => criarLinhaGrafico(currentTasks[i]));
+
+            // --- 4. Adicionar Divisores de Mês ---
+            for (let m = 0; m < totalMeses; m++) {
+                const date = new Date(dataInicio);
+                date.setMonth(dataInicio.getMonth() + m);
+
+                const divider = document.createElement('div');
+                divider.className = date.getDate() === 1 ? 'month-divider first' : 'month-divider';
+                divider.style.left = `${m * larguraMes}px`;
+                body.appendChild(divider);
+            }
+
+            // --- 5. Adicionar Linha do Hoje ---
+            const hoje = new Date();
+            const diffHoje = (hoje - dataInicio) / (1000 * 60 * 60 * 24);
+            const leftHoje = (diffHoje / 30.4375) * larguraMes;
+
+            if (leftHoje >= 0 && leftHoje <= totalMeses * larguraMes) {
+                const todayLine = document.createElement('div');
+                todayLine.className = 'today-line';
+                todayLine.style.left = `${leftHoje}px`;
+                body.appendChild(todayLine);
+            }
+        }
+
+        function criarLinhaSidebar(task) {
+            const row = document.createElement('div');
+            row.className = 'sidebar-row';
+            row.innerHTML = `
+                <div class="sidebar-cell task-name-cell" title="${task.name}">${task.name}</div>
+                <div class="sidebar-cell">${task.ugb}</div>
+                <div class="sidebar-cell">${task.inicio_previsto}</div>
+                <div class="sidebar-cell">${task.termino_previsto}</div>
+                <div class="sidebar-cell">${task.duracao_prev_meses}</div>
+                <div class="sidebar-cell">${task.inicio_real}</div>
+                <div class="sidebar-cell">${task.termino_real}</div>
+                <div class="sidebar-cell">${task.duracao_real_meses}</div>
+                <div class="sidebar-cell ${task.status_color_class}">${task.progress}%</div>
+                <div class="sidebar-cell">${task.vt_text}</div>
+                <div class="sidebar-cell">${task.vd_text}</div>
+            `;
+            return row;
+        }
+
+        function renderHeader(chartContainer) {
+            const header = document.createElement('div');
+            header.className = 'chart-header';
+
+            // Header de anos
+            const yearHeader = document.createElement('div');
+            yearHeader.className = 'year-header';
+
+            let currentYear = dataInicio.getFullYear();
+            let currentYearStart = 0;
+            let currentYearWidth = 0;
+
+            for (let m = 0; m < totalMeses; m++) {
+                const date = new Date(dataInicio);
+                date.setMonth(dataInicio.getMonth() + m);
+                const year = date.getFullYear();
+
+                if (year !== currentYear) {
+                    const yearSection = document.createElement('div');
+                    yearSection.className = 'year-section';
+                    yearSection.style.width = `${currentYearWidth}px`;
+                    yearSection.textContent = currentYear;
+                    yearHeader.appendChild(yearSection);
+
+                    currentYear = year;
+                    currentYearStart = m * larguraMes;
+                    currentYearWidth = larguraMes;
+                } else {
+                    currentYearWidth += larguraMes;
+                }
+            }
+
+            // Adicionar último ano
+            const lastYearSection = document.createElement('div');
+            lastYearSection.className = 'year-section';
+            lastYearSection.style.width = `${currentYearWidth}px`;
+            lastYearSection.textContent = currentYear;
+            yearHeader.appendChild(lastYearSection);
+
+            header.appendChild(yearHeader);
+
+            // Header de meses
+            const monthHeader = document.createElement('div');
+            monthHeader.className = 'month-header';
+
+            for (let m = 0; m < totalMeses; m++) {
+                // CORREÇÃO: Criar data corretamente usando UTC para evitar problemas de timezone
+                const year = dataInicio.getFullYear();
+                const month = dataInicio.getMonth();
+                const date = new Date(year, month + m, 1);
+
+                const monthCell = document.createElement('div');
+                monthCell.className = 'month-cell';
+                // Usar número do mês com 2 dígitos (01, 02, 03...) igual aos outros gráficos
+                const monthNumber = String(date.getMonth() + 1).padStart(2, '0');
+                monthCell.textContent = monthNumber;
+                monthHeader.appendChild(monthCell);
+            }
+
+            header.appendChild(monthHeader);
+            chartContainer.appendChild(header);
+        }
+
+        function criarLinhaGrafico(task) {
+            const row = document.createElement('div');
+            row.className = 'gantt-row';
+
+            // Obter cores do setor
+            const cores = coresPorSetor[task.setor] || coresPorSetor["Não especificado"];
+
+            // Usar o tipo de visualização SALVO (não ler diretamente dos radio buttons)
+            // Isso garante que o filtro só seja aplicado ao clicar em "Aplicar Filtros"
+            const tipoVisualizacao = savedVisualizationType;
+
+            let barPrevisto = null;
+            let barReal = null;
+
+            // DEBUG: Verificar dados de previsto para PULMÃO
+            if (task.setor === 'PULMÃO') {
+                console.log('DEBUG JS [' + task.setor + '] ' + task.name + ': start_previsto=' + task.start_previsto + ', end_previsto=' + task.end_previsto + ', tipoVis=' + tipoVisualizacao);
+            }
+
+            // Barra Prevista (só criar se visualização for "Previsto" ou "Ambos")
+            if ((tipoVisualizacao === 'Previsto' || tipoVisualizacao === 'Ambos') && task.start_previsto && task.end_previsto) {
+                const startDate = new Date(task.start_previsto);
+                const endDate = new Date(task.end_previsto);
+
+                const diffStart = (startDate - dataInicio) / (1000 * 60 * 60 * 24);
+                const diffEnd = (endDate - dataInicio) / (1000 * 60 * 60 * 24);
+
+                const left = (diffStart / 30.4375) * larguraMes;
+                let width = ((diffEnd - diffStart) / 30.4375) * larguraMes;
+
+                // Se início e fim são o mesmo dia (width = 0), definir largura mínima
+                if (width === 0) {
+                    width = larguraMes / 30.4375; // Largura de 1 dia
+                }
+
+                if (width > 0) {
+                    barPrevisto = document.createElement('div');
+                    barPrevisto.className = 'gantt-bar previsto';
+                    barPrevisto.style.left = `${left}px`;
+                    barPrevisto.style.width = `${width}px`;
+                    barPrevisto.style.backgroundColor = cores.previsto;
+
+                    const label = document.createElement('div');
+                    label.className = 'bar-label';
+                    label.textContent = task.empreendimento || task.name;
+                    barPrevisto.appendChild(label);
+
+                    // Tooltip
+                    barPrevisto.addEventListener('mouseenter', (e) => {
+                        showTooltip(e, task, 'previsto');
+                    });
+                    barPrevisto.addEventListener('mouseleave', hideTooltip);
+
+                    row.appendChild(barPrevisto);
+                }
+            }
+
+            // Barra Real (só criar se visualização for "Real" ou "Ambos")
+            if ((tipoVisualizacao === 'Real' || tipoVisualizacao === 'Ambos') && task.start_real && task.end_real) {
+                const startDate = new Date(task.start_real);
+                const endDate = new Date(task.end_real);
+
+                const diffStart = (startDate - dataInicio) / (1000 * 60 * 60 * 24);
+                const diffEnd = (endDate - dataInicio) / (1000 * 60 * 60 * 24);
+
+                const left = (diffStart / 30.4375) * larguraMes;
+                let width = ((diffEnd - diffStart) / 30.4375) * larguraMes;
+
+                // Se início e fim são o mesmo dia (width = 0), definir largura mínima
+                if (width === 0) {
+                    width = larguraMes / 30.4375; // Largura de 1 dia
+                }
+
+                if (width > 0) {
+                    barReal = document.createElement('div');
+                    barReal.className = 'gantt-bar real';
+                    barReal.style.left = `${left}px`;
+                    barReal.style.width = `${width}px`;
+                    barReal.style.backgroundColor = cores.real;
+
+                    const label = document.createElement('div');
+                    label.className = 'bar-label';
+                    label.textContent = `${task.empreendimento} - ${task.etapa} (${task.progress}%)`;
+                    barReal.appendChild(label);
+
+                    // Tooltip
+                    barReal.addEventListener('mouseenter', (e) => {
+                        showTooltip(e, task, 'real');
+                    });
+                    barReal.addEventListener('mouseleave', hideTooltip);
+
+                    row.appendChild(barReal);
+                }
+            }
+
+            // --- SOBREPOSIÇÃO: Ajustar z-index se real engloba previsto ---
+            if (barPrevisto && barReal) {
+                const s_prev = new Date(task.start_previsto);
+                const e_prev = new Date(task.end_previsto);
+                const s_real = new Date(task.start_real);
+                const e_real = new Date(task.end_real);
+
+                if (s_prev && e_prev && s_real && e_real && s_real <= s_prev && e_real >= e_prev) {
+                    barPrevisto.style.zIndex = '8';
+                    barReal.style.zIndex = '7';
+                }
+
+                // Renderizar barra de overlap hachurada
+                const overlap_start = new Date(Math.max(s_prev, s_real));
+                const overlap_end = new Date(Math.min(e_prev, e_real));
+
+                if (overlap_start < overlap_end) {
+                    const diffStart = (overlap_start - dataInicio) / (1000 * 60 * 60 * 24);
+                    const diffEnd = (overlap_end - dataInicio) / (1000 * 60 * 60 * 24);
+
+                    const left = (diffStart / 30.4375) * larguraMes;
+                    const width = ((diffEnd - diffStart) / 30.4375) * larguraMes;
+
+                    if (width > 0) {
+                        const overlapBar = document.createElement('div');
+                        overlapBar.className = 'gantt-bar-overlap';
+                        overlapBar.style.left = `${left}px`;
+                        overlapBar.style.width = `${width}px`;
+                        row.appendChild(overlapBar);
+                    }
+                }
+            }
+
+            return row;
+        }
+
+        // Funções de Tooltip
+        function showTooltip(event, task, tipo) {
+            const tooltip = document.getElementById('tooltip');
+
+            let content = `
+                <strong>${task.name}</strong><br>
+                <strong>Setor:</strong> ${task.setor}<br>
+                <strong>UGB:</strong> ${task.ugb}<br>
+            `;
+
+            if (tipo === 'previsto') {
+                content += `
+                    <strong>Previsto:</strong><br>
+                    Início: ${task.inicio_previsto}<br>
+                    Término: ${task.termino_previsto}<br>
+                    Duração: ${task.duracao_prev_meses} meses
+                `;
+            } else {
+                content += `
+                    <strong>Real:</strong><br>
+                    Início: ${task.inicio_real}<br>
+                    Término: ${task.termino_real}<br>
+                    Duração: ${task.duracao_real_meses} meses<br>
+                    Progresso: ${task.progress}%<br>
+                    VT: ${task.vt_text} | VD: ${task.vd_text}
+                `;
+            }
+
+            tooltip.innerHTML = content;
+            tooltip.classList.add('show');
+
+            // Posicionar tooltip (relativo ao container para funcionar em fullscreen)
+            const container = document.getElementById('gantt-container-gantt');
+            const rect = container.getBoundingClientRect();
+            const x = event.clientX - rect.left + 10;
+            const y = event.clientY - rect.top + 10;
+            tooltip.style.left = `${x}px`;
+            tooltip.style.top = `${y}px`;
+        }
+
+        function hideTooltip() {
+            const tooltip = document.getElementById('tooltip');
+            tooltip.classList.remove('show');
+        }
+
+        // Event listeners
+        document.getElementById('filter-btn-gantt').addEventListener('click', () => {
+            document.getElementById('filter-menu-gantt').classList.toggle('is-open');
+            document.getElementById('baseline-selector-gantt').classList.remove('is-open');
+        });
+
+        document.getElementById('baseline-btn-gantt').addEventListener('click', () => {
+            document.getElementById('baseline-selector-gantt').classList.toggle('is-open');
+            document.getElementById('filter-menu-gantt').classList.remove('is-open');
+        });
+
+        document.getElementById('toggle-sidebar-btn-gantt').addEventListener('click', () => {
+            document.getElementById('gantt-sidebar-wrapper-gantt').classList.toggle('collapsed');
+        });
+
+        document.getElementById('fullscreen-btn-gantt').addEventListener('click', () => {
+            const container = document.getElementById('gantt-container-gantt');
+            if (!document.fullscreenElement) {
+                container.requestFullscreen();
+            } else {
+                document.exitFullscreen();
+            }
+        });
+
+        // Event listeners para radio buttons de visualização (para reordenar ao mudar)
+        document.querySelectorAll('input[name="filter-vis-gantt"]').forEach(radio => {
+            radio.addEventListener('change', () => {
+                renderGantt(); // Re-renderizar com nova ordenação
+            });
+        });
+
+        // --- DRAG TO SCROLL: Arrastar com mouse para navegar (2D - Diagonal) ---
+        const chartContent = document.getElementById('gantt-chart-content-gantt');
+        let isDragging = false;
+        let startX;
+        let startY;
+        let scrollLeft;
+        let scrollTop;
+
+        chartContent.addEventListener('mousedown', (e) => {
+            isDragging = true;
+            chartContent.classList.add('active');
+            startX = e.pageX - chartContent.offsetLeft;
+            startY = e.pageY - chartContent.offsetTop;
+            scrollLeft = chartContent.scrollLeft;
+            scrollTop = chartContent.scrollTop;
+            chartContent.style.cursor = 'grabbing';
+        });
+
+        chartContent.addEventListener('mouseleave', () => {
+            isDragging = false;
+            chartContent.classList.remove('active');
+            chartContent.style.cursor = 'grab';
+        });
+
+        chartContent.addEventListener('mouseup', () => {
+            isDragging = false;
+            chartContent.classList.remove('active');
+            chartContent.style.cursor = 'grab';
+        });
+
+        chartContent.addEventListener('mousemove', (e) => {
+            if (!isDragging) return;
+            e.preventDefault();
+
+            // Movimento horizontal
+            const x = e.pageX - chartContent.offsetLeft;
+            const walkX = (x - startX) * 2; // Multiplicador para velocidade horizontal
+            chartContent.scrollLeft = scrollLeft - walkX;
+
+            // Movimento vertical
+            const y = e.pageY - chartContent.offsetTop;
+            const walkY = (y - startY) * 2; // Multiplicador para velocidade vertical
+            chartContent.scrollTop = scrollTop - walkY;
+            // A sidebar acompanha pela rolagem virtual
+        });
+
+        // --- REDIMENSIONAMENTO DO SELETOR DE BASELINE ---
+        const baselineSelector = document.getElementById('baseline-selector-gantt');
+        const resizeCorner = baselineSelector ? baselineSelector.querySelector('.baseline-resize-corner') : null;
+
+        if (resizeCorner) {
+            let isResizing = false;
+            let startX, startY, startWidth, startHeight, startRight;
+
+            resizeCorner.addEventListener('mousedown', (e) => {
+                isResizing = true;
+                startX = e.clientX;
+                startY = e.clientY;
+                startWidth = parseInt(document.defaultView.getComputedStyle(baselineSelector).width, 10);
+                startHeight = parseInt(document.defaultView.getComputedStyle(baselineSelector).height, 10);
+                startRight = parseInt(document.defaultView.getComputedStyle(baselineSelector).right, 10);
+
+                e.preventDefault();
+                e.stopPropagation();
+            });
+
+            document.addEventListener('mousemove', (e) => {
+                if (!isResizing) return;
+
+                // Calcular movimento
+                const deltaX = e.clientX - startX;
+                const deltaY = e.clientY - startY;
+
+                // Canto na ESQUERDA: arrastar para ESQUERDA (deltaX negativo) aumenta largura
+                const newWidth = startWidth - deltaX;  // Inverte deltaX
+                const newHeight = startHeight + deltaY;
+
+                // Aplicar largura com limites
+                if (newWidth >= 250 && newWidth <= 700) {
+                    baselineSelector.style.width = newWidth + 'px';
+                    // Não precisa ajustar right pois está ancorado na direita
+                }
+
+                // Aplicar altura com limites
+                if (newHeight >= 200 && newHeight <= 800) {
+                    baselineSelector.style.height = newHeight + 'px';
+
+                    // Ajustar altura da tabela interna para preencher o espaço
+                    const table = baselineSelector.querySelector('.baseline-selector-table');
+                    if (table) {
+                        // Altura disponível = altura total - padding - título - aplicação rápida - margens
+                        const availableHeight = newHeight - 150; // 150px para cabeçalho e padding
+                        table.style.maxHeight = Math.max(200, availableHeight) + 'px';
+                    }
+                }
+            });
+
+            document.addEventListener('mouseup', () => {
+                isResizing = false;
+            });
+        }
+
+        // Inicializar filtros de etapas, grupos e macroetapas para o setor atual
+        renderStageCheckboxes(initialSectorName);
+        renderGroupCheckboxes(initialSectorName);
+        renderMacroetapasCheckboxes(initialSectorName);
+        initUGBFilter();
+
+        // Renderizar inicial com filtros aplicados
+        // Pequeno delay para garantir que Virtual Selects estão completamente inicializados
+        setTimeout(() => {
+            applyFiltersAndRedraw();
+        }, 200);
+    },
+});
@@ -0,0 +1,268 @@
+"""
+Construção vetorizada das tasks do Gantt "Por Projeto".
+
+Substitui o laço com iterrows de converter_dados_para_gantt: VT, VD, durações,
+classe de status e todas as datas formatadas são calculadas de uma vez para o
+DataFrame agregado inteiro. A saída mantém o mesmo contrato (lista de projetos
+com lista de dicts de tasks) consumido pelo renderizador JavaScript.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from config_etapas import (
+    SUBETAPAS, ETAPA_PAI_POR_SUBETAPA, GRUPO_POR_ETAPA,
+    sigla_para_nome_completo, nome_completo_para_sigla, ORDEM_ETAPAS_NOME_COMPLETO,
+)
+from dias_uteis import dias_uteis
+
+COLUNAS_DATA = ["Inicio_Prevista", "Termino_Prevista", "Inicio_Real", "Termino_Real"]
+DIAS_POR_MES = 30.4375
+
+
+def _porcentagem_vetorizada(serie):
+    """Equivalente vetorizado de converter_porcentagem para colunas numéricas."""
+    valores = pd.to_numeric(serie, errors="coerce").fillna(0.0).astype(float)
+    return valores.where(valores > 1, valores * 100)
+
+
+def _formatar(serie):
+    """
+    Datas como 'YYYY-MM-DD' (None se nula) e 'dd/mm/yy' ('N/D' se nula).
+    np.datetime_as_string é bem mais rápido que Series.dt.strftime.
+    """
+    valido = serie.notna().to_numpy()
+    iso = np.datetime_as_string(serie.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]"))
+    datas_iso = [d if ok else None for d, ok in zip(iso.tolist(), valido)]
+    datas_br = [f"{d[8:10]}/{d[5:7]}/{d[2:4]}" if d else "N/D" for d in datas_iso]
+    return datas_iso, datas_br
+
+
+def _texto_variacao(valores):
+    return [f"{int(v):+d}d" if not np.isnan(v) else "-" for v in valores]
+
+
+def _texto_meses(valores):
+    return [f"{v:.1f}".replace('.', ',') if not np.isnan(v) else "-" for v in valores]
+
+
+def _datas_reais_das_subetapas(df):
+    """
+    Datas reais (mín/máx) e progresso médio das subetapas, por (Empreendimento, etapa pai).
+    """
+    siglas_sub = {
+        nome_completo_para_sigla.get(sub, sub): pai
+        for pai, subs in SUBETAPAS.items() for sub in subs
+    }
+    df_sub = df[df["Etapa"].isin(list(siglas_sub))]
+    if df_sub.empty:
+        return pd.DataFrame(columns=["Empreendimento", "_etapa_pai", "_inicio_sub", "_termino_sub",
+                                     "_progresso_sub", "_tem_subetapas"])
+
+    df_sub = df_sub.assign(
+        _etapa_pai=df_sub["Etapa"].map(siglas_sub),
+        _progresso=_porcentagem_vetorizada(df_sub["% concluído"]) if "% concluído" in df_sub.columns else np.nan,
+    )
+    return df_sub.groupby(["Empreendimento", "_etapa_pai"], sort=False, observed=True).agg(
+        _inicio_sub=("Inicio_Real", "min"),
+        _termino_sub=("Termino_Real", "max"),
+        _progresso_sub=("_progresso", "mean"),
+    ).reset_index().assign(_tem_subetapas=True)
+
+
+def _meta_assinatura_por_empreendimento(df):
+    """Primeira data disponível da etapa DEMANDA MÍNIMA (mesma regra de obter_data_meta_assinatura_novo)."""
+    df_meta = df[df["Etapa"] == "DEMANDA MÍNIMA"].drop_duplicates("Empreendimento")
+    meta = pd.Series(pd.NaT, index=df_meta["Empreendimento"], dtype="datetime64[ns]")
+    for col in ["Termino_Real", "Termino_Prevista", "Inicio_Real", "Inicio_Prevista"]:
+        if col in df_meta.columns:
+            valores = pd.Series(df_meta[col].to_numpy(), index=df_meta["Empreendimento"])
+            meta = valores.where(valores.notna(), meta)
+    return meta
+
+
+def construir_gantt_por_projeto(df, baseline_ativa=False, agora=None):
+    """
+    Converte o DataFrame agregado (uma linha por Empreendimento/Etapa) na lista de
+    projetos do Gantt, sem laço por linha.
+
+    Args:
+        df: DataFrame agregado com Empreendimento, Etapa (nome completo), as quatro
+            colunas de data, '% concluído', UGB e SETOR. Etapa_Ordem (ordem global
+            anexada em load_data) é usada quando presente.
+        baseline_ativa: se há uma baseline aplicada (subetapas mostram previstos).
+        agora: instante usado para datas padrão e barras em andamento (default: now).
+
+    Returns:
+        list[dict]: projetos no formato esperado pelo JavaScript. O campo
+        "baselines" de cada task vem vazio e é populado pelo chamador.
+    """
+    if df.empty:
+        return []
+
+    agora = agora or datetime.now()
+    agora_ts = pd.Timestamp(agora)
+    hoje = agora_ts.normalize()
+
+    df = df.copy()
+    # Chaves categóricas (df_data compacto) viram texto: o map de uma categórica
+    # devolve outra categórica, que ordena pelos códigos e não pelos valores
+    for col in ("Empreendimento", "Etapa", "UGB", "SETOR"):
+        if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+    for col in COLUNAS_DATA:
+        if col not in df.columns:
+            df[col] = pd.NaT
+        elif not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+    if "% concluído" not in df.columns:
+        df["% concluído"] = 0
+    if "SETOR" not in df.columns:
+        df["SETOR"] = "Não especificado"
+
+    empreendimentos = pd.unique(df["Empreendimento"])
+    ordem_emp = {emp: i for i, emp in enumerate(empreendimentos)}
+
+    # UGB: primeira não-nula do empreendimento
+    if "UGB" in df.columns:
+        ugb_por_emp = df.dropna(subset=["UGB"]).groupby("Empreendimento", sort=False, observed=True)["UGB"].first().astype(str)
+    else:
+        ugb_por_emp = pd.Series(dtype=object)
+    meta_por_emp = _meta_assinatura_por_empreendimento(df)
+    subetapas_agg = _datas_reais_das_subetapas(df)
+
+    # Ordenação: empreendimento (ordem de aparição) e etapa (ordem global; desconhecidas ao final)
+    if "Etapa_Ordem" in df.columns:
+        codigo_etapa = df["Etapa_Ordem"].to_numpy()
+        etapa = df["Etapa"].where(codigo_etapa < len(ORDEM_ETAPAS_NOME_COMPLETO))
+    else:
+        etapa_cat = pd.Categorical(df["Etapa"], categories=ORDEM_ETAPAS_NOME_COMPLETO, ordered=True)
+        codigo_etapa = np.where(etapa_cat.codes < 0, len(ORDEM_ETAPAS_NOME_COMPLETO), etapa_cat.codes)
+        etapa = etapa_cat.astype(object)
+    df = df.assign(
+        Etapa=etapa,
+        _ordem_emp=df["Empreendimento"].map(ordem_emp),
+        _ordem_etapa=codigo_etapa,
+    ).sort_values(["_ordem_emp", "_ordem_etapa"], kind="mergesort").reset_index(drop=True)
+    df["_posicao"] = df.groupby("_ordem_emp", sort=False).cumcount()
+
+    etapa_sigla = df["Etapa"]
+    etapa_nome = etapa_sigla.map(lambda e: sigla_para_nome_completo.get(e, e))
+
+    # --- Etapas pai herdam as datas reais e o progresso das subetapas ---
+    df = df.assign(_etapa_pai=etapa_nome).merge(subetapas_agg, how="left", on=["Empreendimento", "_etapa_pai"])
+    eh_pai = df["_tem_subetapas"].notna()
+    start_real = df["Inicio_Real"].where(~(eh_pai & df["_inicio_sub"].notna()), df["_inicio_sub"])
+    end_real_original = df["Termino_Real"].where(~(eh_pai & df["_termino_sub"].notna()), df["_termino_sub"])
+    progress = pd.to_numeric(df["% concluído"], errors="coerce").astype(float)
+    progress = progress.where(~eh_pai, df["_progresso_sub"])
+
+    start_date = df["Inicio_Prevista"].copy()
+    end_date = df["Termino_Prevista"].copy()
+
+    # --- Subetapas: sem barras previstas no modo padrão (P0) e fora se não tiverem dados ---
+    eh_subetapa = etapa_nome.isin(ETAPA_PAI_POR_SUBETAPA.keys())
+    if not baseline_ativa:
+        start_date = start_date.where(~eh_subetapa)
+        end_date = end_date.where(~eh_subetapa)
+    sem_dados = start_real.isna() & end_real_original.isna() & start_date.isna() & end_date.isna()
+    manter = ~(eh_subetapa & sem_dados)
+
+    # --- Datas padrão para etapas com apenas uma das datas previstas ---
+    alguma_prevista = ~eh_subetapa & (start_date.notna() | end_date.notna())
+    start_date = start_date.mask(alguma_prevista & start_date.isna(), agora_ts)
+    end_date = end_date.mask(alguma_prevista & end_date.isna(), start_date + timedelta(days=30))
+
+    end_real_visual = end_real_original.mask(
+        start_real.notna() & (progress < 100) & end_real_original.isna(), agora_ts
+    )
+
+    grupo = etapa_nome.map(GRUPO_POR_ETAPA)
+    grupo = grupo.fillna(etapa_sigla.map(GRUPO_POR_ETAPA)).fillna("Não especificado")
+
+    dur_prev_meses = ((end_date - start_date).dt.days / DIAS_POR_MES).to_numpy(dtype=float)
+    dur_real_meses = ((end_real_original - start_real).dt.days / DIAS_POR_MES).to_numpy(dtype=float)
+
+    vt = dias_uteis(end_date, end_real_original)
+    vd = dias_uteis(start_real, end_real_original) - dias_uteis(start_date, end_date)
+
+    concluido = progress == 100
+    status = np.select(
+        [
+            concluido & end_real_original.notna() & end_date.notna() & (end_real_original <= end_date),
+            concluido & end_real_original.notna() & end_date.notna(),
+            ~concluido & (progress < 100) & start_real.notna() & end_real_original.notna() & (end_real_original < hoje),
+        ],
+        ["status-green", "status-red", "status-yellow"],
+        default="status-default",
+    )
+
+    start_prev_iso, start_prev_br = _formatar(start_date)
+    end_prev_iso, end_prev_br = _formatar(end_date)
+    start_real_iso, start_real_br = _formatar(start_real)
+    end_real_iso, end_real_br = _formatar(end_real_original)
+    end_visual_iso, _ = _formatar(end_real_visual)
+
+    colunas = {
+        "posicao": df["_posicao"].tolist(),
+        "empreendimento": df["Empreendimento"].tolist(),
+        "name": etapa_nome.tolist(),
+        "start_previsto": start_prev_iso,
+        "end_previsto": end_prev_iso,
+        "start_real": start_real_iso,
+        "end_real": end_visual_iso,
+        "end_real_original_raw": end_real_iso,
+        "ugb": df["Empreendimento"].map(ugb_por_emp).fillna("N/D").tolist(),
+        "setor": df["SETOR"].tolist(),
+        "grupo": grupo.tolist(),
+        "progress": progress.fillna(0).astype(int).tolist(),
+        "inicio_previsto": start_prev_br,
+        "termino_previsto": end_prev_br,
+        "inicio_real": start_real_br,
+        "termino_real": end_real_br,
+        "duracao_prev_meses": _texto_meses(dur_prev_meses),
+        "duracao_real_meses": _texto_meses(dur_real_meses),
+        "vt_text": _texto_variacao(vt),
+        "vd_text": _texto_variacao(vd),
+        "status_color_class": status.tolist(),
+        "manter": manter.tolist(),
+    }
+
+    tasks_por_emp = {emp: [] for emp in empreendimentos}
+    for (posicao, emp, nome, sp, ep, sr, er, err, ugb, setor, grp, prog,
+         ip, tp, ir, tr, dpm, drm, vt_t, vd_t, st_cls, ok) in zip(*colunas.values()):
+        if not ok:
+            continue
+        tasks_por_emp[emp].append({
+            "id": f"t{posicao}", "name": nome, "numero_etapa": posicao + 1,
+            "start_previsto": sp,
+            "end_previsto": ep,
+            "start_real": sr,
+            "end_real": er,
+            "end_real_original_raw": err,
+            "ugb": ugb,
+            "setor": setor,
+            "grupo": grp,
+            "progress": prog,
+            "inicio_previsto": ip,
+            "termino_previsto": tp,
+            "inicio_real": ir,
+            "termino_real": tr,
+            "duracao_prev_meses": dpm,
+            "duracao_real_meses": drm,
+            "vt_text": vt_t,
+            "vd_text": vd_t,
+            "status_color_class": st_cls,
+            "baselines": {},
+        })
+
+    gantt_data = []
+    for emp in empreendimentos:
+        data_meta = meta_por_emp.get(emp, pd.NaT)
+        gantt_data.append({
+            "id": f"p{len(gantt_data)}", "name": emp,
+            "tasks": tasks_por_emp[emp],
+            "meta_assinatura_date": data_meta.strftime("%Y-%m-%d") if pd.notna(data_meta) else None,
+        })
+    return gantt_data
@@ -0,0 +1,186 @@
+"""
+Tabelão Horizontal em grade virtualizada (AG Grid, via streamlit-aggrid).
+
+Com todas as UGBs selecionadas o Tabelão passa de centenas de linhas por ~40
+etapas x 5 medidas; como Styler, cada célula viaja com o próprio texto e o
+próprio CSS e o navegador monta a tabela inteira. Aqui a grade recebe só os
+valores crus (datas ISO, variação em dias úteis) e um código de status por
+etapa (ver estilo_tabelao.status_por_linha); formatação e cores são aplicadas no
+navegador, e o AG Grid desenha apenas as linhas e colunas visíveis.
+
+Sem streamlit-aggrid instalado, GRADE_DISPONIVEL fica False e o app mantém o
+Styler (estilo_tabelao.matriz_estilos).
+"""
+import json
+
+import pandas as pd
+
+from config_etapas import nome_completo_para_sigla
+from estilo_tabelao import (
+    CORES_STATUS, COR_VAZIO, COR_VAR_ATRASO, COR_VAR_ADIANTAMENTO, FUNDO_LINHA_PAR, FUNDO_LINHA_IMPAR,
+    STATUS_SEM_COR, status_por_linha,
+)
+
+try:
+    from st_aggrid import AgGrid, GridUpdateMode, JsCode
+    GRADE_DISPONIVEL = True
+except ImportError:
+    GRADE_DISPONIVEL = False
+
+# Tipo de coluna do Tabelão (segundo nível do MultiIndex) -> sufixo do campo na grade
+SUFIXOS = {
+    "Início Prev.": "ip",
+    "Término Prev.": "tp",
+    "Início Real": "ir",
+    "Término Real": "tr",
+    "VarTerm": "vt",
+}
+SUFIXO_STATUS = "st"
+
+# --- Funções JavaScript (executadas no navegador) ----------------------------
+# O AG Grid reaproveita as células ao rolar: os estilos sempre zeram o que não usam.
+
+JS_FORMATO_DATA = """
+function(p) {
+    if (p.value == null) return '-';
+    return p.value.slice(8, 10) + '/' + p.value.slice(5, 7) + '/' + p.value.slice(0, 4);
+}
+"""
+
+JS_FORMATO_VARIACAO = """
+function(p) {
+    if (p.value == null) return '-';
+    return (p.value > 0 ? '▼' : '▲') + ' ' + Math.abs(p.value) + ' dias';
+}
+"""
+
+JS_ESTILO_DATA_PREVISTA = f"""
+function(p) {{
+    if (p.value == null) return {{color: '{COR_VAZIO}', fontStyle: 'italic'}};
+    return {{color: null, fontStyle: null}};
+}}
+"""
+
+# Datas reais: cor pelo código de status da etapa (campo eK_st da mesma linha)
+JS_ESTILO_DATA_REAL = f"""
+function(p) {{
+    if (p.value == null) return {{color: '{COR_VAZIO}', fontStyle: 'italic', fontWeight: null}};
+    var cor = {json.dumps(list(CORES_STATUS))}[p.data[p.colDef.field.slice(0, -2) + '{SUFIXO_STATUS}']];
+    return cor ? {{color: cor, fontStyle: null, fontWeight: 'bold'}} : {{color: null, fontStyle: null, fontWeight: null}};
+}}
+"""
+
+# Variação de término: ▲ atraso, ▼ adiantamento
+JS_ESTILO_VARIACAO = f"""
+function(p) {{
+    if (p.value == null) return {{color: '{COR_VAZIO}', fontStyle: 'italic', fontWeight: null}};
+    return {{color: p.value > 0 ? '{COR_VAR_ADIANTAMENTO}' : '{COR_VAR_ATRASO}', fontStyle: null, fontWeight: '600'}};
+}}
+"""
+
+JS_FUNDO_LINHA = f"""
+function(p) {{
+    return {{background: p.node.rowIndex % 2 === 0 ? '{FUNDO_LINHA_PAR}' : '{FUNDO_LINHA_IMPAR}'}};
+}}
+"""
+
+CSS_GRADE = {
+    ".ag-header-group-cell": {"background-color": "#6c6d6d !important", "color": "#ffffff !important",
+                              "font-weight": "bold !important", "font-size": "12px !important"},
+    ".ag-header-cell": {"background-color": "#f8f9fa !important", "font-size": "11px !important"},
+    ".ag-cell": {"font-size": "12px !important", "text-align": "center"},
+    ".inicio-etapa": {"border-left": "2px solid #ddd !important"},
+}
+
+
+def linhas_grade(df_final, df_agregado, hoje):
+    """
+    Converte o Tabelão pivotado (colunas MultiIndex (etapa, tipo), mais ('UGB', '')
+    e ('Empreendimento', '')) nas linhas da grade: datas como texto ISO, variação
+    como inteiro (nulos viram null no JSON) e o código de status de cada etapa.
+    Retorna (linhas, etapas), com etapas = [(nome_etapa, [(tipo, campo), ...])].
+    """
+    ugb = df_final[("UGB", "")].to_numpy()
+    empreendimento = df_final[("Empreendimento", "")].to_numpy()
+    status = status_por_linha(df_agregado, [ugb, empreendimento], hoje)
+
+    dados = {"ugb": ugb, "emp": empreendimento}
+    etapas = []
+    nomes_etapa = [nome for nome in dict.fromkeys(df_final.columns.get_level_values(0))
+                   if nome not in ("UGB", "Empreendimento")]
+    for k, nome in enumerate(nomes_etapa):
+        campos = []
+        for tipo in df_final[nome].columns:
+            campo = f"e{k}_{SUFIXOS[tipo]}"
+            serie = df_final[(nome, tipo)]
+            if tipo == "VarTerm":
+                dados[campo] = pd.to_numeric(serie).astype("Float64").round(0).astype("Int32")
+            else:
+                if not pd.api.types.is_datetime64_any_dtype(serie):
+                    serie = pd.to_datetime(serie)
+                dados[campo] = serie.dt.strftime("%Y-%m-%d")
+            campos.append((tipo, campo))
+        sigla = nome_completo_para_sigla.get(nome)
+        dados[f"e{k}_{SUFIXO_STATUS}"] = status[sigla].to_numpy() if sigla in status.columns else STATUS_SEM_COR
+        etapas.append((nome, campos))
+
+    return pd.DataFrame(dados, index=pd.RangeIndex(len(df_final))), etapas
+
+
+def opcoes_grade(etapas):
+    """gridOptions do AG Grid: um grupo de colunas por etapa, UGB e Empreendimento fixos à esquerda"""
+    estilos = {"Início Prev.": JS_ESTILO_DATA_PREVISTA, "Término Prev.": JS_ESTILO_DATA_PREVISTA,
+               "Início Real": JS_ESTILO_DATA_REAL, "Término Real": JS_ESTILO_DATA_REAL,
+               "VarTerm": JS_ESTILO_VARIACAO}
+    formato_data, formato_variacao = JsCode(JS_FORMATO_DATA), JsCode(JS_FORMATO_VARIACAO)
+
+    colunas = [
+        {"headerName": "UGB", "field": "ugb", "pinned": "left", "width": 90},
+        {"headerName": "Empreendimento", "field": "emp", "pinned": "left", "width": 200},
+    ]
+    for nome, campos in etapas:
+        colunas.append({
+            "headerName": nome,
+            "headerClass": "inicio-etapa",
+            "children": [
+                {
+                    "headerName": tipo,
+                    "field": campo,
+                    "width": 95 if tipo == "VarTerm" else 105,
+                    "valueFormatter": formato_variacao if tipo == "VarTerm" else formato_data,
+                    "cellStyle": JsCode(estilos[tipo]),
+                    **({"cellClass": "inicio-etapa", "headerClass": "inicio-etapa"} if i == 0 else {}),
+                }
+                for i, (tipo, campo) in enumerate(campos)
+            ],
+        })
+
+    return {
+        "columnDefs": colunas,
+        "defaultColDef": {"sortable": True, "resizable": True, "suppressMovable": True},
+        "getRowStyle": JsCode(JS_FUNDO_LINHA),
+        # Virtualização de linhas e colunas: só a janela visível (mais a margem) vai para o DOM
+        "rowBuffer": 10,
+        "suppressColumnVirtualisation": False,
+        "suppressRowVirtualisation": False,
+        "rowHeight": 32,
+        "headerHeight": 30,
+        "groupHeaderHeight": 32,
+    }
+
+
+def exibir_tabelao(df_final, df_agregado, hoje, key="tabelao_grade"):
+    """Desenha o Tabelão na grade virtualizada (requer GRADE_DISPONIVEL)"""
+    linhas, etapas = linhas_grade(df_final, df_agregado, hoje)
+    return AgGrid(
+        linhas,
+        gridOptions=opcoes_grade(etapas),
+        height=min(32 * len(linhas) + 80, 600),
+        update_mode=GridUpdateMode.NO_UPDATE,
+        allow_unsafe_jscode=True,
+        try_to_convert_back_to_original_types=False,
+        theme="streamlit",
+        custom_css=CSS_GRADE,
+        show_toolbar=False,
+        key=key,
+    )
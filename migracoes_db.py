@@ -0,0 +1,105 @@
+"""
+Migrações do esquema do banco de baselines.
+
+Cada migração tem um número de versão; as já aplicadas ficam registradas na
+tabela schema_version e não voltam a rodar. O app aplica as pendentes uma única
+vez por processo, na subida do servidor (ver inicializar_esquema_banco em
+app.py), de modo que o caminho de leitura dos dados nunca executa DDL.
+"""
+
+MIGRACOES = [
+    (1, "Tabela gantt_baselines", [
+        """
+        CREATE TABLE IF NOT EXISTS gantt_baselines (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            empreendimento VARCHAR(255) NOT NULL,
+            version_name VARCHAR(255) NOT NULL,
+            baseline_data JSON NOT NULL,
+            created_date VARCHAR(50) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            tipo_visualizacao VARCHAR(50) NOT NULL DEFAULT 'Gantt',
+            UNIQUE KEY unique_baseline (empreendimento, version_name)
+        )
+        """,
+    ]),
+    # Catálogo por empreendimento (invalidação após salvar/excluir) ordenado por data
+    (2, "Índice (empreendimento, created_at) em gantt_baselines", [
+        "CREATE INDEX idx_baselines_emp_created ON gantt_baselines (empreendimento, created_at)",
+    ]),
+]
+
+VERSAO_ATUAL = MIGRACOES[-1][0]
+
+# DDL no MySQL faz commit implícito: uma tentativa anterior interrompida (ou outro
+# processo, ou alguém à mão) pode ter criado o índice/coluna sem registrar a versão.
+# Esses erros significam que o comando já está aplicado.
+ERROS_JA_APLICADO = {
+    1060,  # ER_DUP_FIELDNAME: coluna já existe
+    1061,  # ER_DUP_KEYNAME: índice já existe
+}
+
+_CRIAR_SCHEMA_VERSION = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        versao INT PRIMARY KEY,
+        descricao VARCHAR(255) NOT NULL,
+        aplicada_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def versoes_aplicadas(conn):
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT versao FROM schema_version")
+        return {row[0] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def _executar_comando(cursor, versao, comando):
+    try:
+        cursor.execute(comando)
+    except Exception as e:
+        if getattr(e, 'errno', None) not in ERROS_JA_APLICADO:
+            raise
+        print(f"INFO: Migração {versao}: comando já aplicado anteriormente ({e})")
+
+
+def aplicar_migracoes(conn):
+    """
+    Aplica, em ordem, as migrações ainda não registradas em schema_version.
+    Retorna True quando o esquema está na versão atual.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(_CRIAR_SCHEMA_VERSION)
+        conn.commit()
+    finally:
+        cursor.close()
+
+    aplicadas = versoes_aplicadas(conn)
+    for versao, descricao, comandos in MIGRACOES:
+        if versao in aplicadas:
+            continue
+        cursor = conn.cursor()
+        try:
+            for comando in comandos:
+                _executar_comando(cursor, versao, comando)
+            # Idempotente: outro processo pode ter registrado a versão nesse meio tempo
+            cursor.execute(
+                "INSERT INTO schema_version (versao, descricao) VALUES (%s, %s) "
+                "ON DUPLICATE KEY UPDATE descricao = VALUES(descricao)",
+                (versao, descricao)
+            )
+            conn.commit()
+            print(f"INFO: Migração {versao} aplicada: {descricao}")
+        except Exception as e:
+            conn.rollback()
+            # Outro processo pode ter aplicado a mesma migração ao mesmo tempo
+            if versao in versoes_aplicadas(conn):
+                continue
+            print(f"ERRO: Falha na migração {versao} ({descricao}): {e}")
+            return False
+        finally:
+            cursor.close()
+    return True
@@ -0,0 +1,324 @@
+"""
+Pipeline de dados do Macrofluxo, sem dependência do Streamlit.
+
+Busca as duas fontes (relatório Smartsheet com os dados reais e planilha do
+Macrofluxo com os previstos), faz o merge e devolve o DataFrame do app junto com
+um DiagnosticoCarga (etapas não reconhecidas, linhas e tempo por fonte, fontes
+que falharam). Tudo é picklable, então o mesmo pipeline atende o app (via
+AtualizadorDados), a linha de comando e scripts:
+
+    python pipeline_dados.py [--saida dados.parquet]
+"""
+import argparse
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from atualizador_dados import carregar_fontes_em_paralelo
+from config_etapas import (
+    GRUPO_POR_ETAPA, SETOR_POR_ETAPA, ORDEM_ETAPAS_GLOBAL, ORDEM_ETAPAS_NOME_COMPLETO,
+    mapeamento_etapas_usuario, sigla_para_nome_completo,
+)
+
+try:
+    from tratamento_dados_reais import buscar_e_processar_dados_completos, assinatura_relatorio_atual
+    from tratamento_macrofluxo import tratar_macrofluxo, assinatura_macrofluxo
+    MODO_REAL = True
+except ImportError:
+    buscar_e_processar_dados_completos = None
+    tratar_macrofluxo = None
+    MODO_REAL = False
+
+# Chaves de baixa cardinalidade (TIPO_LOTES só quando a fonte trouxer a coluna)
+COLUNAS_CATEGORICAS = ["UGB", "Empreendimento", "Etapa", "GRUPO", "SETOR", "TIPO_LOTES"]
+COLUNAS_DATA = ["Inicio_Prevista", "Termino_Prevista", "Inicio_Real", "Termino_Real"]
+
+
+@dataclass
+class DiagnosticoCarga:
+    """O que aconteceu numa carga completa (exibido no app e na linha de comando)"""
+    etapas_nao_mapeadas: set = field(default_factory=set)
+    linhas_por_fonte: dict = field(default_factory=dict)
+    tempos: dict = field(default_factory=dict)
+    fontes_com_falha: list = field(default_factory=list)
+
+    def resumo(self):
+        partes = [f"{nome}: {linhas} linhas em {self.tempos.get(nome, 0):.1f}s"
+                  for nome, linhas in self.linhas_por_fonte.items()]
+        partes += [f"{nome}: FALHOU" for nome in self.fontes_com_falha]
+        if self.etapas_nao_mapeadas:
+            partes.append(f"etapas não reconhecidas: {', '.join(sorted(self.etapas_nao_mapeadas))}")
+        return "; ".join(partes) or "nenhuma fonte configurada"
+
+
+def compactar_tipos(df):
+    """
+    df_data com tipos compactos: categorias nas chaves, datetime64 nas datas e
+    float32 no percentual. Só copia se houver coluna a converter; um frame que
+    já está compacto volta como está, sem cópia.
+    """
+    conversoes = {}
+    for col in COLUNAS_CATEGORICAS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            conversoes[col] = df[col].astype("category")
+    for col in COLUNAS_DATA:
+        if col in df.columns and not pd.api.types.is_datetime64_dtype(df[col]):
+            conversoes[col] = pd.to_datetime(df[col], errors="coerce")
+    if "% concluído" in df.columns and df["% concluído"].dtype != np.float32:
+        conversoes["% concluído"] = pd.to_numeric(df["% concluído"], errors="coerce").astype(np.float32)
+    return df.assign(**conversoes) if conversoes else df
+
+def ordem_global_etapas(etapas):
+    """
+    Posição de cada etapa (sigla ou nome completo) em ORDEM_ETAPAS_GLOBAL, sem
+    list.index por linha; etapas desconhecidas vão para o final.
+    """
+    codigos = pd.Categorical(etapas, categories=ORDEM_ETAPAS_GLOBAL).codes
+    codigos_nome = pd.Categorical(etapas, categories=ORDEM_ETAPAS_NOME_COMPLETO).codes
+    codigos = np.where(codigos < 0, codigos_nome, codigos)
+    return np.where(codigos < 0, len(ORDEM_ETAPAS_GLOBAL), codigos).astype(np.int16)
+
+def anexar_ordem_etapas(df):
+    """Coluna Etapa_Ordem (ordem global da etapa), usada por todas as ordenações do app"""
+    if "Etapa" in df.columns and "Etapa_Ordem" not in df.columns:
+        df["Etapa_Ordem"] = ordem_global_etapas(df["Etapa"])
+    return df
+
+def memoria_por_coluna(df):
+    """Bytes ocupados por coluna (deep=True: conta as strings dos objetos), índice incluído"""
+    return df.memory_usage(deep=True)
+
+def converter_porcentagem(valor):
+    if pd.isna(valor) or valor == "":
+        return 0.0
+    if isinstance(valor, str):
+        valor = "".join(c for c in valor if c.isdigit() or c in [".", ","]).replace(",", ".").strip()
+        if not valor: return 0.0
+    try:
+        val_float = float(valor)
+        return val_float * 100 if val_float <= 1 else val_float
+    except (ValueError, TypeError):
+        return 0.0
+
+def padronizar_etapa(etapa_str):
+    if pd.isna(etapa_str): return "UNKNOWN"
+    etapa_limpa = str(etapa_str).strip().upper()
+    return mapeamento_etapas_usuario.get(etapa_limpa, etapa_limpa)
+
+def carregar_dados_reais():
+    """Dados reais (Smartsheet) já pivotados: Empreendimento, Etapa, % concluído, Inicio_Real, Termino_Real"""
+    df_real = pd.DataFrame()
+    df_real_resultado = buscar_e_processar_dados_completos()
+
+    if df_real_resultado is not None and not df_real_resultado.empty:
+        df_real = df_real_resultado.copy()
+        df_real["Etapa"] = df_real["Etapa"].apply(padronizar_etapa)
+        # Renomeia colunas ANTES do pivot se os nomes originais forem diferentes
+        df_real = df_real.rename(columns={"EMP": "Empreendimento", "%_Concluido": "% concluído"})
+
+        # Converte porcentagem antes do pivot
+        if "% concluído" in df_real.columns:
+            df_real["% concluído"] = df_real["% concluído"].apply(converter_porcentagem)
+        else:
+            # Adiciona a coluna se não existir, para evitar erro no pivot
+            df_real["% concluído"] = 0.0
+
+        # Verifica se 'Inicio_Fim' e 'Valor' existem antes de pivotar
+        if "Inicio_Fim" in df_real.columns and "Valor" in df_real.columns:
+            df_real_pivot = df_real.pivot_table(
+                index=["Empreendimento", "Etapa", "% concluído"], # Inclui % concluído no índice
+                columns="Inicio_Fim",
+                values="Valor",
+                aggfunc="first"
+            ).reset_index()
+            df_real_pivot.columns.name = None # Remove o nome do índice das colunas
+
+            # Renomeia APÓS o pivot
+            if "INICIO" in df_real_pivot.columns:
+                df_real_pivot = df_real_pivot.rename(columns={"INICIO": "Inicio_Real"})
+            if "TERMINO" in df_real_pivot.columns:
+                df_real_pivot = df_real_pivot.rename(columns={"TERMINO": "Termino_Real"})
+            df_real = df_real_pivot # Atualiza df_real com o resultado pivotado
+        else:
+             # st.warning("Colunas 'Inicio_Fim' ou 'Valor' não encontradas nos dados reais. Pivot não aplicado.")
+             # Mantém df_real como está, mas garante colunas esperadas
+             if "Inicio_Real" not in df_real.columns: df_real["Inicio_Real"] = pd.NaT
+             if "Termino_Real" not in df_real.columns: df_real["Termino_Real"] = pd.NaT
+
+    else:
+        # st.info("Nenhum dado real retornado por buscar_e_processar_dados_completos().")
+        df_real = pd.DataFrame() # Garante que seja um DF vazio
+    return df_real
+
+def carregar_dados_previstos():
+    """Dados previstos (planilha do Macrofluxo) já pivotados: UGB, Empreendimento, Etapa, Inicio_Prevista, Termino_Prevista"""
+    df_previsto = pd.DataFrame()
+    df_previsto_resultado = tratar_macrofluxo()
+    if df_previsto_resultado is not None and not df_previsto_resultado.empty:
+        df_previsto = df_previsto_resultado.copy()
+        df_previsto["Etapa"] = df_previsto["Etapa"].apply(padronizar_etapa)
+        df_previsto = df_previsto.rename(columns={"EMP": "Empreendimento", "UGB": "UGB"})
+        df_previsto_pivot = df_previsto.pivot_table(index=["UGB", "Empreendimento", "Etapa"], columns="Inicio_Fim", values="Valor", aggfunc="first").reset_index()
+        df_previsto_pivot.columns.name = None
+        if "INICIO" in df_previsto_pivot.columns:
+            df_previsto_pivot = df_previsto_pivot.rename(columns={"INICIO": "Inicio_Prevista"})
+        if "TERMINO" in df_previsto_pivot.columns:
+            df_previsto_pivot = df_previsto_pivot.rename(columns={"TERMINO": "Termino_Prevista"})
+        df_previsto = df_previsto_pivot
+    else:
+        df_previsto = pd.DataFrame()
+    return df_previsto
+
+# Tempo máximo de cada fonte na carga completa (segundos)
+TIMEOUT_DADOS_REAIS = 180
+TIMEOUT_DADOS_PREVISTOS = 120
+
+def montar_dados_macrofluxo():
+    """
+    Carga completa das fontes (Smartsheet + Macrofluxo) e merge real x previsto.
+    Não usa Streamlit: roda no AtualizadorDados, na linha de comando e em scripts.
+    Retorna (df_merged, DiagnosticoCarga), ou None se nenhuma fonte trouxe dados.
+    """
+    # As duas fontes são independentes até o merge: carregadas em paralelo, cada uma
+    # com seu timeout; a falha de uma não impede o uso da outra
+    fontes = {}
+    if buscar_e_processar_dados_completos:
+        fontes["dados reais (Smartsheet)"] = (carregar_dados_reais, TIMEOUT_DADOS_REAIS)
+    if tratar_macrofluxo:
+        fontes["dados previstos (Macrofluxo)"] = (carregar_dados_previstos, TIMEOUT_DADOS_PREVISTOS)
+    diagnostico = DiagnosticoCarga()
+    resultados = carregar_fontes_em_paralelo(fontes, tempos=diagnostico.tempos)
+    for nome, resultado in resultados.items():
+        if resultado is None:
+            diagnostico.fontes_com_falha.append(nome)
+        else:
+            diagnostico.linhas_por_fonte[nome] = len(resultado)
+
+    df_real = resultados.get("dados reais (Smartsheet)")
+    df_previsto = resultados.get("dados previstos (Macrofluxo)")
+    if df_real is None:
+        df_real = pd.DataFrame()
+    if df_previsto is None:
+        df_previsto = pd.DataFrame()
+
+    if df_real.empty and df_previsto.empty:
+        print(f"AVISO: Nenhuma fonte de dados retornou registros ({diagnostico.resumo()})")
+        return None
+
+    etapas_base_oficial = set(sigla_para_nome_completo.keys())
+    etapas_nos_dados = set()
+    if not df_real.empty:
+        etapas_nos_dados.update(df_real["Etapa"].unique())
+    if not df_previsto.empty:
+        etapas_nos_dados.update(df_previsto["Etapa"].unique())
+
+    etapas_nao_mapeadas = etapas_nos_dados - etapas_base_oficial
+
+    if "UNKNOWN" in etapas_nao_mapeadas:
+       etapas_nao_mapeadas.remove("UNKNOWN")
+
+    # CORREÇÃO: Remover a linha problemática que tenta usar df_data antes de ser definida
+    # empreendimentos_baseline = df_data['Empreendimento'].unique().tolist() if not df_data.empty else []
+    
+    if not df_real.empty and not df_previsto.empty:
+        df_merged = pd.merge(df_previsto, df_real[["Empreendimento", "Etapa", "Inicio_Real", "Termino_Real", "% concluído"]], on=["Empreendimento", "Etapa"], how="outer")
+
+        # --- Lógica de Exceção para Etapas Apenas no Real ---
+        etapas_excecao = [
+            "PE. LIMP.", "ORÇ. LIMP.", "SUP. LIMP.",
+            "PE. TER.", "ORÇ. TER.", "SUP. TER.", 
+            "PE. INFRA", "ORÇ. INFRA", "SUP. INFRA",
+            "PE. PAV", "ORÇ. PAV", "SUP. PAV"
+        ]
+
+        # Identifica linhas onde o previsto (Inicio_Prevista) é nulo, mas a etapa é de exceção
+        filtro_excecao = df_merged["Etapa"].isin(etapas_excecao) & df_merged["Inicio_Prevista"].isna()
+        df_merged.loc[filtro_excecao, "Inicio_Prevista"] = df_merged.loc[filtro_excecao, "Inicio_Real"]
+        df_merged.loc[filtro_excecao, "Termino_Prevista"] = df_merged.loc[filtro_excecao, "Termino_Real"]
+
+        # CORREÇÃO: Buscar UGB correta para as subetapas
+        if not df_previsto.empty:
+            # Criar mapeamento de UGB por empreendimento
+            ugb_por_empreendimento = df_previsto.groupby('Empreendimento')['UGB'].first().to_dict()
+            
+            # Para cada subetapa sem UGB, buscar a UGB do empreendimento correspondente
+            for idx in df_merged[filtro_excecao & df_merged["UGB"].isna()].index:
+                empreendimento = df_merged.loc[idx, 'Empreendimento']
+                if empreendimento in ugb_por_empreendimento:
+                    df_merged.loc[idx, 'UGB'] = ugb_por_empreendimento[empreendimento]
+    elif not df_previsto.empty:
+        # Se só temos dados previstos
+        df_merged = df_previsto.copy()
+    elif not df_real.empty:
+        # Se só temos dados reais
+        df_merged = df_real.copy()
+    else:
+        # Nenhum dado disponível
+        df_merged = pd.DataFrame()
+
+
+    df_merged["% concluído"] = df_merged["% concluído"].fillna(0)
+    df_merged.dropna(subset=["Empreendimento", "Etapa"], inplace=True)
+
+    df_merged["GRUPO"] = df_merged["Etapa"].map(GRUPO_POR_ETAPA).fillna("Não especificado")
+    df_merged["SETOR"] = df_merged["Etapa"].map(SETOR_POR_ETAPA).fillna("Não especificado")
+
+    diagnostico.etapas_nao_mapeadas = etapas_nao_mapeadas
+    return anexar_ordem_etapas(compactar_tipos(df_merged)), diagnostico
+
+def assinatura_fontes_macrofluxo():
+    """
+    Estado das fontes sem baixá-las: modifiedAt do relatório Smartsheet e mtime
+    da planilha do Macrofluxo. None quando alguma não pode ser verificada.
+    """
+    if not MODO_REAL:
+        return None
+    partes = (assinatura_relatorio_atual(), assinatura_macrofluxo())
+    if None in partes:
+        return None
+    return " / ".join(partes)
+
+def criar_dados_exemplo():
+    dados = {
+        "UGB": ["UGB1", "UGB1", "UGB1", "UGB2", "UGB2", "UGB1"],
+        "Empreendimento": ["Residencial Alfa", "Residencial Alfa", "Residencial Alfa", "Condomínio Beta", "Condomínio Beta", "Projeto Gama"],
+        "Etapa": ["PROSPEC", "LEGVENDA", "PL.LIMP", "PROSPEC", "LEGVENDA", "PROSPEC"],
+        "Inicio_Prevista": pd.to_datetime(["2024-01-01", "2024-02-15", "2024-04-01", "2024-01-20", "2024-03-10", "2024-05-01"]),
+        "Termino_Prevista": pd.to_datetime(["2024-02-14", "2024-03-31", "2024-05-15", "2024-03-09", "2024-04-30", "2024-06-15"]),
+        "Inicio_Real": pd.to_datetime(["2024-01-05", "2024-02-20", pd.NaT, "2024-01-22", "2024-03-15", pd.NaT]),
+        "Termino_Real": pd.to_datetime(["2024-02-18", pd.NaT, pd.NaT, "2024-03-12", pd.NaT, pd.NaT]),
+        "% concluído": [100, 50, 0, 100, 25, 0],
+    }
+    df_exemplo = pd.DataFrame(dados)
+    df_exemplo["GRUPO"] = df_exemplo["Etapa"].map(GRUPO_POR_ETAPA).fillna("PLANEJAMENTO MACROFLUXO")
+    df_exemplo["SETOR"] = df_exemplo["Etapa"].map(SETOR_POR_ETAPA).fillna("PROSPECÇÃO")
+    return df_exemplo
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--saida", help="grava o DataFrame final (.parquet, .pkl ou .csv)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resultado = montar_dados_macrofluxo()
+    if resultado is None:
+        print("ERRO: Nenhuma fonte de dados carregada.")
+        raise SystemExit(1)
+    df, diagnostico = resultado
+    print(f"INFO: {len(df)} linhas, {df['Empreendimento'].nunique()} empreendimentos em {time.perf_counter() - inicio:.1f}s")
+    print(f"INFO: {diagnostico.resumo()}")
+
+    if args.saida:
+        if args.saida.endswith(".parquet"):
+            df.to_parquet(args.saida, index=False)
+        elif args.saida.endswith(".pkl"):
+            df.to_pickle(args.saida)
+        else:
+            df.to_csv(args.saida, index=False)
+        print(f"INFO: DataFrame salvo em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
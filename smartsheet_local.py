@@ -0,0 +1,65 @@
+"""
+Cliente Smartsheet local, sem rede, para testar a carga dos dados reais.
+
+Imita apenas o que tratamento_dados_reais usa do SDK (Reports.list_reports,
+Reports.get_report e Reports.get_report_as_csv), servindo um CSV local como se
+fosse o relatório. O modifiedAt do relatório é a data de modificação do arquivo,
+e cada chamada fica registrada em `chamadas` para conferir o que foi baixado.
+
+Uso no app: defina SMARTSHEET_CSV_LOCAL com o caminho do CSV.
+Uso em scripts: buscar_e_processar_dados_completos(client=ClienteSmartsheetLocal(caminho)).
+"""
+import os
+import shutil
+from collections import Counter
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+ID_RELATORIO_LOCAL = 1
+
+
+class _ReportsLocal:
+    def __init__(self, cliente):
+        self._cliente = cliente
+
+    def _relatorio(self):
+        estatisticas = os.stat(self._cliente.caminho_csv)
+        return SimpleNamespace(
+            id=ID_RELATORIO_LOCAL,
+            name=self._cliente.nome_relatorio,
+            modified_at=datetime.fromtimestamp(estatisticas.st_mtime, tz=timezone.utc),
+            total_row_count=None,
+            source_sheets=[],
+        )
+
+    def _conferir_id(self, report_id):
+        if report_id != ID_RELATORIO_LOCAL:
+            raise ValueError(f"Relatório {report_id} não encontrado")
+
+    def list_reports(self, include_all=False, **kwargs):
+        self._cliente.chamadas['list_reports'] += 1
+        return SimpleNamespace(data=[self._relatorio()])
+
+    def get_report(self, report_id, page_size=None, include=None, **kwargs):
+        self._cliente.chamadas['get_report'] += 1
+        self._conferir_id(report_id)
+        return self._relatorio()
+
+    def get_report_as_csv(self, report_id, download_path, alternate_file_name=None):
+        self._cliente.chamadas['get_report_as_csv'] += 1
+        self._conferir_id(report_id)
+        nome = alternate_file_name or f"{self._cliente.nome_relatorio}.csv"
+        destino = os.path.join(download_path, nome)
+        shutil.copyfile(self._cliente.caminho_csv, destino)
+        return SimpleNamespace(filename=destino, download_directory=download_path)
+
+
+class ClienteSmartsheetLocal:
+    def __init__(self, caminho_csv, nome_relatorio='Relatório MF- Smart'):
+        self.caminho_csv = caminho_csv
+        self.nome_relatorio = nome_relatorio
+        self.chamadas = Counter()
+        self.Reports = _ReportsLocal(self)
+
+    def errors_as_exceptions(self, valor=True):
+        pass
@@ -0,0 +1,181 @@
+"""
+Pool de conexões e migrações contra o stand-in SQLite (GANTT_SQLITE_PATH),
+sem precisar do MySQL/RDS.
+"""
+import json
+
+import pytest
+
+import conexao_db
+from baselines import BaselineStore
+from conexao_db import ConexaoIndisponivel, ConexaoSQLite, PoolConexoes, criar_pool
+import migracoes_db
+from migracoes_db import MIGRACOES, VERSAO_ATUAL, aplicar_migracoes, versoes_aplicadas
+
+# Mesmo SQL de save_baseline em app.py
+QUERY_SALVAR = """
+    INSERT INTO gantt_baselines (empreendimento, version_name, baseline_data, created_date, tipo_visualizacao)
+    VALUES (%s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        baseline_data = VALUES(baseline_data),
+        created_date = VALUES(created_date),
+        tipo_visualizacao = VALUES(tipo_visualizacao),
+        created_at = CURRENT_TIMESTAMP
+"""
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    monkeypatch.setenv('GANTT_SQLITE_PATH', str(tmp_path / 'gantt.db'))
+    pool = criar_pool({'host': 'ignorado'})
+    yield pool
+    pool.fechar()
+
+
+def executar(pool, query, params=()):
+    conn = pool.conexao()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def salvar(pool, empreendimento, versao, tasks):
+    dados = json.dumps({'tasks': tasks, 'created_by': 'teste'})
+    executar(pool, QUERY_SALVAR, (empreendimento, versao, dados, '01/01/2025', 'Gantt'))
+
+
+def test_migracoes_salvar_catalogo_e_invalidar(pool):
+    conn = pool.conexao()
+    try:
+        assert aplicar_migracoes(conn)
+        assert aplicar_migracoes(conn)  # idempotente
+        assert max(versoes_aplicadas(conn)) == VERSAO_ATUAL
+    finally:
+        conn.close()
+
+    store = BaselineStore(pool.conexao)
+    salvar(pool, 'EMP A', 'P1', [{'etapa': 'PROSPEC', 'inicio_previsto': '2025-01-01', 'termino_previsto': '2025-02-01'}])
+    salvar(pool, 'EMP B', 'P1', [])
+
+    catalogo = store.catalogo()
+    assert set(catalogo) == {'EMP A', 'EMP B'}
+    assert 'created_by' not in catalogo['EMP A']['P1']  # o catálogo não lê o JSON
+    dados = store.dados('EMP A', 'P1')['data']
+    assert dados['created_by'] == 'teste'
+    assert dados['tasks'][0]['termino_previsto'] == '2025-02-01'
+
+    # Regravar (upsert) e invalidar só a versão afetada
+    salvar(pool, 'EMP A', 'P1', [{'etapa': 'PROSPEC', 'inicio_previsto': '2025-01-01', 'termino_previsto': '2025-03-01'}])
+    store.invalidar('EMP A', 'P1')
+    assert store.dados('EMP A', 'P1')['data']['tasks'][0]['termino_previsto'] == '2025-03-01'
+
+    salvar(pool, 'EMP A', 'P2', [])
+    store.invalidar('EMP A', 'P2')
+    assert set(store.catalogo()['EMP A']) == {'P1', 'P2'}
+
+    executar(pool, "DELETE FROM gantt_baselines WHERE empreendimento = %s", ('EMP A',))
+    anterior = store.catalogo()
+    store.invalidar('EMP A')
+    assert set(store.catalogo()) == {'EMP B'}
+    assert set(anterior) == {'EMP A', 'EMP B'}  # quem já tinha o catálogo não o vê mudar
+    assert store.dados_empreendimentos(['EMP A']) == {}
+
+
+def test_migracao_com_indice_ja_existente(pool):
+    conn = pool.conexao()
+    try:
+        # Índice criado à mão antes da migração 2
+        cursor = conn.cursor()
+        cursor.execute(MIGRACOES[0][2][0])
+        cursor.execute("CREATE INDEX idx_baselines_emp_created ON gantt_baselines (empreendimento, created_at)")
+        conn.commit()
+        cursor.close()
+        assert aplicar_migracoes(conn)
+        assert versoes_aplicadas(conn) == {1, 2}
+
+        # DDL aplicada sem o registro da versão (falha entre o índice e o INSERT)
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM schema_version WHERE versao = %s", (2,))
+        conn.commit()
+        cursor.close()
+        assert aplicar_migracoes(conn)
+        assert versoes_aplicadas(conn) == {1, 2}
+    finally:
+        conn.close()
+
+
+def test_migracao_registrada_por_outro_processo(pool, monkeypatch):
+    conn = pool.conexao()
+    try:
+        assert aplicar_migracoes(conn)
+        # Outro processo registrou a versão depois da leitura de versoes_aplicadas
+        monkeypatch.setattr(migracoes_db, 'versoes_aplicadas', lambda conn: set())
+        assert aplicar_migracoes(conn)
+    finally:
+        conn.close()
+
+
+def test_pool_esgotado(tmp_path):
+    pool = PoolConexoes(lambda: ConexaoSQLite(str(tmp_path / 'gantt.db')), tamanho=1, timeout=0.05)
+    conn = pool.conexao()
+    with pytest.raises(ConexaoIndisponivel, match="esgotado"):
+        pool.conexao()
+    conn.close()
+    pool.conexao().close()  # a vaga volta com a devolução
+    pool.fechar()
+
+
+def test_backoff_e_pausa_apos_falha(monkeypatch):
+    esperas = []
+    relogio = [1000.0]
+    monkeypatch.setattr(conexao_db.time, 'sleep', esperas.append)
+    monkeypatch.setattr(conexao_db.time, 'monotonic', lambda: relogio[0])
+    tentativas = []
+
+    def fabrica():
+        tentativas.append(1)
+        raise OSError("recusada")
+
+    pool = PoolConexoes(fabrica, tentativas=3, espera_inicial=0.5, pausa_apos_falha=60)
+    with pytest.raises(ConexaoIndisponivel):
+        pool.conexao()
+    assert len(tentativas) == 3
+    assert esperas == [0.5, 1.0]
+
+    # Durante a pausa nem tenta conectar
+    relogio[0] += 30
+    with pytest.raises(ConexaoIndisponivel, match="aguardando"):
+        pool.conexao()
+    assert len(tentativas) == 3
+
+    # Passada a pausa, volta a tentar (e a falha não consumiu vagas do pool)
+    relogio[0] += 31
+    with pytest.raises(ConexaoIndisponivel):
+        pool.conexao()
+    assert len(tentativas) == 6
+
+
+def test_health_check_descarta_conexao_caida(tmp_path):
+    criadas = []
+
+    def fabrica():
+        criadas.append(ConexaoSQLite(str(tmp_path / 'gantt.db')))
+        return criadas[-1]
+
+    pool = PoolConexoes(fabrica, tamanho=1)
+    pool.conexao().close()
+    assert len(criadas) == 1
+
+    pool.conexao().close()  # ociosa e saudável: reaproveitada
+    assert len(criadas) == 1
+
+    criadas[0].close()  # cai enquanto está ociosa no pool
+    conn = pool.conexao()
+    assert len(criadas) == 2
+    assert conn.is_connected()
+    conn.close()
+    pool.fechar()
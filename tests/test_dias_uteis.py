@@ -0,0 +1,93 @@
+"""
+dias_uteis / dias_uteis_entre: feriados, intervalos negativos, `inclusivo`, datas
+nulas e equivalência com o cálculo antigo, linha a linha.
+"""
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dias_uteis import calendario_dias_uteis, dias_uteis, dias_uteis_entre
+
+SEM_FERIADOS = np.busdaycalendar()
+
+
+def calculate_business_days_legado(inicio, fim):
+    """calculate_business_days original: np.busday_count escalar, sem feriados."""
+    if pd.isna(inicio) or pd.isna(fim):
+        return np.nan
+    return np.busday_count(pd.to_datetime(inicio).date(), pd.to_datetime(fim).date())
+
+
+@pytest.fixture(scope="module")
+def datas_aleatorias():
+    rng = np.random.default_rng(7)
+    n = 2000
+    base = np.datetime64("2023-01-01")
+    inicio = pd.Series(base + rng.integers(0, 900, n).astype("timedelta64[D]"))
+    fim = pd.Series(inicio.to_numpy() + rng.integers(-120, 240, n).astype("timedelta64[D]"))
+    inicio[rng.random(n) < 0.1] = pd.NaT
+    fim[rng.random(n) < 0.1] = pd.NaT
+    return inicio, fim
+
+
+def test_feriados_nacionais():
+    pytest.importorskip("holidays")
+    # Tiradentes (seg 21/04/2025) e Natal (qua 25/12/2024)
+    assert dias_uteis_entre("2025-04-21", "2025-04-22") == 0
+    assert dias_uteis_entre("2025-04-21", "2025-04-22", calendario=SEM_FERIADOS) == 1
+    assert dias_uteis_entre(date(2024, 12, 23), date(2024, 12, 30)) == 4
+    assert list(dias_uteis(["2025-04-21", "2024-12-23"], ["2025-04-22", "2024-12-30"])) == [0, 4]
+
+
+def test_feriados_estaduais_e_municipais():
+    pytest.importorskip("holidays")
+    # Independência da Bahia: qua 02/07/2025
+    assert dias_uteis_entre("2025-07-02", "2025-07-03", calendario=calendario_dias_uteis()) == 1
+    assert dias_uteis_entre("2025-07-02", "2025-07-03", calendario=calendario_dias_uteis("BA")) == 0
+    municipal = calendario_dias_uteis(None, ("2025-07-03",))
+    assert dias_uteis_entre("2025-07-02", "2025-07-05", calendario=municipal) == 2  # qua e sex
+
+
+def test_intervalo_negativo():
+    assert dias_uteis_entre("2025-03-14", "2025-03-10", calendario=SEM_FERIADOS) == -4
+    assert dias_uteis_entre("2025-03-10", "2025-03-14", calendario=SEM_FERIADOS) == 4
+    assert list(dias_uteis(["2025-03-14"], ["2025-03-10"], calendario=SEM_FERIADOS)) == [-4]
+
+
+def test_inclusivo():
+    assert dias_uteis_entre("2025-03-10", "2025-03-14", inclusivo=True, calendario=SEM_FERIADOS) == 5
+    assert dias_uteis_entre("2025-03-10", "2025-03-10", inclusivo=True, calendario=SEM_FERIADOS) == 1
+    assert list(dias_uteis(["2025-03-10"], ["2025-03-14"], inclusivo=True, calendario=SEM_FERIADOS)) == [5]
+
+
+def test_datas_nulas():
+    assert np.isnan(dias_uteis_entre(pd.NaT, "2025-03-14"))
+    assert np.isnan(dias_uteis_entre("2025-03-14", None))
+    assert np.isnan(dias_uteis_entre(np.datetime64("NaT"), np.datetime64("NaT"), inclusivo=True))
+    resultado = dias_uteis(pd.Series([pd.NaT, pd.Timestamp("2025-03-10")]),
+                           pd.Series([pd.Timestamp("2025-03-14"), pd.NaT]))
+    assert np.isnan(resultado).all()
+    assert np.isnan(dias_uteis(pd.Series([], dtype="datetime64[ns]"), pd.Series([], dtype="datetime64[ns]"))).size == 0
+
+
+def test_tipos_de_data_escalares():
+    esperado = dias_uteis_entre("2025-03-10", "2025-03-14")
+    for inicio in (date(2025, 3, 10), datetime(2025, 3, 10, 17, 30), pd.Timestamp("2025-03-10"),
+                   np.datetime64("2025-03-10")):
+        assert dias_uteis_entre(inicio, pd.Timestamp("2025-03-14")) == esperado
+
+
+def test_igual_ao_calculo_antigo_por_linha(datas_aleatorias):
+    inicio, fim = datas_aleatorias
+    antigo = np.array([calculate_business_days_legado(i, f) for i, f in zip(inicio, fim)], dtype=float)
+    np.testing.assert_array_equal(dias_uteis(inicio, fim, calendario=SEM_FERIADOS), antigo)
+    np.testing.assert_array_equal(dias_uteis(inicio, fim, inclusivo=True, calendario=SEM_FERIADOS), antigo + 1)
+
+
+def test_escalar_igual_a_coluna(datas_aleatorias):
+    inicio, fim = datas_aleatorias
+    coluna = dias_uteis(inicio, fim)
+    escalar = np.array([dias_uteis_entre(i, f) for i, f in zip(inicio, fim)], dtype=float)
+    np.testing.assert_array_equal(coluna, escalar)
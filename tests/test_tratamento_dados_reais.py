@@ -0,0 +1,74 @@
+"""
+Carga do relatório do Smartsheet com o cliente local (smartsheet_local.py): com o
+modifiedAt inalterado não há download nem reprocessamento; alterado, há os dois.
+"""
+import os
+
+import pytest
+
+pytest.importorskip("smartsheet")
+pytest.importorskip("dotenv")
+
+import tratamento_dados_reais
+from smartsheet_local import ClienteSmartsheetLocal
+
+CSV_RELATORIO = """Empreendimento,Primário,Serviço,%,Data de Início,Data de Fim,Fase
+1.EMP A,PROSPEC,Prospecção,100%,01/02/2025,28/02/2025,F1
+1.EMP A,LEGADO,Legalização,50%,01/03/2025,,F1
+2.EMP B,PROSPEC,Prospecção,0%,10/03/2025,30/04/2025,F1
+"""
+
+
+@pytest.fixture
+def cliente(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # cache do ID do relatório fica no diretório temporário
+    monkeypatch.setitem(tratamento_dados_reais._ULTIMA_CARGA, "assinatura", None)
+    monkeypatch.setitem(tratamento_dados_reais._ULTIMA_CARGA, "dados", None)
+    caminho = tmp_path / "relatorio.csv"
+    caminho.write_text(CSV_RELATORIO, encoding="utf-8")
+    os.utime(caminho, (1_700_000_000, 1_700_000_000))
+    return ClienteSmartsheetLocal(str(caminho), tratamento_dados_reais.SHEET_NAME)
+
+
+@pytest.fixture
+def processamentos(monkeypatch):
+    chamadas = []
+    original = tratamento_dados_reais.processar_dados_macrofluxo
+
+    def contar(df):
+        chamadas.append(len(df))
+        return original(df)
+
+    monkeypatch.setattr(tratamento_dados_reais, "processar_dados_macrofluxo", contar)
+    return chamadas
+
+
+def test_modified_at_inalterado_nao_baixa_nem_reprocessa(cliente, processamentos):
+    primeira = tratamento_dados_reais.buscar_e_processar_dados_completos(client=cliente)
+    assert not primeira.empty
+    assert cliente.chamadas["get_report_as_csv"] == 1
+    assert len(processamentos) == 1
+
+    segunda = tratamento_dados_reais.buscar_e_processar_dados_completos(client=cliente)
+    assert cliente.chamadas["get_report_as_csv"] == 1
+    assert len(processamentos) == 1
+    assert segunda.equals(primeira)
+    assert segunda is not primeira  # cópia: quem alterar o resultado não estraga o cache
+
+    # O ID do relatório também veio do cache local: só uma listagem
+    assert cliente.chamadas["list_reports"] == 1
+
+
+def test_modified_at_alterado_baixa_e_reprocessa(cliente, processamentos):
+    tratamento_dados_reais.buscar_e_processar_dados_completos(client=cliente)
+    assinatura = tratamento_dados_reais.assinatura_relatorio_atual(cliente)
+
+    with open(cliente.caminho_csv, "a", encoding="utf-8") as f:
+        f.write("3.EMP C,PROSPEC,Prospecção,0%,01/05/2025,30/05/2025,F1\n")
+    os.utime(cliente.caminho_csv, (1_700_000_600, 1_700_000_600))
+    assert tratamento_dados_reais.assinatura_relatorio_atual(cliente) != assinatura
+
+    df = tratamento_dados_reais.buscar_e_processar_dados_completos(client=cliente)
+    assert cliente.chamadas["get_report_as_csv"] == 2
+    assert len(processamentos) == 2
+    assert "EMP C" in set(df["EMP"])
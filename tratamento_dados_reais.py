@@ -3,6 +3,11 @@ import smartsheet
 import os
 import traceback
 import sys
+import json
+import time
+import tempfile
+import importlib.util
+from contextlib import contextmanager
 from dotenv import load_dotenv
 import re 
 
@@ -12,7 +17,40 @@ import re
 # O NOME DO RELATÓRIO QUE VOCÊ QUER CARREGAR
 SHEET_NAME = 'Relatório MF- Smart' 
 FINAL_OUTPUT_CSV = "relatorio_macrofluxo_final.csv" 
-TEMP_DOWNLOAD_DIR = "." 
+# Motor de leitura do CSV do relatório (pyarrow, se instalado) e tipos explícitos das colunas.
+# Tudo entra como texto: datas (DD/MM/AAAA) e '%' são convertidos no processamento/no app.
+ENGINE_CSV = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'
+DTYPES_RELATORIO = {
+    'Empreendimento': 'string',
+    'Primário': 'string',
+    'Serviço': 'string',
+    '%': 'string',
+    'Data de Início': 'string',
+    'Data de Fim': 'string',
+    'Fase': 'string',
+    'Início LB': 'string',
+    'Término LB': 'string',
+    'Origem Planil': 'string',
+}
+# ID do relatório resolvido uma vez e reutilizado (evita listar todos os relatórios a cada carga)
+ARQUIVO_CACHE_REPORT_ID = ".smartsheet_report_id.json"
+
+# Tempos (segundos) da última execução de cada chamada ao Smartsheet
+TEMPOS_SMARTSHEET = {}
+
+# Última carga processada e a assinatura (modifiedAt) do relatório naquele momento
+_ULTIMA_CARGA = {"assinatura": None, "dados": None}
+
+@contextmanager
+def cronometrar(etapa):
+    """Mede e registra o tempo de uma chamada ao Smartsheet"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracao = time.perf_counter() - inicio
+        TEMPOS_SMARTSHEET[etapa] = duracao
+        print(f"INFO: [tempo] {etapa}: {duracao:.2f}s")
 
 def carregar_configuracao():
     """Carrega as configurações e verifica o ambiente"""
@@ -43,6 +81,28 @@ def setup_smartsheet_client(token):
         print(f"\nERRO: Falha ao configurar cliente Smartsheet - {str(e)}")
         return None
 
+def conectar_smartsheet():
+    """
+    Cliente Smartsheet do app. Com SMARTSHEET_CSV_LOCAL definido, usa o cliente
+    local (smartsheet_local.py), que serve um CSV sem acessar a API.
+    """
+    csv_local = os.getenv("SMARTSHEET_CSV_LOCAL")
+    if csv_local:
+        from smartsheet_local import ClienteSmartsheetLocal
+        print(f"INFO: Usando cliente Smartsheet local ({csv_local})")
+        return ClienteSmartsheetLocal(csv_local, SHEET_NAME)
+
+    token = carregar_configuracao()
+    if not token: 
+        print("ERRO (MASTER): Falha ao carregar token.")
+        return None
+
+    client = setup_smartsheet_client(token)
+    if not client: 
+        print("ERRO (MASTER): Falha ao conectar ao Smartsheet.")
+        return None
+    return client
+
 # ===================================================================
 # FUNÇÕES DE COLETA DE DADOS (USANDO A ABORDAGEM DE RELATÓRIO/CSV)
 # ===================================================================
@@ -51,7 +111,8 @@ def get_report_id(client, report_name):
     """Obtém o ID do Relatório"""
     try:
         print(f"\nBuscando RELATÓRIO '{report_name}'...")
-        response = client.Reports.list_reports(include_all=True)
+        with cronometrar("Reports.list_reports"):
+            response = client.Reports.list_reports(include_all=True)
         
         for report in response.data:
             if report.name == report_name:
@@ -65,26 +126,94 @@ def get_report_id(client, report_name):
         print(f"\nErro inesperado ao buscar relatórios: {str(e)}")
         return None
 
+def ler_cache_report_id(report_name):
+    """ID do relatório salvo em ARQUIVO_CACHE_REPORT_ID, ou None"""
+    try:
+        with open(ARQUIVO_CACHE_REPORT_ID, 'r', encoding='utf-8') as f:
+            return json.load(f).get(report_name)
+    except (OSError, ValueError):
+        return None
+
+def salvar_cache_report_id(report_name, report_id):
+    try:
+        cache = {}
+        if os.path.exists(ARQUIVO_CACHE_REPORT_ID):
+            with open(ARQUIVO_CACHE_REPORT_ID, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        if report_id is None:
+            cache.pop(report_name, None)
+        else:
+            cache[report_name] = report_id
+        with open(ARQUIVO_CACHE_REPORT_ID, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+    except (OSError, ValueError) as e:
+        print(f"AVISO: Não foi possível atualizar o cache do ID do relatório: {e}")
+
+def resolver_report_id(client, report_name, forcar=False):
+    """
+    ID do relatório: usa o cache local e só lista os relatórios do workspace
+    quando não há ID salvo (ou com forcar=True, após falha no download pelo ID).
+    """
+    if not forcar:
+        report_id = ler_cache_report_id(report_name)
+        if report_id:
+            print(f"INFO: Usando ID do relatório em cache ({report_id})")
+            return report_id
+
+    report_id = get_report_id(client, report_name)
+    salvar_cache_report_id(report_name, report_id)
+    return report_id
+
+def obter_assinatura_relatorio(client, report_id):
+    """
+    Assinatura barata do estado do relatório: modifiedAt do relatório e das
+    planilhas de origem, mais o total de linhas (uma chamada com page_size=1).
+    Retorna None se não for possível consultar.
+    """
+    try:
+        with cronometrar("Reports.get_report (metadados)"):
+            report = client.Reports.get_report(report_id, page_size=1, include=['sourceSheets'])
+        datas = [report.modified_at] + [sheet.modified_at for sheet in (report.source_sheets or [])]
+        datas = [str(data) for data in datas if data]
+        if not datas:
+            return None
+        return f"{max(datas)}|{report.total_row_count}"
+    except Exception as e:
+        print(f"AVISO: Não foi possível consultar o modifiedAt do relatório: {e}")
+        return None
+
+def assinatura_relatorio_atual(client=None):
+    """Assinatura do relatório agora (None se indisponível). Usada antes de decidir recarregar."""
+    client = client or conectar_smartsheet()
+    if not client:
+        return None
+    report_id = resolver_report_id(client, SHEET_NAME)
+    return obter_assinatura_relatorio(client, report_id) if report_id else None
+
+def ler_csv_relatorio(caminho):
+    """Lê o CSV do relatório com o motor pyarrow e os tipos de DTYPES_RELATORIO"""
+    return pd.read_csv(caminho, sep=',', engine=ENGINE_CSV, dtype=DTYPES_RELATORIO)
+
 def get_report_data(client, report_id):
-    """Baixa o relatório diretamente como CSV e o converte para DataFrame."""
-    
-    downloaded_file_path = None 
-    
+    """
+    Baixa o relatório como CSV e o converte para DataFrame.
+    O download vai para um diretório temporário exclusivo desta chamada (removido
+    ao final), então cargas simultâneas não disputam o mesmo arquivo.
+    """
     try:
         print("\nObtendo dados do Relatório (via CSV)...")
-        print(f"INFO: Solicitando download para o diretório: '{TEMP_DOWNLOAD_DIR}'")
-        
-        result = client.Reports.get_report_as_csv(
-            report_id,
-            download_path=TEMP_DOWNLOAD_DIR
-        )
-        
-        downloaded_file_path = result.filename
-        print(f"INFO: Download concluído. Arquivo salvo como: '{downloaded_file_path}'")
-        
-        df = pd.read_csv(downloaded_file_path, sep=',')
+        with tempfile.TemporaryDirectory(prefix="smartsheet_") as diretorio:
+            with cronometrar("Reports.get_report_as_csv"):
+                result = client.Reports.get_report_as_csv(
+                    report_id,
+                    download_path=diretorio
+                )
+            caminho = os.path.join(diretorio, os.path.basename(result.filename))
+
+            with cronometrar("leitura do CSV"):
+                df = ler_csv_relatorio(caminho)
         
-        print(f"INFO: CSV lido para DataFrame. {len(df)} linhas encontradas.")
+        print(f"INFO: CSV lido para DataFrame ({ENGINE_CSV}). {len(df)} linhas encontradas.")
 
         if df.empty:
              print("AVISO: O DataFrame foi criado vazio (após ler o CSV).")
@@ -94,16 +223,7 @@ def get_report_data(client, report_id):
     except Exception as e:
         print(f"\nERRO: Falha ao obter dados do Relatório como CSV: {str(e)}")
         traceback.print_exc()
-        return pd.DataFrame()
-
-    finally:
-        # Garante que o arquivo temporário seja limpo
-        if downloaded_file_path and os.path.exists(downloaded_file_path):
-            try:
-                os.remove(downloaded_file_path)
-                print(f"INFO: Arquivo temporário '{downloaded_file_path}' removido.")
-            except Exception as e:
-                print(f"AVISO: Não foi possível remover o arquivo temporário '{downloaded_file_path}'. {e}")
+        return None
 
 
 # ===================================================================
@@ -232,34 +352,41 @@ def salvar_resultados(df, filename):
 # ===================================================================
 # <<< FUNÇÃO (MASTER) PARA IMPORTAÇÃO PELO APP >>>
 # ===================================================================
-def buscar_e_processar_dados_completos():
+def buscar_e_processar_dados_completos(client=None):
     """
     Função 'master' que executa todo o pipeline:
     Configura -> Conecta -> Busca ID do Relatório -> Baixa Dados -> Processa.
+    Se o modifiedAt do relatório não mudou desde a última carga, devolve os dados
+    já processados sem baixar o CSV de novo.
     Retorna um DataFrame processado ou um DataFrame vazio em caso de falha.
     """
     print("\nINFO (MASTER): Iniciando pipeline completo de dados (Método: Relatório CSV)...")
     
     # 1. Configuração
-    token = carregar_configuracao()
-    if not token: 
-        print("ERRO (MASTER): Falha ao carregar token.")
+    client = client or conectar_smartsheet()
+    if not client:
         return pd.DataFrame() # Retorna DF vazio
 
-    client = setup_smartsheet_client(token)
-    if not client: 
-        print("ERRO (MASTER): Falha ao conectar ao Smartsheet.")
-        return pd.DataFrame()
-
-    # 2. Buscar ID do Relatório
-    report_id = get_report_id(client, SHEET_NAME) # SHEET_NAME é global
+    # 2. Buscar ID do Relatório (cache local; lista os relatórios só se necessário)
+    report_id = resolver_report_id(client, SHEET_NAME) # SHEET_NAME é global
     if not report_id: 
         print(f"ERRO (MASTER): Relatório '{SHEET_NAME}' não encontrado.")
         return pd.DataFrame()
 
+    # 2.5. Relatório inalterado: reaproveita a última carga processada
+    assinatura = obter_assinatura_relatorio(client, report_id)
+    if assinatura and assinatura == _ULTIMA_CARGA["assinatura"]:
+        print("INFO (MASTER): Relatório sem alterações desde a última carga. Download ignorado.")
+        return _ULTIMA_CARGA["dados"].copy()
+
     # 3. Obter dados brutos
     raw_data = get_report_data(client, report_id)
-    if raw_data.empty:
+    if raw_data is None:
+        # O ID em cache pode ter ficado inválido (relatório recriado): resolve de novo
+        print("AVISO (MASTER): Falha no download pelo ID em cache. Buscando o ID novamente...")
+        report_id = resolver_report_id(client, SHEET_NAME, forcar=True)
+        raw_data = get_report_data(client, report_id) if report_id else None
+    if raw_data is None or raw_data.empty:
         print("AVISO (MASTER): Nenhum dado foi baixado do Smartsheet.")
         return pd.DataFrame()
         
@@ -270,6 +397,7 @@ def buscar_e_processar_dados_completos():
         print("AVISO (MASTER): Falha ao processar os dados (resultado vazio).")
         return pd.DataFrame()
     
+    _ULTIMA_CARGA.update(assinatura=assinatura, dados=processed_data.copy())
     print("INFO (MASTER): Pipeline (Relatório CSV) concluído com sucesso.")
     return processed_data
 
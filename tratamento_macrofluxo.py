@@ -1,7 +1,148 @@
 import pandas as pd
 import os
+import json
+import time
+import hashlib
 
-def tratar_macrofluxo():
+CAMINHO_PLANILHA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "GRÁFICO MACROFLUXO.xlsx")
+
+# Cache do resultado processado (formato longo) em Parquet, invalidado quando a planilha muda
+DIRETORIO_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache_dados")
+ARQUIVO_CACHE = os.path.join(DIRETORIO_CACHE, "macrofluxo.parquet")
+ARQUIVO_CACHE_META = os.path.join(DIRETORIO_CACHE, "macrofluxo.json")
+
+# Resultado da última chamada de tratar_macrofluxo: {"cache": "hit"/"miss"/"desativado", "segundos": ...}
+ULTIMO_STATUS_CACHE = {}
+
+def assinatura_macrofluxo():
+    """Assinatura (mtime + tamanho) da planilha, para saber se ela mudou; None se não existir."""
+    try:
+        estatisticas = os.stat(CAMINHO_PLANILHA)
+    except OSError:
+        return None
+    return f"{estatisticas.st_mtime_ns}|{estatisticas.st_size}"
+
+def separar_atributos(atributos):
+    """
+    Separa os cabeçalhos 'ETAPA.TIPO.INICIO_FIM' em Etapa, Tipo_Data e Inicio_Fim.
+
+    O parse é feito uma vez por cabeçalho distinto (algumas centenas), com
+    str.extract vetorizado, e depois mapeado de volta para todas as linhas.
+    Regras:
+    - padrão completo 'ETAPA.TIPO.INICIO_FIM';
+    - padrão incompleto 'ETAPA.INICIO_FIM': tenta achar o tipo dentro da etapa
+      (ex: 'PULVENDA.PREV'); sem tipo (ex: 'EXECUÇÃO ÁREAS COMUNS'), assume 'PREV';
+    - fora desses padrões, tudo nulo.
+    """
+    colunas = ['Etapa', 'Tipo_Data', 'Inicio_Fim']
+    unicos = pd.Series(pd.unique(atributos), dtype=object)
+
+    completo = unicos.str.extract(r'(.+)\.(REAL|PREV)\.(INICIO|TERMINO)')
+    completo.columns = colunas
+    tem_completo = completo.notna().all(axis=1)
+
+    simples = unicos.str.extract(r'(.+)\.(INICIO|TERMINO)')
+    tem_simples = ~tem_completo & simples.notna().all(axis=1)
+    tipo = simples[0].str.extract(r'(.+)\.(REAL|PREV)')
+    tem_tipo = tipo.notna().all(axis=1)
+
+    partes = pd.DataFrame(None, index=unicos.index, columns=colunas, dtype=object)
+    partes[tem_completo] = completo[tem_completo]
+
+    com_tipo = tem_simples & tem_tipo
+    partes.loc[com_tipo, 'Etapa'] = tipo.loc[com_tipo, 0]
+    partes.loc[com_tipo, 'Tipo_Data'] = tipo.loc[com_tipo, 1]
+    partes.loc[com_tipo, 'Inicio_Fim'] = simples.loc[com_tipo, 1]
+
+    sem_tipo = tem_simples & ~tem_tipo
+    partes.loc[sem_tipo, 'Etapa'] = simples.loc[sem_tipo, 0]
+    partes.loc[sem_tipo, 'Tipo_Data'] = 'PREV'
+    partes.loc[sem_tipo, 'Inicio_Fim'] = simples.loc[sem_tipo, 1]
+
+    # Mapeia o resultado de cada cabeçalho de volta para as linhas
+    partes.index = unicos
+    resultado = partes.reindex(atributos.to_numpy())
+    resultado.index = atributos.index
+    return resultado
+
+def _hash_arquivo(caminho):
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+def _chave_planilha():
+    """mtime, tamanho e hash do conteúdo da planilha atual"""
+    estatisticas = os.stat(CAMINHO_PLANILHA)
+    return {
+        "mtime_ns": estatisticas.st_mtime_ns,
+        "tamanho": estatisticas.st_size,
+        "sha256": _hash_arquivo(CAMINHO_PLANILHA),
+    }
+
+def ler_cache_macrofluxo():
+    """
+    DataFrame do cache, se ele corresponder à planilha atual; senão None.
+    Com mtime e tamanho iguais não há nem leitura da planilha; se só o mtime
+    mudou (arquivo copiado/salvo sem alterações), o hash do conteúdo decide.
+    """
+    try:
+        if not (os.path.exists(ARQUIVO_CACHE) and os.path.exists(ARQUIVO_CACHE_META)):
+            return None
+        with open(ARQUIVO_CACHE_META, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        estatisticas = os.stat(CAMINHO_PLANILHA)
+        mesmo_arquivo = (meta.get("mtime_ns") == estatisticas.st_mtime_ns
+                         and meta.get("tamanho") == estatisticas.st_size)
+        if not mesmo_arquivo:
+            if meta.get("tamanho") != estatisticas.st_size or meta.get("sha256") != _hash_arquivo(CAMINHO_PLANILHA):
+                return None
+            meta["mtime_ns"] = estatisticas.st_mtime_ns
+            with open(ARQUIVO_CACHE_META, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+        return pd.read_parquet(ARQUIVO_CACHE)
+    except Exception as e:
+        print(f"AVISO: Cache do Macrofluxo ignorado: {e}")
+        return None
+
+def gravar_cache_macrofluxo(df, chave):
+    try:
+        os.makedirs(DIRETORIO_CACHE, exist_ok=True)
+        temporario = ARQUIVO_CACHE + '.tmp'
+        df.to_parquet(temporario, index=False)
+        os.replace(temporario, ARQUIVO_CACHE)
+        with open(ARQUIVO_CACHE_META, 'w', encoding='utf-8') as f:
+            json.dump(chave, f)
+    except Exception as e:
+        print(f"AVISO: Não foi possível gravar o cache do Macrofluxo: {e}")
+
+def tratar_macrofluxo(usar_cache=True):
+    """
+    Dados do Macrofluxo em formato longo. Lê do cache Parquet quando a planilha
+    não mudou; só faz o parse do Excel (processar_planilha_macrofluxo) quando mudou.
+    """
+    inicio = time.perf_counter()
+    if usar_cache and os.path.exists(CAMINHO_PLANILHA):
+        df = ler_cache_macrofluxo()
+        if df is not None:
+            ULTIMO_STATUS_CACHE.update(cache="hit", segundos=time.perf_counter() - inicio)
+            print(f"INFO: Macrofluxo lido do cache (hit) em {ULTIMO_STATUS_CACHE['segundos']:.2f}s")
+            return df
+
+        chave = _chave_planilha()  # antes do parse: se a planilha mudar no meio, o cache não fica com a chave nova
+        df = processar_planilha_macrofluxo()
+        if df is not None:
+            gravar_cache_macrofluxo(df, chave)
+        ULTIMO_STATUS_CACHE.update(cache="miss", segundos=time.perf_counter() - inicio)
+        print(f"INFO: Macrofluxo processado a partir do Excel (miss) em {ULTIMO_STATUS_CACHE['segundos']:.2f}s")
+        return df
+
+    df = processar_planilha_macrofluxo()
+    ULTIMO_STATUS_CACHE.update(cache="desativado", segundos=time.perf_counter() - inicio)
+    return df
+
+def processar_planilha_macrofluxo():
     """Carrega e trata os dados do GRÁFICOMACROFLUXO.xlsx."""
     try:
         # ----------------------------------------------------------------------
@@ -17,8 +158,7 @@ def tratar_macrofluxo():
         ]
         # ----------------------------------------------------------------------
         
-        diretorio_atual = os.path.dirname(os.path.abspath(__file__))
-        caminho_arquivo = os.path.join(diretorio_atual, "GRÁFICO MACROFLUXO.xlsx")
+        caminho_arquivo = CAMINHO_PLANILHA
         
         if not os.path.exists(caminho_arquivo):
             print(f"Erro: Arquivo não encontrado no caminho: {caminho_arquivo}")
@@ -84,34 +224,8 @@ def tratar_macrofluxo():
         )
 
         # 3. DIVIDIR COLUNA "Atributo" para extrair Etapa, Tipo (PREV/REAL) e Inicio_Fim
-        # Lógica de extração flexível (mantida)
-        
-        def extrair_atributos(atributo):
-            # Tenta o padrão completo: ETAPA.TIPO.INICIO_FIM
-            match_completo = pd.Series(atributo).str.extract(r'(.+)\.(REAL|PREV)\.(INICIO|TERMINO)').iloc[0]
-            if not match_completo.isnull().any():
-                return match_completo
-            
-            # Tenta o padrão incompleto: ETAPA.INICIO_FIM
-            match_simples = pd.Series(atributo).str.extract(r'(.+)\.(INICIO|TERMINO)').iloc[0]
-            if not match_simples.isnull().any():
-                # Se for o padrão incompleto, assumimos 'PREV'
-                etapa_tipo = match_simples[0]
-                inicio_fim = match_simples[1]
-                
-                match_tipo = pd.Series(etapa_tipo).str.extract(r'(.+)\.(REAL|PREV)').iloc[0]
-                if not match_tipo.isnull().any():
-                    # Encontrou o tipo (ex: 'PULVENDA.PREV')
-                    return pd.Series([match_tipo[0], match_tipo[1], inicio_fim])
-                else:
-                    # Não encontrou o tipo (ex: 'EXECUÇÃO ÁREAS COMUNS')
-                    return pd.Series([etapa_tipo, 'PREV', inicio_fim])
-            
-            # Caso não encontre nenhum padrão, retorna nulo
-            return pd.Series([None, None, None])
-
-        split_data = df_unpivoted['Atributo'].apply(extrair_atributos)
-        split_data.columns = ['Etapa', 'Tipo_Data', 'Inicio_Fim']
+        # Parse uma vez por cabeçalho distinto (ver separar_atributos)
+        split_data = separar_atributos(df_unpivoted['Atributo'])
         
         df_final = pd.concat([df_unpivoted, split_data], axis=1)
         df_final = df_final.drop(columns=['Atributo'])
@@ -1,6 +1,7 @@
 import pandas as pd
 import mysql.connector
 from mysql.connector import Error
+from conexao_db import ConexaoIndisponivel, obter_conexao
 from datetime import datetime, timedelta
 import numpy as np
 
@@ -19,7 +20,9 @@ def buscar_dados_mysql():
             'port': 3306
         }
         
-        conn = mysql.connector.connect(**DB_CONFIG)
+        conn = obter_conexao(DB_CONFIG)
+        if conn is None:
+            raise ConexaoIndisponivel("Banco MySQL indisponível")
         
         # Consulta principal para dados das etapas
         query = """
@@ -70,7 +73,9 @@ def buscar_baselines_mysql():
             'port': 3306
         }
         
-        conn = mysql.connector.connect(**DB_CONFIG)
+        conn = obter_conexao(DB_CONFIG)
+        if conn is None:
+            raise ConexaoIndisponivel("Banco MySQL indisponível")
         cursor = conn.cursor(dictionary=True)
         
         query = """